@@ -0,0 +1,61 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Perfil ligero: en lugar de collect_all sobre PyQt6, pyqtgraph y OpenGL,
+# se deja que el análisis de imports y los hooks de PyInstaller incluyan
+# solo lo que app.py usa (QtWidgets/QtGui/QtOpenGL*, pyqtgraph sin ejemplos,
+# backends de plataforma y de arrays de PyOpenGL). Se genera en carpeta
+# (onedir): el ejecutable no descomprime ~180 MB en cada arranque.
+
+# Partes que ningún import de la aplicación alcanza en tiempo de ejecución
+excludes = [
+    'tkinter', 'matplotlib', 'IPython', 'pandas', 'pyarrow', 'numba', 'cupy', 'h5py',
+    'PyQt5', 'PySide2', 'PySide6',
+    'pyqtgraph.examples', 'pyqtgraph.jupyter', 'pyqtgraph.flowchart',
+    'pyqtgraph.canvas', 'pyqtgraph.console', 'pyqtgraph.dockarea',
+    'OpenGL.GLUT', 'OpenGL.GLE', 'OpenGL.Tk',
+    'PIL.ImageTk', 'PIL.ImageQt',
+]
+
+a = Analysis(
+    ['app.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=0,
+)
+
+# Traducciones de Qt: solo las de español (diálogos de archivo)
+a.datas = [
+    entry for entry in a.datas
+    if '/translations/' not in entry[0].replace('\\', '/') or '_es.' in entry[0]
+]
+
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='WaveVisualizer3D',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='WaveVisualizer3D',
+)
@@ -0,0 +1,1701 @@
+import os
+import sys
+import csv
+import json
+import time
+import signal
+import hashlib
+import importlib
+import zipfile
+import argparse
+import threading
+import tracemalloc
+import multiprocessing
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+import numpy as np
+
+# Motor de análisis espectral sin dependencias de Qt: lo usan el dashboard
+# (ResultsWindow) y el modo por lotes desde la línea de comandos
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff')
+
+LUMINANCE_WEIGHTS = {
+    'mean': (1/3, 1/3, 1/3),
+    'rec709': (0.2126, 0.7152, 0.0722),
+}
+
+# Cambiar al modificar cualquier cálculo: invalida la caché en disco
+ANALYSIS_VERSION = 1
+
+METRIC_FIELDS = [
+    'height', 'width', 'mean_magnitude', 'max_magnitude', 'std_magnitude',
+    'total_energy', 'spectral_entropy', 'snr_db', 'phase_mean',
+]
+
+class Profiler:
+    # Spans de tiempo con nombre alrededor de las etapas del análisis y de los
+    # gráficos. Los instantes son perf_counter absolutos (reloj monotónico del
+    # sistema), así que los spans de procesos hijos se mezclan sin ajustes
+    MAX_SPANS = 200000
+
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, start, time.perf_counter() - start,
+                               os.getpid(), threading.get_native_id()))
+            self.trim()
+
+    def extend(self, spans):
+        # Spans medidos en otro proceso; mismo tope que los propios
+        self.spans.extend(spans)
+        self.trim()
+
+    def trim(self):
+        # Por encima del tope se conserva la mitad más reciente
+        if len(self.spans) > self.MAX_SPANS:
+            del self.spans[:len(self.spans) - self.MAX_SPANS // 2]
+
+    def since(self, start):
+        return [s for s in self.spans if s[1] >= start]
+
+    def chrome_trace(self):
+        # Formato "Trace Event" (chrome://tracing, Perfetto, speedscope)
+        origin = min((s[1] for s in self.spans), default=0.0)
+        events = [{
+            'name': name, 'cat': 'analysis', 'ph': 'X',
+            'ts': round((start - origin) * 1e6, 1), 'dur': round(duration * 1e6, 1),
+            'pid': pid, 'tid': tid,
+        } for name, start, duration, pid, tid in self.spans]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+def summarize_spans(spans):
+    # (nombre, llamadas, total s, máximo s), de más a menos tiempo total
+    stats = {}
+    for name, _, duration, _, _ in spans:
+        count, total, longest = stats.get(name, (0, 0.0, 0.0))
+        stats[name] = (count + 1, total + duration, max(longest, duration))
+    return sorted(((name, *values) for name, values in stats.items()), key=lambda r: -r[2])
+
+def format_spans(spans):
+    lines = [f"{'etapa':<28} {'n':>5} {'total ms':>10} {'media ms':>9} {'máx ms':>9}"]
+    for name, count, total, longest in summarize_spans(spans):
+        lines.append(f"{name:<28} {count:>5} {total * 1000:10.1f} {total * 1000 / count:9.2f} "
+                     f"{longest * 1000:9.2f}")
+    return "\n".join(lines)
+
+# Perfilado desactivado por defecto: cada span es entonces una consulta global
+# y un nullcontext compartido
+PROFILER = None
+NO_SPAN = nullcontext()
+
+def span(name):
+    if PROFILER is None:
+        return NO_SPAN
+    return PROFILER.span(name)
+
+def enable_profiling(enabled=True):
+    global PROFILER
+    PROFILER = Profiler() if enabled else None
+    return PROFILER
+
+def active_profiler():
+    return PROFILER
+
+def native_image_array(img):
+    # Conserva el modo de origen en su dtype compacto: L (uint8), I;16 (uint16),
+    # F (float32) y RGB (uint8). Otros modos se reducen al más cercano
+    mode = img.mode
+    if mode in ('L', 'RGB', 'F'):
+        return np.asarray(img), mode
+    if mode.startswith('I;16'):
+        return np.asarray(img).astype(np.uint16, copy=False), 'I;16'
+    if mode == 'I':
+        data = np.asarray(img)
+        if data.size and data.min() >= 0 and data.max() <= 65535:
+            return data.astype(np.uint16), 'I;16'
+        return data.astype(np.float32), 'F'
+    if mode in ('1', 'LA', 'La'):
+        return np.asarray(img.convert('L')), 'L'
+    return np.asarray(img.convert('RGB')), 'RGB'
+
+def compute_luminance(image_data, formula='mean', block_rows=256):
+    # Plano de luminancia en float32 (escala de la imagen), calculado por
+    # bloques de filas para no crear una copia float64 de la imagen completa.
+    # Las imágenes de un canal ya son su propia luminancia (uint8/uint16/float32)
+    if image_data.ndim == 2:
+        return image_data
+    weights = np.asarray(LUMINANCE_WEIGHTS[formula], dtype=np.float32)
+    h, w = image_data.shape[:2]
+    luminance = np.empty((h, w), dtype=np.float32)
+    for start in range(0, h, block_rows):
+        luminance[start:start + block_rows] = image_data[start:start + block_rows] @ weights
+    return luminance
+
+def row_ranges(h, block_rows=None):
+    # Bloques de filas; sin tamaño de bloque, la imagen completa de una vez
+    step = block_rows or h or 1
+    return [(start, min(start + step, h)) for start in range(0, h, step)]
+
+def radial_profile(magnitude, block_rows=None):
+    # Media de |F| en anillos de ancho 1 alrededor del centro: un solo
+    # bincount sobre floor(r) en lugar de una máscara por anillo. Por bloques
+    # de filas los temporales (r, anillo, máscara) son del tamaño del bloque
+    h, w = magnitude.shape
+    center_y, center_x = h // 2, w // 2
+    max_r = int(min(center_x, center_y))
+    x_coords = np.arange(w)[None, :]
+
+    sums = np.zeros(max_r)
+    counts = np.zeros(max_r, dtype=np.int64)
+    for start, stop in row_ranges(h, block_rows):
+        y_coords = np.arange(start, stop)[:, None]
+        r = np.sqrt((x_coords - center_x)**2 + (y_coords - center_y)**2)
+        ring = np.floor(r).astype(np.int64).ravel()
+        inside = ring < max_r
+        sums += np.bincount(ring[inside], weights=magnitude[start:stop].ravel()[inside], minlength=max_r)
+        counts += np.bincount(ring[inside], minlength=max_r)
+    profile = np.zeros(max_r)
+    np.divide(sums, counts, out=profile, where=counts > 0)
+    return profile
+
+def angular_profile(magnitude, n_angles=360, block_rows=None):
+    # Media de |F| en ventanas [i-1°, i+1°): cada píxel cae en el grado
+    # entero k y cuenta para las ventanas k y k+1
+    h, w = magnitude.shape
+    center_y, center_x = h // 2, w // 2
+    x_coords = np.arange(w)[None, :]
+    offset = 181
+    sums = np.zeros(offset + n_angles + 1)
+    counts = np.zeros(offset + n_angles + 1, dtype=np.int64)
+    for start, stop in row_ranges(h, block_rows):
+        y_coords = np.arange(start, stop)[:, None]
+        theta = np.arctan2(y_coords - center_y, x_coords - center_x).ravel()
+
+        # Corrección de redondeo para respetar exactamente los límites en radianes
+        degree = np.floor(np.rad2deg(theta)).astype(np.int64)
+        degree -= theta < np.deg2rad(degree)
+        degree += theta >= np.deg2rad(degree + 1)
+
+        bins = degree + offset
+        sums += np.bincount(bins, weights=magnitude[start:stop].ravel(), minlength=offset + n_angles + 1)
+        counts += np.bincount(bins, minlength=offset + n_angles + 1)
+
+    windows = np.arange(n_angles) + offset
+    window_sums = sums[windows - 1] + sums[windows]
+    window_counts = counts[windows - 1] + counts[windows]
+    profile = np.zeros(n_angles)
+    np.divide(window_sums, window_counts, out=profile, where=window_counts > 0)
+    return profile
+
+def laplace_plane(signal_1d, n_sigma=100, n_omega=100):
+    # L{f}(s) ≈ Σ f(n)e^(-sn)·dt en una malla σ × ω; e^(-(σ+jω)t) se separa
+    # en dos factores y la malla completa es un producto de matrices
+    t = np.linspace(0, 10, len(signal_1d))
+    dt = t[1] - t[0] if len(t) > 1 else 1
+    sigmas = np.linspace(0.01, 2, n_sigma)
+    omega = np.linspace(-np.pi, np.pi, n_omega)
+
+    damped = signal_1d[None, :] * np.exp(-sigmas[:, None] * t[None, :])
+    oscillation = np.exp(-1j * omega[:, None] * t[None, :])
+    return np.abs(damped @ oscillation.T) * dt
+
+def fft_products(gray):
+    # FFT 2D centrada y sus derivados
+    fft_shift = np.fft.fftshift(np.fft.fft2(gray))
+    magnitude = np.abs(fft_shift)
+    phase = np.angle(fft_shift)
+    power_spectrum = magnitude ** 2
+    return fft_shift, magnitude, phase, power_spectrum
+
+def compact_fft_products(gray):
+    # Variante de poca memoria: FFT real (rfft2, media matriz complex64) y el
+    # resto del espectro por simetría hermítica, F[-k] = conj(F[k]). Nunca
+    # existe el espectro complejo completo; de él solo queda la fila central
+    h, w = gray.shape
+    half = w // 2 + 1
+    spectrum = np.fft.rfft2(np.asarray(gray, dtype=np.float32))
+    if spectrum.dtype != np.complex64:
+        spectrum = spectrum.astype(np.complex64)
+    mirror_rows = -np.arange(h) % h
+    mirror_cols = w - np.arange(half, w)
+
+    # Fila central del espectro desplazado = fila 0 sin desplazar, desplazada en columnas
+    row = np.concatenate([spectrum[0], np.conj(spectrum[0, mirror_cols])])
+    center_row = np.fft.fftshift(row)
+
+    def full_plane(values, sign):
+        plane = np.empty((h, w), dtype=np.float32)
+        plane[:, :half] = values
+        plane[:, half:] = values[mirror_rows][:, mirror_cols]
+        if sign < 0:
+            plane[:, half:] *= -1
+        return np.fft.fftshift(plane)
+
+    magnitude = full_plane(np.abs(spectrum), 1)
+    phase = full_plane(np.angle(spectrum), -1)
+    del spectrum
+    power_spectrum = np.square(magnitude)
+    return center_row, magnitude, phase, power_spectrum
+
+def spectral_metrics(magnitude, phase, power_spectrum, block_rows=None):
+    if block_rows:
+        return blocked_spectral_metrics(magnitude, phase, power_spectrum, block_rows)
+
+    # Entropía espectral
+    total_energy = np.sum(power_spectrum, dtype=np.float64)
+    normalized_power = power_spectrum / total_energy
+    spectral_entropy = -np.sum(normalized_power * np.log2(normalized_power + 1e-12))
+
+    # SNR
+    signal_power = np.max(power_spectrum)
+    noise_power = np.median(power_spectrum)
+    snr = 10 * np.log10(signal_power / noise_power) if noise_power > 0 else 0
+
+    # Frecuencias dominantes
+    flat_mag = magnitude.ravel()
+    top_indices = np.argpartition(flat_mag, -10)[-10:]
+    top_freqs = np.sort(flat_mag[top_indices])[::-1]
+
+    metrics = {
+        'mean_magnitude': float(np.mean(magnitude, dtype=np.float64)),
+        'max_magnitude': float(np.max(magnitude)),
+        'std_magnitude': float(np.std(magnitude, dtype=np.float64)),
+        'total_energy': float(total_energy),
+        'spectral_entropy': float(spectral_entropy),
+        'snr_db': float(snr),
+        'phase_mean': float(np.mean(phase, dtype=np.float64)),
+    }
+    return metrics, top_freqs
+
+def blocked_spectral_metrics(magnitude, phase, power_spectrum, block_rows):
+    # Mismas métricas acumulando en float64 por bloques de filas: el único
+    # temporal del tamaño de la imagen es la copia que hace la mediana
+    blocks = row_ranges(magnitude.shape[0], block_rows)
+    n = magnitude.size
+    total_energy = sum(float(np.sum(power_spectrum[a:b], dtype=np.float64)) for a, b in blocks)
+    spectral_entropy = 0.0
+    magnitude_sum = 0.0
+    for a, b in blocks:
+        normalized_power = power_spectrum[a:b].astype(np.float64) / total_energy
+        spectral_entropy -= float(np.sum(normalized_power * np.log2(normalized_power + 1e-12)))
+        magnitude_sum += float(np.sum(magnitude[a:b], dtype=np.float64))
+    mean_magnitude = magnitude_sum / n
+    variance = sum(float(np.sum((magnitude[a:b].astype(np.float64) - mean_magnitude) ** 2))
+                   for a, b in blocks) / n
+
+    signal_power = float(np.max(power_spectrum))
+    noise_power = float(np.median(power_spectrum))
+    snr = 10 * np.log10(signal_power / noise_power) if noise_power > 0 else 0
+
+    # Diez mayores de cada bloque y luego los diez mayores de todos
+    candidates = []
+    for a, b in blocks:
+        flat = magnitude[a:b].ravel()
+        k = min(10, flat.size)
+        candidates.append(np.partition(flat, -k)[-k:])
+    top_freqs = np.sort(np.concatenate(candidates))[::-1][:10]
+
+    metrics = {
+        'mean_magnitude': mean_magnitude,
+        'max_magnitude': float(np.max(magnitude)),
+        'std_magnitude': float(np.sqrt(variance)),
+        'total_energy': total_energy,
+        'spectral_entropy': spectral_entropy,
+        'snr_db': float(snr),
+        'phase_mean': float(np.mean(phase, dtype=np.float64)),
+    }
+    return metrics, top_freqs
+
+def line_analysis(gray, magnitude):
+    # Laplace, respuesta al impulso y "polos" sobre la fila central
+    from scipy.signal import find_peaks
+
+    h = gray.shape[0]
+    signal_1d = gray[h//2, :]
+    peaks, _ = find_peaks(np.abs(signal_1d), height=np.mean(signal_1d))
+    return {
+        'signal_1d': signal_1d,
+        'laplace_mag': laplace_plane(signal_1d),
+        'impulse_response': np.fft.ifft(magnitude[h//2, :]).real,
+        'peaks': peaks,
+    }
+
+def laplace_planes(signals, n_sigma=100, n_omega=100, block_elements=1 << 22):
+    # laplace_plane para un lote de filas. Por bloques de filas, e^(-σt) se
+    # aplica a todas a la vez y la parte oscilante son dos productos de
+    # matrices reales (cos y sen). En float32: la pila es para mostrar
+    signals = np.asarray(signals, dtype=np.float32)
+    rows, n = signals.shape
+    t = np.linspace(0, 10, n)
+    dt = t[1] - t[0] if n > 1 else 1
+    sigmas = np.linspace(0.01, 2, n_sigma)
+    omega = np.linspace(-np.pi, np.pi, n_omega)
+
+    decay = np.exp(-sigmas[:, None] * t[None, :]).astype(np.float32)
+    cos = np.cos(omega[None, :] * t[:, None]).astype(np.float32)
+    sin = np.sin(omega[None, :] * t[:, None]).astype(np.float32)
+    planes = np.empty((rows, n_sigma, n_omega), dtype=np.float32)
+    for start, stop in row_ranges(rows, max(1, block_elements // (n_sigma * n))):
+        damped = (signals[start:stop, None, :] * decay[None]).reshape(-1, n)
+        planes[start:stop] = (np.hypot(damped @ cos, damped @ sin) * dt).reshape(-1, n_sigma, n_omega)
+    return planes
+
+def batch_find_peaks(values, heights):
+    # find_peaks(fila, height=h) de scipy para todas las filas a la vez:
+    # máximos locales sin los extremos, las mesetas en su índice central
+    # (redondeado a la izquierda, como scipy) y altura ≥ la de su fila.
+    # Devuelve un mapa booleano filas × columnas
+    values = np.asarray(values)
+    rows, n = values.shape
+    peak_map = np.zeros((rows, n), dtype=bool)
+    if n < 3:
+        return peak_map
+    # Tramos de valores iguales consecutivos; la columna 0 siempre abre tramo,
+    # así que ninguno cruza de una fila a otra
+    run_start = np.ones((rows, n), dtype=bool)
+    run_start[:, 1:] = values[:, 1:] != values[:, :-1]
+    starts = np.flatnonzero(run_start)
+    ends = np.append(starts[1:], values.size) - 1
+    inner = (starts % n > 0) & (ends % n < n - 1)
+    starts, ends = starts[inner], ends[inner]
+    flat = values.ravel()
+    level = flat[starts]
+    is_peak = (flat[starts - 1] < level) & (flat[ends + 1] < level)
+    middle = (starts[is_peak] + ends[is_peak]) // 2
+    middle = middle[level[is_peak] >= np.asarray(heights)[middle // n]]
+    peak_map.ravel()[middle] = True
+    return peak_map
+
+def column_percentiles(stack, q, block_elements=1 << 22):
+    # Percentiles sobre el eje de filas por bloques de columnas: np.percentile
+    # copia y ordena su entrada, y la pila completa puede ocupar cientos de MB
+    flat = stack.reshape(stack.shape[0], -1)
+    out = np.empty((len(q), flat.shape[1]), dtype=np.float32)
+    step = max(1, block_elements // max(1, flat.shape[0]))
+    for start in range(0, flat.shape[1], step):
+        out[:, start:start + step] = np.percentile(flat[:, start:start + step], q, axis=0)
+    return out.reshape((len(q),) + stack.shape[1:])
+
+def row_analysis(gray, magnitude, rows=None, density_bins=(128, 256)):
+    # Laplace, respuesta al impulso y picos de todas las filas (o de la banda
+    # rows=(inicio, fin)) con las mismas reglas que line_analysis para la
+    # central, más agregados entre filas. Las pilas permiten recorrer las
+    # filas en el dashboard sin recalcular
+    h, w = gray.shape
+    start, stop = rows or (0, h)
+    start, stop = max(0, start), min(h, max(stop, start + 1))
+    signals = np.asarray(gray[start:stop])
+    count = stop - start
+
+    with span('filas_laplace'):
+        laplace = laplace_planes(signals)
+    with span('filas_impulso'):
+        impulse = np.empty((count, w), dtype=np.float32)
+        for a, b in row_ranges(count, max(1, TILE_PIXELS // w)):
+            impulse[a:b] = np.fft.ifft(magnitude[start + a:start + b], axis=1).real
+    with span('filas_picos'):
+        peak_map = batch_find_peaks(np.abs(signals), np.mean(signals, axis=1))
+    with span('filas_agregados'):
+        laplace_p50, laplace_p90 = column_percentiles(laplace, [50, 90])
+        impulse_p10, impulse_p90 = column_percentiles(impulse, [10, 90])
+        peak_rows, peak_cols = np.nonzero(peak_map)
+        density, _, _ = np.histogram2d(peak_rows, peak_cols,
+                                       bins=(min(count, density_bins[0]), min(w, density_bins[1])),
+                                       range=((0, count), (0, w)))
+    return {
+        'rows': (start, stop),
+        'laplace_mag': laplace,
+        'impulse_response': impulse,
+        'peak_map': peak_map,
+        'peak_counts': peak_map.sum(axis=1),
+        'laplace_mean': laplace.mean(axis=0, dtype=np.float64),
+        'laplace_p50': laplace_p50,
+        'laplace_p90': laplace_p90,
+        'impulse_mean': impulse.mean(axis=0, dtype=np.float64),
+        'impulse_p10': impulse_p10,
+        'impulse_p90': impulse_p90,
+        'peak_density': density,
+    }
+
+def row_slice(rows_result, row):
+    # Datos de una fila de row_analysis con las claves de line_analysis
+    start, stop = rows_result['rows']
+    i = min(max(row, start), stop - 1) - start
+    return {
+        'laplace_mag': rows_result['laplace_mag'][i],
+        'impulse_response': rows_result['impulse_response'][i],
+        'peaks': np.flatnonzero(rows_result['peak_map'][i]),
+    }
+
+# Estrategias de memoria de analyze_spectrum, de más exacta a más compacta,
+# con el pico medido (tracemalloc) en bytes por píxel sin contar la entrada:
+#   float64  el cálculo original; conserva el espectro complejo desplazado
+#   float32  rfft2 en complex64, planos float32, sin espectro complejo completo
+#   tiled    float32 con métricas y perfiles por bloques de ~1 Mpx
+# Las métricas de float32/tiled difieren de float64 en ~1e-7 relativo
+MEMORY_STRATEGIES = {'float64': 80, 'float32': 45, 'tiled': 24}
+TILE_PIXELS = 1 << 20
+
+def parse_bytes(text):
+    # '2G', '512M', '1.5GB', '800000000'
+    text = str(text).strip().upper().rstrip('B')
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text))
+
+def default_memory_budget():
+    # Presupuesto global (también para los procesos del modo por lotes, que
+    # heredan el entorno). Sin presupuesto se usa siempre float64
+    value = os.environ.get('WAVE_VISUALIZER_MEMORY_BUDGET')
+    return parse_bytes(value) if value else None
+
+def estimate_peak(shape, strategy='float64'):
+    pixels = shape[0] * shape[1]
+    peak = pixels * MEMORY_STRATEGIES[strategy] + (4 << 20)
+    if strategy == 'tiled':
+        # Temporales de un bloque de perfiles/métricas
+        peak += 21 * min(pixels, TILE_PIXELS)
+    return int(peak)
+
+def choose_strategy(shape, budget=None):
+    # La estrategia más exacta que cabe en el presupuesto; si ninguna cabe,
+    # la más compacta
+    if budget is None:
+        budget = default_memory_budget()
+    if budget is None:
+        return 'float64'
+    for strategy in MEMORY_STRATEGIES:
+        if estimate_peak(shape, strategy) <= budget:
+            return strategy
+    return 'tiled'
+
+# tracemalloc es global al proceso: solo un medidor a la vez puede usarlo
+_memory_lock = threading.Lock()
+
+class MemoryMeter:
+    # Pico de memoria asignada durante un bloque, con tracemalloc (numpy
+    # registra ahí sus buffers). Cuenta todos los hilos. Si otro medidor está
+    # activo o tracemalloc ya estaba en marcha no se mide: peak queda en None
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+
+    def __enter__(self):
+        self.peak = None
+        self.owner = self.enabled and _memory_lock.acquire(blocking=False)
+        if self.owner and tracemalloc.is_tracing():
+            _memory_lock.release()
+            self.owner = False
+        if self.owner:
+            tracemalloc.start()
+            self.base = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc):
+        if self.owner:
+            self.peak = max(0, tracemalloc.get_traced_memory()[1] - self.base)
+            tracemalloc.stop()
+            _memory_lock.release()
+        return False
+
+def analyze_spectrum(gray, memory_budget=None, strategy=None, measure_memory=False):
+    # Análisis completo de una imagen en escala de grises; devuelve arrays y
+    # métricas para el dashboard o para el modo por lotes. La estrategia de
+    # memoria se elige por el tamaño de la imagen y el presupuesto. Con
+    # measure_memory se mide el pico real (más lento; ver MemoryMeter)
+    gray = np.asarray(gray)
+    h, w = gray.shape
+    if memory_budget is None:
+        memory_budget = default_memory_budget()
+    if strategy is None:
+        strategy = choose_strategy((h, w), memory_budget)
+    # Bloques de ~1 Mpx: los temporales no crecen con la imagen
+    block_rows = max(1, TILE_PIXELS // w) if strategy == 'tiled' else None
+    # La primera importación de scipy queda fuera de la medida: con
+    # tracemalloc activo es mucho más lenta y contaría como pico
+    if measure_memory:
+        importlib.import_module('scipy.signal')
+
+    with span('analisis'), MemoryMeter(measure_memory) as meter:
+        if strategy == 'float64':
+            gray = np.asarray(gray, dtype=np.float64)
+            with span('fft'):
+                fft_shift, magnitude, phase, power_spectrum = fft_products(gray)
+            fft_center_row = fft_shift[h//2, :]
+        else:
+            gray = np.asarray(gray, dtype=np.float32)
+            fft_shift = None
+            with span('fft'):
+                fft_center_row, magnitude, phase, power_spectrum = compact_fft_products(gray)
+        with span('metricas'):
+            metrics, top_freqs = spectral_metrics(magnitude, phase, power_spectrum, block_rows)
+
+        result = {'metrics': {'height': h, 'width': w, **metrics}}
+        if fft_shift is not None:
+            result['fft_shift'] = fft_shift
+        result.update({
+            'fft_center_row': fft_center_row,
+            'magnitude': magnitude,
+            'phase': phase,
+            'power_spectrum': power_spectrum,
+            'top_freqs': top_freqs,
+        })
+        with span('perfil_radial'):
+            result['radial_profile'] = radial_profile(magnitude, block_rows)
+        with span('perfil_angular'):
+            result['angular_profile'] = angular_profile(magnitude, block_rows=block_rows)
+        with span('laplace'):
+            result.update(line_analysis(gray, magnitude))
+
+    result['memory'] = {
+        'strategy': strategy,
+        'budget': memory_budget,
+        'estimated': estimate_peak((h, w), strategy),
+        'peak': meter.peak,
+    }
+    return result
+
+def format_memory(memory):
+    peak = memory.get('peak')
+    peak = 'no medido' if peak is None else f"{peak / 1e6:.0f} MB"
+    text = (f"{memory['strategy']} · pico {peak} "
+            f"(estimado {memory['estimated'] / 1e6:.0f} MB")
+    if memory.get('budget'):
+        text += f", presupuesto {memory['budget'] / 1e6:.0f} MB"
+    return text + ")"
+
+# Filtrado en frecuencia sobre el espectro ya analizado. Frecuencias en
+# fracción de Nyquist (1 = 0.5 ciclos/píxel), independientes de la resolución
+FILTER_KINDS = ('lowpass', 'highpass', 'bandpass', 'notch')
+PREVIEW_PIXELS = 256 * 256
+
+def shifted_spectrum(result):
+    # Espectro complejo centrado del análisis: el de float64 si se conserva;
+    # si no (float32, caché, archivo exportado) se recompone de |F| y φ
+    if result.get('fft_shift') is not None:
+        return result['fft_shift'].astype(np.complex64)
+    magnitude = np.asarray(result['magnitude'], dtype=np.float32)
+    phase = np.asarray(result['phase'], dtype=np.float32)
+    return magnitude * np.exp(1j * phase)
+
+def spectrum_image(result):
+    # Imagen en gris recompuesta por FFT inversa, para resultados importados
+    # o de la caché que no traen la imagen original
+    return np.fft.ifft2(np.fft.ifftshift(shifted_spectrum(result))).real.astype(np.float32)
+
+def spectral_peaks(magnitude, count=8, min_distance=3):
+    # Picos más fuertes fuera del DC, separados al menos min_distance bins.
+    # Solo uno de cada pareja hermítica: el notch filtra también el simétrico
+    h, w = magnitude.shape
+    cy, cx = h // 2, w // 2
+    flat = magnitude.ravel()
+    k = min(flat.size, count * 50)
+    candidates = np.argpartition(flat, -k)[-k:]
+    candidates = candidates[np.argsort(flat[candidates])[::-1]]
+    peaks = []
+    for index in candidates:
+        y, x = divmod(int(index), w)
+        if flat[index] <= 0 or np.hypot(y - cy, x - cx) < min_distance:
+            continue
+        if any(min(np.hypot(y - py, x - px), np.hypot(2 * cy - y - py, 2 * cx - x - px)) < min_distance
+               for py, px, _ in peaks):
+            continue
+        peaks.append((y, x, float(flat[index])))
+        if len(peaks) == count:
+            break
+    return peaks
+
+def peak_frequency(shape, y, x):
+    # Posición (fila, columna) del espectro centrado en fracción de Nyquist
+    h, w = shape
+    return (y - h // 2) / h * 2, (x - w // 2) / w * 2
+
+def filter_mask(fy, fx, kind, low=0.1, high=0.5, notches=(), notch_radius=0.02, order=2):
+    # Butterworth de orden `order` (paso bajo/alto/banda) y notch gaussiano en
+    # cada pico y su simétrico. fy, fx en fracción de Nyquist
+    if kind == 'notch':
+        mask = np.ones(np.broadcast_shapes(fy.shape, fx.shape), dtype=np.float32)
+        for py, px in notches:
+            for sy, sx in ((py, px), (-py, -px)):
+                d2 = (fy - sy) ** 2 + (fx - sx) ** 2
+                mask *= 1 - np.exp(-d2 / (2 * notch_radius ** 2))
+        return mask
+    r2 = fy ** 2 + fx ** 2
+
+    def lowpass(cutoff):
+        return 1 / (1 + (r2 / max(cutoff, 1e-6) ** 2) ** order)
+
+    if kind == 'lowpass':
+        return lowpass(high)
+    if kind == 'highpass':
+        return 1 - lowpass(low)
+    if kind == 'bandpass':
+        return lowpass(high) * (1 - lowpass(low))
+    raise ValueError(f"filtro desconocido: {kind}")
+
+class SpectrumFilter:
+    # Filtrado interactivo desde el espectro centrado. Por resolución se
+    # prepara una vez el recorte central, ya desplazado para la FFT inversa y
+    # reducido a media matriz (simetría hermítica); las máscaras se guardan
+    # por parámetros. Cada cambio solo paga el producto y irfft2
+    MAX_MASKS = 8
+
+    def __init__(self, spectrum, preview_pixels=PREVIEW_PIXELS):
+        self.spectrum = spectrum
+        self.shape = spectrum.shape
+        h, w = self.shape
+        self.preview_factor = max(1, int(np.ceil(np.sqrt(h * w / preview_pixels))))
+        self.levels = {}
+        self.masks = {}
+
+    def level(self, factor):
+        # El recorte central de (h/f)×(w/f) del espectro da, por la inversa,
+        # la imagen diezmada sin pasar por la de tamaño completo
+        if factor not in self.levels:
+            h, w = self.shape
+            hs, ws = max(1, h // factor), max(1, w // factor)
+            top, left = h // 2 - hs // 2, w // 2 - ws // 2
+            block = np.fft.ifftshift(self.spectrum[top:top + hs, left:left + ws])
+            half = np.ascontiguousarray(block[:, :ws // 2 + 1])
+            fy = (np.fft.fftfreq(hs) * hs / h * 2).astype(np.float32)[:, None]
+            fx = (np.fft.rfftfreq(ws) * ws / w * 2).astype(np.float32)[None, :]
+            self.levels[factor] = (half, fy, fx, (hs, ws), hs * ws / (h * w))
+        return self.levels[factor]
+
+    def mask(self, factor, params):
+        key = (factor, params)
+        mask = self.masks.pop(key, None)
+        if mask is None:
+            _, fy, fx, _, _ = self.level(factor)
+            with span('filtro_mascara'):
+                mask = filter_mask(fy, fx, **dict(params)).astype(np.float32)
+            if len(self.masks) >= self.MAX_MASKS:
+                self.masks.pop(next(iter(self.masks)))
+        self.masks[key] = mask
+        return mask
+
+    def apply(self, kind, preview=False, **options):
+        # Imagen filtrada (float32); en vista previa a resolución reducida
+        factor = self.preview_factor if preview else 1
+        params = tuple(sorted({'kind': kind, **options}.items()))
+        half, _, _, shape, scale = self.level(factor)
+        mask = self.mask(factor, params)
+        with span('filtro_ifft'):
+            image = np.fft.irfft2(half * mask, s=shape)
+        image *= scale
+        return image
+
+    def mask_preview(self, kind, **options):
+        # Máscara completa centrada a la resolución de la vista previa, para mostrarla
+        h, w = self.shape
+        factor = self.preview_factor
+        hs, ws = max(1, h // factor), max(1, w // factor)
+        fy = ((np.arange(hs) - hs // 2) / h * 2).astype(np.float32)[:, None]
+        fx = ((np.arange(ws) - ws // 2) / w * 2).astype(np.float32)[None, :]
+        return filter_mask(fy, fx, kind, **options)
+
+def content_key(array, **params):
+    # Hash del contenido (no del nombre de archivo) más los parámetros y la
+    # versión del análisis
+    digest = hashlib.blake2b(digest_size=20)
+    header = f"{array.dtype.str}|{array.shape}|{sorted(params.items())}|v{ANALYSIS_VERSION}"
+    digest.update(header.encode())
+    digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+def default_cache_dir():
+    if os.environ.get('WAVE_VISUALIZER_CACHE'):
+        return os.environ['WAVE_VISUALIZER_CACHE']
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'wave_visualizer', 'analysis')
+
+class AnalysisCache:
+    # Caché persistente de resultados en .npz comprimidos, con límite de
+    # tamaño y expulsión LRU por fecha de último acceso (mtime)
+    CACHED_ARRAYS = ('magnitude', 'phase', 'fft_center_row', 'top_freqs',
+                     'radial_profile', 'angular_profile', 'signal_1d',
+                     'laplace_mag', 'impulse_response', 'peaks')
+
+    def __init__(self, directory=None, max_bytes=512 * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != ANALYSIS_VERSION:
+                    return None
+                result = {name: data[name] for name in self.CACHED_ARRAYS}
+                result['metrics'] = json.loads(str(data['metrics']))
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            return None
+        # Derivados baratos que no se guardan
+        result['power_spectrum'] = result['magnitude'].astype(np.float64) ** 2
+        return result
+
+    def put(self, key, result):
+        # float32 basta para los gráficos; las métricas se guardan exactas
+        arrays = {name: result[name] for name in self.CACHED_ARRAYS}
+        arrays['magnitude'] = arrays['magnitude'].astype(np.float32)
+        arrays['phase'] = arrays['phase'].astype(np.float32)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, 'wb') as f:
+                np.savez_compressed(f, version=np.array(ANALYSIS_VERSION),
+                                    metrics=np.array(json.dumps(result['metrics'])), **arrays)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self.evict()
+
+    def entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith('.npz'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return sorted(entries)
+
+    def evict(self):
+        with self.lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                total -= size
+
+    def clear(self):
+        for _, _, name in self.entries():
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+_default_cache = None
+
+def default_analysis_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AnalysisCache()
+    return _default_cache
+
+def cached_analysis(gray, cache=None, **params):
+    cache = cache or default_analysis_cache()
+    with span('cache_leer'):
+        key = content_key(gray, **params)
+        result = cache.get(key)
+    if result is None:
+        result = analyze_spectrum(gray)
+        with span('cache_escribir'):
+            cache.put(key, result)
+    return result
+
+# Productos que se exportan; la potencia se deriva de la magnitud al escribir
+EXPORT_ARRAYS = ('magnitude', 'phase', 'fft_center_row', 'top_freqs',
+                 'radial_profile', 'angular_profile', 'signal_1d',
+                 'laplace_mag', 'impulse_response', 'peaks')
+
+def write_npy_member(archive, name, shape, dtype, blocks):
+    # Escribe un .npy dentro del zip bloque a bloque: el contenedor queda
+    # legible con np.load sin tener nunca el array completo duplicado
+    with archive.open(f"{name}.npy", 'w', force_zip64=True) as f:
+        header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                  'fortran_order': False, 'shape': tuple(shape)}
+        np.lib.format.write_array_header_2_0(f, header)
+        for block in blocks:
+            f.write(np.ascontiguousarray(block, dtype=dtype).data)
+
+def row_blocks(array, block_rows, transform=None):
+    for start in range(0, array.shape[0], block_rows):
+        block = array[start:start + block_rows]
+        yield transform(block) if transform else block
+
+def export_spectrum(path, result, block_rows=256):
+    # Contenedor .npz comprimido con un miembro por producto; los planos 2D
+    # (magnitud, fase, potencia) se comprimen por bloques de filas
+    magnitude = result['magnitude']
+    tmp = f"{path}.tmp"
+    try:
+        with zipfile.ZipFile(tmp, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+            for name in EXPORT_ARRAYS:
+                array = np.asarray(result[name])
+                if array.ndim == 2:
+                    blocks = row_blocks(array, block_rows)
+                else:
+                    blocks = (array,)
+                write_npy_member(archive, name, array.shape, array.dtype, blocks)
+            write_npy_member(archive, 'power_spectrum', magnitude.shape, magnitude.dtype,
+                             row_blocks(magnitude, block_rows, np.square))
+            for name, value in (('version', np.array(ANALYSIS_VERSION)),
+                                ('metrics', np.array(json.dumps(result['metrics'])))):
+                write_npy_member(archive, name, value.shape, value.dtype, (value,))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def load_spectrum(path):
+    # Reconstruye el dict de analyze_spectrum desde un archivo exportado
+    with np.load(path, allow_pickle=False) as data:
+        missing = [name for name in EXPORT_ARRAYS + ('metrics',) if name not in data.files]
+        if missing:
+            raise ValueError(f"no es un análisis exportado (faltan: {', '.join(missing)})")
+        result = {name: data[name] for name in EXPORT_ARRAYS}
+        if 'power_spectrum' in data.files:
+            result['power_spectrum'] = data['power_spectrum']
+        else:
+            result['power_spectrum'] = result['magnitude'].astype(np.float64) ** 2
+        result['metrics'] = json.loads(str(data['metrics']))
+    return result
+
+class FileFrameSequence:
+    # Frames de un GIF animado o un TIFF multipágina, decodificados de a uno
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+
+    def frames(self):
+        from PIL import Image
+        with Image.open(self.path) as img:
+            index = 0
+            while True:
+                try:
+                    img.seek(index)
+                except EOFError:
+                    return
+                image_data, channels = native_image_array(img)
+                yield index, image_data, channels
+                index += 1
+
+class FolderFrameSequence:
+    # Imágenes de una carpeta en orden alfabético
+    def __init__(self, folder):
+        self.folder = folder
+        self.name = os.path.basename(os.path.normpath(folder))
+        self.files = sorted(
+            f for f in os.listdir(folder) if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+
+    def frames(self):
+        for index, name in enumerate(self.files):
+            from PIL import Image
+            with Image.open(os.path.join(self.folder, name)) as img:
+                image_data, channels = native_image_array(img)
+            yield index, image_data, channels
+
+class SyntheticSource:
+    # Patrones generados para medir el rendimiento sin cámara. Con fps > 0 se
+    # comporta como una cámara: el índice lo marca el reloj y, si el consumidor
+    # va lento, la fuente no espera (los frames intermedios se pierden)
+    PATTERNS = ('gratings', 'noise', 'blobs')
+
+    def __init__(self, pattern='gratings', width=512, height=512, fps=30.0, seed=0):
+        if pattern not in self.PATTERNS:
+            raise ValueError(f"patrón desconocido: {pattern}")
+        self.pattern = pattern
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.live = fps > 0
+        self.name = f"sintético: {pattern} {width}x{height}"
+        self.rng = np.random.default_rng(seed)
+        self.x = (np.arange(width, dtype=np.float32) - width / 2) / width
+        self.y = (np.arange(height, dtype=np.float32) - height / 2) / width
+        self.skipped = 0
+
+    def render(self, t):
+        if self.pattern == 'noise':
+            return self.rng.integers(0, 256, (self.height, self.width), dtype=np.uint8)
+        if self.pattern == 'gratings':
+            # Rejilla que gira y cambia de frecuencia
+            angle = 0.4 * t
+            freq = 2 * np.pi * (12 + 8 * np.sin(0.3 * t))
+            phase = (freq * np.cos(angle)) * self.x[None, :] + (freq * np.sin(angle)) * self.y[:, None]
+            return (127.5 + 127.5 * np.sin(phase + 2 * t)).astype(np.uint8)
+        # Manchas gaussianas en órbitas: cada una es el producto de dos perfiles 1D
+        frame = np.zeros((self.height, self.width), dtype=np.float32)
+        for k in range(5):
+            cx = 0.3 * np.cos(0.7 * t * (k + 1) / 3 + k * 1.3)
+            cy = 0.3 * np.sin(0.5 * t * (k + 2) / 3 + k * 2.1) * self.height / self.width
+            gx = np.exp(-((self.x - cx) / 0.06) ** 2)
+            gy = np.exp(-((self.y - cy) / 0.06) ** 2)
+            frame += np.outer(gy, gx)
+        return (np.clip(frame, 0, 1) * 255).astype(np.uint8)
+
+    def frames(self):
+        start = time.perf_counter()
+        index = 0
+        while True:
+            if self.fps > 0:
+                due = int((time.perf_counter() - start) * self.fps)
+                if due > index:
+                    self.skipped += due - index
+                    index = due
+                wait = start + index / self.fps - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            yield index, self.render(index / (self.fps or 30.0)), 'L'
+            index += 1
+
+class RawStreamSource:
+    # Frames crudos de tamaño fijo desde un pipe o stdin (p. ej. la salida
+    # de ffmpeg con -f rawvideo). Termina al cerrarse el flujo
+    FORMATS = {
+        'L': (np.uint8, 1),
+        'RGB': (np.uint8, 3),
+        'I;16': (np.dtype('<u2'), 1),
+        'F': (np.dtype('<f4'), 1),
+    }
+
+    def __init__(self, stream, width, height, channels='L'):
+        if channels not in self.FORMATS:
+            raise ValueError(f"formato desconocido: {channels}")
+        self.stream = stream
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.live = True
+        self.name = f"flujo {width}x{height} {channels}"
+        dtype, depth = self.FORMATS[channels]
+        self.dtype = np.dtype(dtype)
+        self.shape = (height, width, depth) if depth > 1 else (height, width)
+        self.frame_bytes = width * height * depth * self.dtype.itemsize
+
+    def read_frame(self):
+        buffer = bytearray(self.frame_bytes)
+        view = memoryview(buffer)
+        filled = 0
+        while filled < self.frame_bytes:
+            count = self.stream.readinto(view[filled:])
+            if not count:
+                return None
+            filled += count
+        return buffer
+
+    def frames(self):
+        index = 0
+        while True:
+            buffer = self.read_frame()
+            if buffer is None:
+                return
+            yield index, np.frombuffer(buffer, dtype=self.dtype).reshape(self.shape), self.channels
+            index += 1
+
+class LiveFeed:
+    # Contrapresión para fuentes en vivo: un hilo lee la fuente sin pausa y
+    # guarda solo el último frame; el consumidor toma el más reciente y los
+    # que no alcanzó a procesar se descartan en vez de encolarse
+    def __init__(self, source):
+        self.source = source
+        self.name = source.name
+        self.live = True
+        self.condition = threading.Condition()
+        self.latest = None
+        self.done = False
+        self.error = None
+        self.produced = 0
+        self.dropped = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def run(self):
+        try:
+            for frame in self.source.frames():
+                if self.stop_event.is_set():
+                    break
+                with self.condition:
+                    if self.latest is not None:
+                        self.dropped += 1
+                    self.latest = frame
+                    self.produced += 1
+                    self.condition.notify()
+        except Exception as e:
+            self.error = str(e)
+        with self.condition:
+            self.done = True
+            self.condition.notify()
+
+    def frames(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        while not self.stop_event.is_set():
+            with self.condition:
+                self.condition.wait_for(lambda: self.latest is not None or self.done, timeout=0.1)
+                frame, self.latest = self.latest, None
+                if frame is None and self.done:
+                    break
+            if frame is not None:
+                yield frame
+        if self.error:
+            raise RuntimeError(self.error)
+
+    def close(self):
+        self.stop_event.set()
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+def make_frame_source(spec, size='512x512', fps=30.0, raw_format='L', live=False):
+    # 'gratings' / 'noise' / 'blobs', '-' (frames crudos por stdin), una
+    # carpeta o un archivo. Con live=True las fuentes en vivo van detrás de
+    # un LiveFeed
+    if spec in SyntheticSource.PATTERNS:
+        width, height = parse_size(size)
+        source = SyntheticSource(spec, width, height, fps)
+    elif spec == '-':
+        width, height = parse_size(size)
+        source = RawStreamSource(sys.stdin.buffer, width, height, raw_format)
+    elif os.path.isdir(spec):
+        source = FolderFrameSequence(spec)
+    else:
+        source = FileFrameSequence(spec)
+    if live and getattr(source, 'live', False):
+        return LiveFeed(source)
+    return source
+
+def run_stream(source, seconds=10.0, max_frames=None, formula='mean', log=print):
+    # Análisis espectral sostenido sobre una fuente; informa cada segundo.
+    # scipy se importa antes para que su carga no cuente en la medida
+    importlib.import_module('scipy.signal')
+    feed = LiveFeed(source) if getattr(source, 'live', False) else source
+    start = last_report = time.perf_counter()
+    analyzed = last_count = 0
+    busy = 0.0
+    memory = None
+    try:
+        for index, image_data, channels in feed.frames():
+            begin = time.perf_counter()
+            with span('luminancia'):
+                gray = compute_luminance(image_data, formula)
+            result = analyze_spectrum(gray, measure_memory=True)
+            peak = result['memory']['peak']
+            if memory is None or (peak or 0) > (memory['peak'] or 0):
+                memory = result['memory']
+            now = time.perf_counter()
+            busy += now - begin
+            analyzed += 1
+            if now - last_report >= 1.0:
+                log(f"{analyzed} frames | {(analyzed - last_count) / (now - last_report):.1f} fps | "
+                    f"descartados {getattr(feed, 'dropped', 0) + getattr(source, 'skipped', 0)}")
+                last_report, last_count = now, analyzed
+            if (max_frames and analyzed >= max_frames) or now - start >= seconds:
+                break
+    finally:
+        if hasattr(feed, 'close'):
+            feed.close()
+    elapsed = time.perf_counter() - start
+    dropped = getattr(feed, 'dropped', 0) + getattr(source, 'skipped', 0)
+    log(f"{analyzed} frames en {elapsed:.1f} s: {analyzed / elapsed:.1f} fps sostenidos, "
+        f"{1000 * busy / max(analyzed, 1):.1f} ms por análisis, {dropped} descartados")
+    if memory:
+        log(f"Memoria por análisis: {format_memory(memory)}")
+    return analyzed / elapsed
+
+def load_gray(path, formula='mean'):
+    # Solo el primer frame en GIF animados / TIFF multipágina
+    from PIL import Image
+    with span('cargar_imagen'):
+        with Image.open(path) as img:
+            image_data, _ = native_image_array(img)
+    with span('luminancia'):
+        return compute_luminance(image_data, formula)
+
+def analyze_file(path, formula='mean', profiles=False, cache_dir=None):
+    row = {'file': path}
+    start = time.perf_counter()
+    try:
+        gray = load_gray(path, formula)
+        if cache_dir:
+            result = cached_analysis(gray, AnalysisCache(cache_dir))
+        else:
+            result = analyze_spectrum(gray, measure_memory=True)
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+        return row
+    row.update(result['metrics'])
+    for i, value in enumerate(result['top_freqs']):
+        row[f'top_freq_{i + 1}'] = float(value)
+    if profiles:
+        row['radial_profile'] = ' '.join(f'{v:.6g}' for v in result['radial_profile'])
+        row['angular_profile'] = ' '.join(f'{v:.6g}' for v in result['angular_profile'])
+    # Resultados de la caché no traen medida de memoria
+    memory = result.get('memory')
+    if memory:
+        row['memory_strategy'] = memory['strategy']
+        if memory['peak'] is not None:
+            row['memory_peak_mb'] = round(memory['peak'] / 1e6, 1)
+    row['seconds'] = round(time.perf_counter() - start, 4)
+    return row
+
+def result_fields(profiles=False):
+    fields = ['file'] + METRIC_FIELDS + [f'top_freq_{i + 1}' for i in range(10)]
+    if profiles:
+        fields += ['radial_profile', 'angular_profile']
+    return fields + ['memory_strategy', 'memory_peak_mb', 'seconds', 'error']
+
+def collect_images(inputs, recursive=False):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            if recursive:
+                for root, _, files in os.walk(item):
+                    paths += [os.path.join(root, f) for f in files if f.lower().endswith(IMAGE_EXTENSIONS)]
+            else:
+                paths += [os.path.join(item, f) for f in os.listdir(item) if f.lower().endswith(IMAGE_EXTENSIONS)]
+        else:
+            paths.append(item)
+    return sorted(os.path.abspath(p) for p in paths)
+
+def processed_files(output, retry_errors=False):
+    # Para reanudar: archivos ya presentes en el CSV (con retry_errors, solo
+    # los que no fallaron). Una última línea incompleta (proceso
+    # interrumpido) se descarta antes de seguir escribiendo
+    if not os.path.exists(output):
+        return set()
+    with open(output, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            f.truncate(end)
+    with open(output, newline='', encoding='utf-8') as f:
+        return {row['file'] for row in csv.DictReader(f)
+                if row.get('file') and not (retry_errors and row.get('error'))}
+
+class CsvResultWriter:
+    # Escritura incremental: cada fila se vuelca a disco al llegar
+    def __init__(self, output, fields):
+        exists = os.path.exists(output) and os.path.getsize(output) > 0
+        if exists:
+            # Al reanudar un CSV de otra versión se respetan sus columnas
+            with open(output, newline='', encoding='utf-8') as f:
+                fields = next(csv.reader(f), None) or fields
+        self.file = open(output, 'a', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=fields, extrasaction='ignore')
+        if not exists:
+            self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class ParquetResultWriter:
+    # Salida columnar: un archivo parquet por bloque de filas dentro de un
+    # directorio, de modo que una interrupción no corrompe lo ya escrito.
+    # El esquema es fijo: un bloque con una columna toda vacía (p. ej. error)
+    # no puede inferirla como null, o las partes no se leerían juntas
+    TEXT_FIELDS = ('file', 'content_hash', 'radial_profile', 'angular_profile',
+                   'memory_strategy', 'error')
+    INTEGER_FIELDS = ('height', 'width')
+
+    def __init__(self, output, fields, batch_size=256):
+        import pyarrow
+        import pyarrow.parquet
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.output = output
+        self.fields = fields
+        self.schema = pyarrow.schema([(name, self.field_type(name)) for name in fields])
+        self.batch_size = batch_size
+        self.rows = []
+        os.makedirs(output, exist_ok=True)
+
+    def field_type(self, name):
+        if name in self.TEXT_FIELDS:
+            return self.pa.string()
+        if name in self.INTEGER_FIELDS:
+            return self.pa.int64()
+        return self.pa.float64()
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        table = self.pa.Table.from_pylist(self.rows, schema=self.schema)
+        part = os.path.join(self.output, f"part-{time.time_ns()}.parquet")
+        self.pq.write_table(table, part + '.tmp')
+        os.replace(part + '.tmp', part)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+
+def processed_parquet(output, retry_errors=False):
+    if not os.path.isdir(output):
+        return set()
+    import pyarrow.parquet as pq
+    done = set()
+    for name in os.listdir(output):
+        if name.endswith('.parquet'):
+            table = pq.read_table(os.path.join(output, name))
+            files = table.column('file').to_pylist()
+            if retry_errors and 'error' in table.column_names:
+                files = [f for f, error in zip(files, table.column('error').to_pylist()) if not error]
+            done.update(files)
+    return done
+
+def processed_hashes(output):
+    # Hashes de contenido ya analizados sin error por el modo watch, del más
+    # antiguo al más reciente
+    if output.endswith('.parquet'):
+        if not os.path.isdir(output):
+            return []
+        import pyarrow.parquet as pq
+        hashes = []
+        for name in sorted(os.listdir(output)):
+            if name.endswith('.parquet'):
+                table = pq.read_table(os.path.join(output, name))
+                if 'content_hash' not in table.column_names:
+                    continue
+                digests = table.column('content_hash').to_pylist()
+                if 'error' in table.column_names:
+                    errors = table.column('error').to_pylist()
+                    digests = [d for d, error in zip(digests, errors) if not error]
+                hashes += [d for d in digests if d]
+        return hashes
+    processed_files(output)
+    if not os.path.exists(output):
+        return []
+    with open(output, newline='', encoding='utf-8') as f:
+        return [row['content_hash'] for row in csv.DictReader(f)
+                if row.get('content_hash') and not row.get('error')]
+
+class RecentHashes:
+    # Conjunto de hashes con tope, para un servicio que no se reinicia: al
+    # superarlo se olvidan los menos usados, y un contenido así de antiguo
+    # se analizaría otra vez si reaparece
+    def __init__(self, hashes=(), limit=100_000):
+        self.limit = limit
+        self.hashes = OrderedDict()
+        for digest in hashes:
+            self.add(digest)
+
+    def __contains__(self, digest):
+        if digest not in self.hashes:
+            return False
+        self.hashes.move_to_end(digest)
+        return True
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def add(self, digest):
+        self.hashes[digest] = None
+        self.hashes.move_to_end(digest)
+        if len(self.hashes) > self.limit:
+            self.hashes.popitem(last=False)
+
+def file_hash(path, chunk_size=1024 * 1024):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class FolderWatcher:
+    # Detección por sondeo (sin dependencias): un archivo nuevo o modificado
+    # se entrega cuando su tamaño y fecha no cambian entre dos escaneos,
+    # para no leer imágenes a medio escribir. Solo se guarda el estado de los
+    # archivos presentes en el último escaneo: los borrados se olvidan
+    def __init__(self, folder, recursive=False):
+        self.folder = folder
+        self.recursive = recursive
+        self.candidates = {}
+        self.done = {}
+
+    def signatures(self):
+        current = {}
+        for path in collect_images([self.folder], self.recursive):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            current[path] = (stat.st_size, stat.st_mtime_ns)
+        return current
+
+    def scan(self, settle=True):
+        current = self.signatures()
+        ready = []
+        for path, sig in current.items():
+            if self.done.get(path) == sig:
+                continue
+            if not settle or self.candidates.get(path) == sig:
+                ready.append(path)
+                self.done[path] = sig
+        self.candidates = {p: sig for p, sig in current.items() if self.done.get(p) != sig}
+        self.done = {p: sig for p, sig in self.done.items() if p in current}
+        return ready
+
+def ignore_interrupt():
+    # Ctrl+C lo gestiona solo el proceso principal; si llega también a los
+    # procesos del pool, estos mueren a medias y el cierre se bloquea
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def profiled_task(task):
+    # En un proceso hijo: ejecuta la tarea con el perfilado activo y devuelve
+    # también sus spans. Con fork el hijo hereda los spans del padre, por eso
+    # solo se devuelven los nuevos
+    fn, args = task
+    profiler = PROFILER or enable_profiling()
+    mark = len(profiler.spans)
+    value = fn(args)
+    spans = profiler.spans[mark:]
+    del profiler.spans[mark:]
+    return value, spans
+
+def profile_task(fn, args):
+    # Con el perfilado activo la tarea viaja envuelta en profiled_task
+    if PROFILER is None:
+        return fn, args
+    return profiled_task, (fn, args)
+
+def profile_tasks(fn, tasks):
+    # Igual que profile_task, para una secuencia de tareas (imap)
+    if PROFILER is None:
+        return fn, tasks
+    return profiled_task, ((fn, args) for args in tasks)
+
+def collect_spans(value):
+    if PROFILER is None:
+        return value
+    value, spans = value
+    PROFILER.extend(spans)
+    return value
+
+def run_watch(folder, output, workers=None, formula='mean', profiles=False,
+              recursive=False, interval=2.0, once=False, cache_dir=None,
+              report_every=10.0, max_hashes=100_000, log=print):
+    # Servicio incremental: cola de archivos listos, pool acotado (como mucho
+    # dos tareas por proceso en vuelo) y escritura de cada fila al terminar.
+    # Los contenidos repetidos se reconocen por hash (los max_hashes más
+    # recientes) y no se analizan otra vez
+    parquet = output.endswith('.parquet')
+    fields = result_fields(profiles)
+    fields.insert(1, 'content_hash')
+    if not parquet and os.path.exists(output) and os.path.getsize(output) > 0:
+        # CsvResultWriter respeta la cabecera existente: sin la columna del
+        # hash los repetidos dejarían de reconocerse al reiniciar
+        with open(output, newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), None) or []
+        if 'content_hash' not in header:
+            raise ValueError(f"{output} no tiene columna content_hash (¿creado por 'batch'?); "
+                             f"usar otro archivo de salida para watch")
+    known = RecentHashes(processed_hashes(output), max_hashes)
+    writer = ParquetResultWriter(output, fields) if parquet else CsvResultWriter(output, fields)
+    watcher = FolderWatcher(folder, recursive)
+    workers = workers or os.cpu_count() or 1
+    limit = workers * 2
+
+    backlog = deque()
+    in_flight = {}
+    processed = skipped = errors = 0
+    start = last_report = time.perf_counter()
+    last_processed = 0
+    next_scan = 0.0
+    log(f"Vigilando {folder} ({len(known)} contenidos ya procesados, {workers} procesos)")
+
+    try:
+        with multiprocessing.Pool(workers, initializer=ignore_interrupt) as pool:
+            while True:
+                now = time.perf_counter()
+                if now >= next_scan:
+                    backlog.extend(watcher.scan(settle=not once))
+                    next_scan = now + interval
+
+                while backlog and len(in_flight) < limit:
+                    path = backlog.popleft()
+                    try:
+                        digest = file_hash(path)
+                    except OSError:
+                        continue
+                    # Un contenido cuenta como conocido solo si su análisis no
+                    # falló; mientras está en curso, sus copias se saltan
+                    if digest in known or digest in in_flight.values():
+                        skipped += 1
+                        continue
+                    fn, args = profile_task(analyze_task, (path, formula, profiles, cache_dir))
+                    task = pool.apply_async(fn, (args,))
+                    in_flight[task] = digest
+
+                for task in [t for t in in_flight if t.ready()]:
+                    row = collect_spans(task.get())
+                    row['content_hash'] = in_flight.pop(task)
+                    writer.write(row)
+                    processed += 1
+                    if 'error' in row:
+                        errors += 1
+                    else:
+                        known.add(row['content_hash'])
+
+                now = time.perf_counter()
+                if now - last_report >= report_every:
+                    writer.flush()
+                    rate = (processed - last_processed) / (now - last_report)
+                    log(f"pendientes {len(backlog)} | en curso {len(in_flight)} | procesadas {processed} "
+                        f"({rate:.1f} img/s, media {processed / (now - start):.1f}) | "
+                        f"repetidas {skipped} | errores {errors}")
+                    last_report, last_processed = now, processed
+
+                if once and not backlog and not in_flight:
+                    break
+                time.sleep(0.05 if in_flight else min(interval, 0.5))
+    except KeyboardInterrupt:
+        log("Detenido; las tareas en curso se descartan y se reanalizarán al reiniciar")
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    log(f"{processed} procesadas, {skipped} repetidas, {errors} errores en {elapsed:.1f} s")
+    return errors
+
+def analyze_task(args):
+    return analyze_file(*args)
+
+def run_batch(inputs, output, workers=None, formula='mean', profiles=False,
+              recursive=False, overwrite=False, cache_dir=None, retry_errors=False, log=print):
+    # Reanuda sobre la salida existente. Las imágenes con error cuentan como
+    # procesadas salvo con retry_errors; al reintentarlas la fila fallida
+    # anterior se conserva y la nueva se añade detrás
+    parquet = output.endswith('.parquet')
+    if overwrite and os.path.exists(output):
+        if parquet:
+            for name in os.listdir(output):
+                os.remove(os.path.join(output, name))
+        else:
+            os.remove(output)
+
+    paths = collect_images(inputs, recursive)
+    done = processed_parquet(output, retry_errors) if parquet else processed_files(output, retry_errors)
+    pending = [p for p in paths if p not in done]
+    log(f"{len(paths)} imágenes, {len(done)} ya procesadas, {len(pending)} pendientes")
+    if not pending:
+        return 0
+
+    fields = result_fields(profiles)
+    writer = ParquetResultWriter(output, fields) if parquet else CsvResultWriter(output, fields)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    errors = 0
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            tasks = ((p, formula, profiles, cache_dir) for p in pending)
+            fn, tasks = profile_tasks(analyze_task, tasks)
+            for count, row in enumerate(pool.imap_unordered(fn, tasks, chunksize=2), 1):
+                row = collect_spans(row)
+                writer.write(row)
+                errors += 'error' in row
+                if count % 50 == 0 or count == len(pending):
+                    rate = count / (time.perf_counter() - start)
+                    log(f"{count}/{len(pending)} ({rate:.1f} img/s, {errors} errores)")
+    finally:
+        writer.close()
+    return errors
+
+def analyze_result_task(args):
+    # Resultado completo para el renderizado; el espectro complejo no se
+    # devuelve al proceso principal porque los gráficos no lo usan
+    path, formula, cache_dir = args
+    try:
+        gray = load_gray(path, formula)
+        if cache_dir:
+            result = cached_analysis(gray, AnalysisCache(cache_dir))
+        else:
+            result = analyze_spectrum(gray)
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+    result.pop('fft_shift', None)
+    return path, result, None
+
+def chart_names(paths):
+    # Prefijo de archivo por imagen; los nombres repetidos en carpetas
+    # distintas se numeran
+    names, seen = {}, {}
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        seen[stem] = seen.get(stem, 0) + 1
+        names[path] = stem if seen[stem] == 1 else f"{stem}_{seen[stem]}"
+    return names
+
+def run_render(inputs, output_dir, workers=None, formula='mean', recursive=False,
+               cache_dir=None, log=print):
+    # Los análisis se calculan en procesos y los gráficos se dibujan en el
+    # proceso principal con Qt sin pantalla, reutilizando los mismos widgets
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from app import render_dashboard_charts
+
+    qt_app = QApplication.instance() or QApplication([])
+    paths = collect_images(inputs, recursive)
+    names = chart_names(paths)
+    log(f"{len(paths)} imágenes -> {output_dir}")
+    if not paths:
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    errors = 0
+
+    def results(pool):
+        nonlocal errors
+        fn, tasks = profile_tasks(analyze_result_task, ((p, formula, cache_dir) for p in paths))
+        for value in pool.imap_unordered(fn, tasks):
+            path, result, error = collect_spans(value)
+            if error:
+                errors += 1
+                log(f"{path}: {error}")
+                continue
+            yield names[path], result
+
+    with multiprocessing.Pool(workers) as pool:
+        for count, (name, files) in enumerate(render_dashboard_charts(results(pool), output_dir), 1):
+            if count % 10 == 0 or count + errors == len(paths):
+                rate = count / (time.perf_counter() - start)
+                log(f"{count}/{len(paths)} ({rate:.1f} img/s, {len(files)} gráficos por imagen)")
+    qt_app.processEvents()
+    return errors
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wave Visualizer 3D - análisis espectral sin interfaz")
+    commands = parser.add_subparsers(dest='command', required=True)
+    # Opciones comunes a todos los subcomandos
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--memory-budget', metavar='TAMAÑO', default=None,
+                        help="memoria por análisis (p. ej. 2G); elige float64, float32 o por bloques")
+    common.add_argument('--profile', metavar='TRAZA.json', default=None,
+                        help="tiempos por etapa y traza (chrome://tracing, Perfetto)")
+
+    batch = commands.add_parser('batch', parents=[common],
+                                help="métricas espectrales de muchas imágenes")
+    batch.add_argument('inputs', nargs='+', help="imágenes o carpetas")
+    batch.add_argument('-o', '--output', required=True,
+                       help="archivo .csv, o directorio .parquet (requiere pyarrow)")
+    batch.add_argument('-j', '--workers', type=int, default=None, help="procesos (por defecto: núcleos)")
+    batch.add_argument('-r', '--recursive', action='store_true', help="recorrer subcarpetas")
+    batch.add_argument('--luminance', choices=sorted(LUMINANCE_WEIGHTS), default='mean')
+    batch.add_argument('--profiles', action='store_true', help="incluir perfiles radial y angular")
+    batch.add_argument('--overwrite', action='store_true', help="no reanudar; empezar de cero")
+    batch.add_argument('--retry-errors', action='store_true',
+                       help="al reanudar, volver a analizar las imágenes que dieron error")
+    batch.add_argument('--cache', nargs='?', const=default_cache_dir(), default=None, metavar='DIR',
+                       help="reutilizar/guardar resultados en la caché de análisis")
+
+    render = commands.add_parser('render', parents=[common],
+                                 help="gráficos del dashboard como PNG, sin ventana")
+    render.add_argument('inputs', nargs='+', help="imágenes o carpetas")
+    render.add_argument('-o', '--output', required=True, help="directorio de salida")
+    render.add_argument('-j', '--workers', type=int, default=None, help="procesos (por defecto: núcleos)")
+    render.add_argument('-r', '--recursive', action='store_true', help="recorrer subcarpetas")
+    render.add_argument('--luminance', choices=sorted(LUMINANCE_WEIGHTS), default='mean')
+    render.add_argument('--cache', nargs='?', const=default_cache_dir(), default=None, metavar='DIR',
+                        help="reutilizar/guardar resultados en la caché de análisis")
+
+    watch = commands.add_parser('watch', parents=[common],
+                                help="analizar las imágenes que van llegando a una carpeta")
+    watch.add_argument('folder', help="carpeta a vigilar")
+    watch.add_argument('-o', '--output', required=True,
+                       help="archivo .csv, o directorio .parquet (requiere pyarrow)")
+    watch.add_argument('-j', '--workers', type=int, default=None, help="procesos (por defecto: núcleos)")
+    watch.add_argument('-r', '--recursive', action='store_true', help="recorrer subcarpetas")
+    watch.add_argument('--luminance', choices=sorted(LUMINANCE_WEIGHTS), default='mean')
+    watch.add_argument('--profiles', action='store_true', help="incluir perfiles radial y angular")
+    watch.add_argument('--interval', type=float, default=2.0, help="segundos entre escaneos")
+    watch.add_argument('--once', action='store_true', help="procesar lo que hay y terminar")
+    watch.add_argument('--max-hashes', type=int, default=100_000,
+                       help="contenidos recientes que se recuerdan para saltar repetidos")
+    watch.add_argument('--cache', nargs='?', const=default_cache_dir(), default=None, metavar='DIR',
+                       help="reutilizar/guardar resultados en la caché de análisis")
+
+    stream = commands.add_parser('stream', parents=[common],
+                                 help="fps sostenidos de análisis sobre una fuente de frames")
+    stream.add_argument('source', help="gratings | noise | blobs | - (crudo por stdin) | carpeta | archivo")
+    stream.add_argument('--size', default='512x512', help="ANCHOxALTO (sintético y crudo)")
+    stream.add_argument('--fps', type=float, default=0.0, help="ritmo de la fuente sintética (0: sin límite)")
+    stream.add_argument('--raw-format', choices=sorted(RawStreamSource.FORMATS), default='L')
+    stream.add_argument('--seconds', type=float, default=10.0)
+    stream.add_argument('--frames', type=int, default=None)
+    stream.add_argument('--luminance', choices=sorted(LUMINANCE_WEIGHTS), default='mean')
+
+    args = parser.parse_args(argv)
+    if args.profile:
+        enable_profiling()
+    if args.memory_budget:
+        # Por el entorno llega también a los procesos del pool
+        parse_bytes(args.memory_budget)
+        os.environ['WAVE_VISUALIZER_MEMORY_BUDGET'] = args.memory_budget
+    try:
+        if args.command == 'batch':
+            errors = run_batch(args.inputs, args.output, args.workers, args.luminance,
+                               args.profiles, args.recursive, args.overwrite, args.cache,
+                               args.retry_errors)
+            return 1 if errors else 0
+        if args.command == 'watch':
+            try:
+                errors = run_watch(args.folder, args.output, args.workers, args.luminance, args.profiles,
+                                   args.recursive, args.interval, args.once, args.cache,
+                                   max_hashes=args.max_hashes)
+            except ValueError as e:
+                parser.error(str(e))
+            return 1 if errors else 0
+        if args.command == 'stream':
+            source = make_frame_source(args.source, args.size, args.fps, args.raw_format)
+            run_stream(source, args.seconds, args.frames, args.luminance)
+            return 0
+        if args.command == 'render':
+            errors = run_render(args.inputs, args.output, args.workers, args.luminance,
+                                args.recursive, args.cache)
+            return 1 if errors else 0
+    finally:
+        if args.profile:
+            print("\n" + format_spans(PROFILER.spans))
+            PROFILER.export_trace(args.profile)
+            print(f"Traza en {args.profile}")
+
+if __name__ == '__main__':
+    # app.py importa "analysis": debe ser este mismo módulo (con el mismo
+    # perfilador activo) y no una segunda copia
+    sys.modules.setdefault('analysis', sys.modules[__name__])
+    sys.exit(main())
@@ -1,17 +1,102 @@
+import os
 import sys
+import time
+import queue
+import threading
+
+class ImportTimer:
+    # Informe de importaciones (--import-report): como `python -X importtime`
+    # pero dentro del proceso, así que también funciona en el ejecutable.
+    # Se instala antes de cualquier import pesado y envuelve cada loader
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.records = []
+        self.local = threading.local()
+        
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = TimedLoader(spec.loader, self, name)
+                return spec
+        return None
+        
+    def enter(self):
+        stack = self.local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        return time.perf_counter()
+        
+    def leave(self, name, started):
+        total = time.perf_counter() - started
+        stack = self.local.stack
+        children = stack.pop()
+        if stack:
+            stack[-1] += total
+        self.records.append((name, total, total - children))
+        
+    def report(self, title, limit=25):
+        lines = [title, f"{'propio ms':>10} {'total ms':>10}  módulo"]
+        for name, total, own in sorted(self.records, key=lambda r: -r[1])[:limit]:
+            lines.append(f"{own * 1000:10.1f} {total * 1000:10.1f}  {name}")
+        packages = {}
+        for name, total, own in self.records:
+            top = name.split('.')[0]
+            packages[top] = packages.get(top, 0.0) + own
+        lines.append("")
+        lines.append("Por paquete (tiempo propio acumulado):")
+        for top, own in sorted(packages.items(), key=lambda r: -r[1])[:limit]:
+            lines.append(f"{own * 1000:10.1f}  {top}")
+        return "\n".join(lines)
+
+class TimedLoader:
+    def __init__(self, loader, timer, name):
+        self.loader = loader
+        self.timer = timer
+        self.name = name
+        
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+        
+    def exec_module(self, module):
+        started = self.timer.enter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer.leave(self.name, started)
+            
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+IMPORT_TIMER = None
+if '--import-report' in sys.argv:
+    IMPORT_TIMER = ImportTimer()
+    sys.meta_path.insert(0, IMPORT_TIMER)
+
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QPushButton, QFileDialog, QLabel, QSlider, 
                              QHBoxLayout, QFrame, QGraphicsDropShadowEffect, 
-                             QScrollArea, QGridLayout, QComboBox)
-from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty, QPoint
+                             QScrollArea, QGridLayout, QComboBox, QListWidget,
+                             QListWidgetItem)
+from PyQt6.QtCore import Qt, QEvent, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty, pyqtSignal, QPoint
 from PyQt6.QtGui import QFont, QColor, QPalette, QCursor
 import pyqtgraph.opengl as gl
 from pyqtgraph import PlotWidget
 import pyqtgraph as pg
-from PIL import Image
-from scipy.signal import find_peaks
-from scipy.interpolate import interp1d
+from analysis import (native_image_array, compute_luminance,
+                      analyze_spectrum, content_key, default_analysis_cache,
+                      export_spectrum, load_spectrum, FileFrameSequence,
+                      FolderFrameSequence, SyntheticSource, LiveFeed, make_frame_source,
+                      span, enable_profiling, active_profiler, format_spans,
+                      format_memory, parse_bytes, FILTER_KINDS, SpectrumFilter,
+                      shifted_spectrum, spectral_peaks, peak_frequency,
+                      row_analysis, row_slice, spectrum_image)
 
 class AnimatedButton(QPushButton):
     def __init__(self, text, parent=None):
@@ -178,9 +263,32 @@ class ModernSlider(QWidget):
         self.setLayout(layout)
 
 class ResultsWindow(QMainWindow):
-    def __init__(self, image_data, parent=None):
+    rows_ready = pyqtSignal(int, object)
+    rows_failed = pyqtSignal(int, str)
+    # "Todas las filas" por encima de este tamaño se limita a una banda
+    # central: tiempo y memoria de row_analysis crecen con la imagen
+    ROWS_MAX_PIXELS = 2 << 20
+    
+    def __init__(self, image_data, parent=None, luminance=None, result=None):
         super().__init__(parent)
         self.image_data = image_data
+        # Con un resultado importado no hace falta la imagen original
+        self.result = result
+        if result is None and luminance is None:
+            luminance = compute_luminance(image_data)
+        self.luminance = luminance
+        self.charts = {}
+        self.items = {}
+        self.metric_labels = {}
+        self.filter_panel = None
+        self.spectrum_filter = None
+        self.filter_peaks = []
+        self.rows_result = None
+        self.rows_height = None
+        self.rows_generation = 0
+        self.rows_executor = ThreadPoolExecutor(max_workers=1)
+        self.rows_ready.connect(self.on_rows_ready)
+        self.rows_failed.connect(self.on_rows_failed)
         self.init_ui()
         self.calculate_all()
         
@@ -236,6 +344,37 @@ class ResultsWindow(QMainWindow):
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.main_layout.addWidget(title)
         
+        export_row = QHBoxLayout()
+        self.export_btn = AnimatedButton("💾 Exportar espectro")
+        self.export_btn.clicked.connect(self.export_results)
+        self.export_status = QLabel("")
+        self.export_status.setStyleSheet("""
+            QLabel {
+                color: #8090B0;
+                font-size: 11px;
+                font-family: 'Segoe UI', sans-serif;
+            }
+        """)
+        # Estrategia y pico de memoria del último análisis (no hay medida si
+        # el resultado viene de la caché o de un espectro importado)
+        self.memory_status = QLabel("")
+        self.memory_status.setStyleSheet("""
+            QLabel {
+                color: #8090B0;
+                font-size: 11px;
+                font-family: 'Consolas', monospace;
+            }
+        """)
+        export_row.addWidget(self.export_btn)
+        export_row.addWidget(self.export_status, 1)
+        export_row.addWidget(self.memory_status)
+        self.main_layout.addLayout(export_row)
+        
+        # Tiempos por etapa, solo con el perfilado activo (app.py --profile)
+        self.profile_label = None
+        if active_profiler() is not None:
+            self.main_layout.addWidget(self.create_profile_card())
+        
         content.setLayout(self.main_layout)
         scroll.setWidget(content)
         
@@ -296,6 +435,7 @@ class ResultsWindow(QMainWindow):
         layout.addStretch()
         
         card.setLayout(layout)
+        card.value_label = value_label
         return card
         
     def create_chart_card(self, title, plot_widget):
@@ -329,45 +469,123 @@ class ResultsWindow(QMainWindow):
         card.setLayout(layout)
         return card
         
-    def calculate_all(self):
-        gray = np.mean(self.image_data, axis=2)
-        h, w = gray.shape
-        
-        # FFT 2D
-        fft = np.fft.fft2(gray)
-        fft_shift = np.fft.fftshift(fft)
-        magnitude = np.abs(fft_shift)
-        phase = np.angle(fft_shift)
-        power_spectrum = magnitude ** 2
-        
-        # Cálculos
-        mean_mag = np.mean(magnitude)
-        max_mag = np.max(magnitude)
-        std_mag = np.std(magnitude)
-        total_energy = np.sum(power_spectrum)
-        
-        # Entropía espectral
-        normalized_power = power_spectrum / np.sum(power_spectrum)
-        spectral_entropy = -np.sum(normalized_power * np.log2(normalized_power + 1e-12))
-        
-        # SNR
-        signal_power = np.max(power_spectrum)
-        noise_power = np.median(power_spectrum)
-        snr = 10 * np.log10(signal_power / noise_power) if noise_power > 0 else 0
+    def create_profile_card(self):
+        self.profile_label = QLabel("")
+        self.profile_label.setStyleSheet("""
+            QLabel {
+                color: #C0C8E0;
+                font-size: 11px;
+                font-family: 'Consolas', monospace;
+            }
+        """)
+        self.profile_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        
+        trace_btn = AnimatedButton("⏱ Exportar traza")
+        trace_btn.clicked.connect(self.export_trace)
+        
+        frame = QWidget()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.profile_label)
+        layout.addWidget(trace_btn, 0, Qt.AlignmentFlag.AlignLeft)
+        frame.setLayout(layout)
+        return self.create_chart_card("⏱ Perfilado (último cálculo)", frame)
+        
+    def update_profile_card(self, since):
+        profiler = active_profiler()
+        if self.profile_label is None or profiler is None:
+            return
+        self.profile_label.setText(format_spans(profiler.since(since)))
+        
+    def export_trace(self):
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Traza", "traza.json", "Trace Event JSON (*.json)"
+        )
+        if not file_name:
+            return
+        try:
+            active_profiler().export_trace(file_name)
+        except OSError as e:
+            self.export_status.setText(f"✗ Error al exportar: {e}")
+        else:
+            self.export_status.setText(f"✓ Traza en {os.path.basename(file_name)} (chrome://tracing, Perfetto)")
         
+    def export_results(self):
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Espectro", "espectro.npz", "Espectro comprimido (*.npz)"
+        )
+        if not file_name:
+            return
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            export_spectrum(file_name, self.result)
+        except OSError as e:
+            self.export_status.setText(f"✗ Error al exportar: {e}")
+        else:
+            self.export_status.setText(f"✓ Exportado a {os.path.basename(file_name)}")
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+    def load_analysis(self):
+        if self.result is not None:
+            return self.result
+        cache = default_analysis_cache()
+        with span('cache_leer'):
+            key = content_key(self.luminance)
+            result = cache.get(key)
+        if result is None:
+            result = analyze_spectrum(self.luminance)
+            # La escritura comprimida no retrasa la apertura del dashboard
+            threading.Thread(target=cache.put, args=(key, result)).start()
+        return result
+        
+    def calculate_all(self):
+        # Los cálculos viven en analysis.py; aquí solo se construyen los gráficos.
+        # Una imagen ya analizada se lee de la caché en disco
+        started = time.perf_counter()
+        with span('calculate_all'):
+            self.show_result(self.load_analysis(), self.luminance)
+        self.update_profile_card(started)
+        
+    def show_result(self, result, luminance=None):
+        # Los widgets se crean una sola vez; cada resultado nuevo solo
+        # actualiza los datos de las curvas e imágenes existentes. Sin la
+        # luminancia del resultado, el análisis por filas la recompone del
+        # espectro
+        if not self.charts:
+            with span('construir_dashboard'):
+                self.build_dashboard()
+        self.result = result
+        self.luminance = luminance
+        with span('actualizar_dashboard'):
+            self.update_dashboard(result)
+        self.reset_rows()
+        # El filtro se prepara de nuevo con el espectro del resultado nuevo
+        self.spectrum_filter = None
+        if self.filter_panel is not None and self.filter_panel.isVisible():
+            self.reset_filter()
+        memory = result.get('memory')
+        self.memory_status.setText(f"🧠 {format_memory(memory)}" if memory else "")
+        
+    def build_dashboard(self):
         # Crear grid de métricas
         metrics_grid = QGridLayout()
         metrics_grid.setSpacing(10)
         
-        metrics_grid.addWidget(self.create_metric_card("ℱ", f"{h}×{w}", "Dimensiones FFT"), 0, 0)
-        metrics_grid.addWidget(self.create_metric_card("μ(|F|)", f"{mean_mag:.3e}", "Magnitud promedio"), 0, 1)
-        metrics_grid.addWidget(self.create_metric_card("max", f"{max_mag:.3e}", "Magnitud máxima"), 0, 2)
-        metrics_grid.addWidget(self.create_metric_card("σ", f"{std_mag:.3e}", "Desviación estándar"), 0, 3)
-        
-        metrics_grid.addWidget(self.create_metric_card("E", f"{total_energy:.3e}", "Energía total"), 1, 0)
-        metrics_grid.addWidget(self.create_metric_card("H", f"{spectral_entropy:.2f}", "Entropía espectral"), 1, 1)
-        metrics_grid.addWidget(self.create_metric_card("SNR", f"{snr:.1f} dB", "Señal/Ruido"), 1, 2)
-        metrics_grid.addWidget(self.create_metric_card("⟨φ⟩", f"{np.mean(phase):.3f}", "Fase promedio"), 1, 3)
+        metric_cards = [
+            ('dimensions', "ℱ", "Dimensiones FFT"),
+            ('mean_magnitude', "μ(|F|)", "Magnitud promedio"),
+            ('max_magnitude', "max", "Magnitud máxima"),
+            ('std_magnitude', "σ", "Desviación estándar"),
+            ('total_energy', "E", "Energía total"),
+            ('spectral_entropy', "H", "Entropía espectral"),
+            ('snr_db', "SNR", "Señal/Ruido"),
+            ('phase_mean', "⟨φ⟩", "Fase promedio"),
+        ]
+        for i, (key, symbol, label) in enumerate(metric_cards):
+            card = self.create_metric_card(symbol, "", label)
+            self.metric_labels[key] = card.value_label
+            metrics_grid.addWidget(card, i // 4, i % 4)
         
         metrics_container = QWidget()
         metrics_container.setLayout(metrics_grid)
@@ -381,8 +599,7 @@ class ResultsWindow(QMainWindow):
         mag_plot = PlotWidget()
         mag_plot.setBackground('#1A1A2A')
         mag_plot.setFixedHeight(200)
-        mag_slice = magnitude[h//2, :]
-        mag_plot.plot(mag_slice, pen=pg.mkPen(color='#6478FF', width=2))
+        self.items['magnitude_slice'] = mag_plot.plot(pen=pg.mkPen(color='#6478FF', width=2))
         mag_plot.setLabel('left', 'Magnitud')
         mag_plot.setLabel('bottom', 'Frecuencia')
         mag_plot.showGrid(x=True, y=True, alpha=0.2)
@@ -391,8 +608,7 @@ class ResultsWindow(QMainWindow):
         phase_plot = PlotWidget()
         phase_plot.setBackground('#1A1A2A')
         phase_plot.setFixedHeight(200)
-        phase_hist, phase_bins = np.histogram(phase.flatten(), bins=50)
-        phase_plot.plot(phase_bins[:-1], phase_hist, pen=pg.mkPen(color='#FF6B9D', width=2), fillLevel=0, brush=(255, 107, 157, 100))
+        self.items['phase_histogram'] = phase_plot.plot(pen=pg.mkPen(color='#FF6B9D', width=2), fillLevel=0, brush=(255, 107, 157, 100))
         phase_plot.setLabel('left', 'Frecuencia')
         phase_plot.setLabel('bottom', 'Fase (rad)')
         phase_plot.showGrid(x=True, y=True, alpha=0.2)
@@ -401,16 +617,15 @@ class ResultsWindow(QMainWindow):
         power_plot = PlotWidget()
         power_plot.setBackground('#1A1A2A')
         power_plot.setFixedHeight(200)
-        power_log = np.log10(power_spectrum[h//2, :] + 1)
-        power_plot.plot(power_log, pen=pg.mkPen(color='#50C878', width=2))
+        self.items['power_slice'] = power_plot.plot(pen=pg.mkPen(color='#50C878', width=2))
         power_plot.setLabel('left', 'log₁₀(Potencia)')
         power_plot.setLabel('bottom', 'Frecuencia')
         power_plot.showGrid(x=True, y=True, alpha=0.2)
         
         # Gráfico 4: Mapa de calor 2D de magnitud
-        magnitude_log = np.log(magnitude + 1)
-        img_item = pg.ImageItem(magnitude_log)
+        img_item = pg.ImageItem()
         img_item.setLookupTable(pg.colormap.get('viridis').getLookupTable())
+        self.items['magnitude_heatmap'] = img_item
         
         heat_plot = PlotWidget()
         heat_plot.setBackground('#1A1A2A')
@@ -500,8 +715,9 @@ class ResultsWindow(QMainWindow):
             return lut
         
         # FFT 2D - Vista XY (Magnitud)
-        fft_xy_mag = pg.ImageItem(magnitude_log)
+        fft_xy_mag = pg.ImageItem()
         fft_xy_mag.setLookupTable(create_colormap('viridis'))
+        self.items['fft_xy'] = fft_xy_mag
         fft_xy_plot = PlotWidget()
         fft_xy_plot.setBackground('#1A1A2A')
         fft_xy_plot.setFixedHeight(200)
@@ -511,11 +727,9 @@ class ResultsWindow(QMainWindow):
         fft_xy_plot.setLabel('bottom', 'X')
         
         # FFT 2D - Vista XZ (Proyección lateral)
-        fft_xz = np.sum(magnitude_log, axis=0)
-        fft_xz_norm = (fft_xz - fft_xz.min()) / (fft_xz.max() - fft_xz.min() + 1e-10)
-        fft_xz_2d = np.tile(fft_xz_norm, (50, 1))
-        fft_xz_img = pg.ImageItem(fft_xz_2d)
+        fft_xz_img = pg.ImageItem()
         fft_xz_img.setLookupTable(create_colormap('plasma'))
+        self.items['fft_xz'] = fft_xz_img
         fft_xz_plot = PlotWidget()
         fft_xz_plot.setBackground('#1A1A2A')
         fft_xz_plot.setFixedHeight(200)
@@ -524,11 +738,9 @@ class ResultsWindow(QMainWindow):
         fft_xz_plot.setLabel('bottom', 'X')
         
         # FFT 2D - Vista YZ (Proyección frontal)
-        fft_yz = np.sum(magnitude_log, axis=1)
-        fft_yz_norm = (fft_yz - fft_yz.min()) / (fft_yz.max() - fft_yz.min() + 1e-10)
-        fft_yz_2d = np.tile(fft_yz_norm.reshape(-1, 1), (1, 50))
-        fft_yz_img = pg.ImageItem(fft_yz_2d)
+        fft_yz_img = pg.ImageItem()
         fft_yz_img.setLookupTable(create_colormap('inferno'))
+        self.items['fft_yz'] = fft_yz_img
         fft_yz_plot = PlotWidget()
         fft_yz_plot.setBackground('#1A1A2A')
         fft_yz_plot.setFixedHeight(200)
@@ -552,15 +764,11 @@ class ResultsWindow(QMainWindow):
         fourier_grid = QGridLayout()
         fourier_grid.setSpacing(10)
         
-        # Componentes real e imaginaria
-        real_part = np.real(fft_shift)
-        imag_part = np.imag(fft_shift)
-        
+        # Componentes real e imaginaria (corte central)
         real_plot = PlotWidget()
         real_plot.setBackground('#1A1A2A')
         real_plot.setFixedHeight(200)
-        real_slice = real_part[h//2, :]
-        real_plot.plot(real_slice, pen=pg.mkPen(color='#50C878', width=2))
+        self.items['real_part'] = real_plot.plot(pen=pg.mkPen(color='#50C878', width=2))
         real_plot.setLabel('left', 'Re(F)')
         real_plot.setLabel('bottom', 'Frecuencia')
         real_plot.showGrid(x=True, y=True, alpha=0.2)
@@ -568,17 +776,15 @@ class ResultsWindow(QMainWindow):
         imag_plot = PlotWidget()
         imag_plot.setBackground('#1A1A2A')
         imag_plot.setFixedHeight(200)
-        imag_slice = imag_part[h//2, :]
-        imag_plot.plot(imag_slice, pen=pg.mkPen(color='#FF6B9D', width=2))
+        self.items['imag_part'] = imag_plot.plot(pen=pg.mkPen(color='#FF6B9D', width=2))
         imag_plot.setLabel('left', 'Im(F)')
         imag_plot.setLabel('bottom', 'Frecuencia')
         imag_plot.showGrid(x=True, y=True, alpha=0.2)
         
         # Densidad espectral de potencia 2D
-        psd_2d = power_spectrum / np.sum(power_spectrum)
-        psd_log = np.log10(psd_2d + 1e-12)
-        psd_img = pg.ImageItem(psd_log)
+        psd_img = pg.ImageItem()
         psd_img.setLookupTable(create_colormap('hot'))
+        self.items['psd_2d'] = psd_img
         psd_plot = PlotWidget()
         psd_plot.setBackground('#1A1A2A')
         psd_plot.setFixedHeight(200)
@@ -590,43 +796,20 @@ class ResultsWindow(QMainWindow):
         fourier_grid.addWidget(self.create_chart_card("📉 Componente Imaginaria Im(F)", imag_plot), 0, 1)
         fourier_grid.addWidget(self.create_chart_card("🔥 Densidad Espectral de Potencia 2D", psd_plot), 0, 2)
         
-        # Frecuencias radiales y angulares
-        center_y, center_x = h // 2, w // 2
-        y_coords, x_coords = np.ogrid[:h, :w]
-        r = np.sqrt((x_coords - center_x)**2 + (y_coords - center_y)**2)
-        theta = np.arctan2(y_coords - center_y, x_coords - center_x)
-        
         # Perfil radial
-        max_r = int(min(center_x, center_y))
-        radial_profile = np.zeros(max_r)
-        for i in range(max_r):
-            mask = (r >= i) & (r < i + 1)
-            if np.sum(mask) > 0:
-                radial_profile[i] = np.mean(magnitude[mask])
-        
         radial_plot = PlotWidget()
         radial_plot.setBackground('#1A1A2A')
         radial_plot.setFixedHeight(200)
-        radial_plot.plot(radial_profile, pen=pg.mkPen(color='#FFD700', width=2))
+        self.items['radial_profile'] = radial_plot.plot(pen=pg.mkPen(color='#FFD700', width=2))
         radial_plot.setLabel('left', 'Magnitud')
         radial_plot.setLabel('bottom', 'Frecuencia Radial')
         radial_plot.showGrid(x=True, y=True, alpha=0.2)
         
         # Perfil angular
-        n_angles = 360
-        angular_profile = np.zeros(n_angles)
-        for i in range(n_angles):
-            angle_min = np.deg2rad(i - 1)
-            angle_max = np.deg2rad(i + 1)
-            mask = (theta >= angle_min) & (theta < angle_max)
-            if np.sum(mask) > 0:
-                angular_profile[i] = np.mean(magnitude[mask])
-        
         angular_plot = PlotWidget()
         angular_plot.setBackground('#1A1A2A')
         angular_plot.setFixedHeight(200)
-        angles = np.arange(n_angles)
-        angular_plot.plot(angles, angular_profile, pen=pg.mkPen(color='#00CED1', width=2))
+        self.items['angular_profile'] = angular_plot.plot(pen=pg.mkPen(color='#00CED1', width=2))
         angular_plot.setLabel('left', 'Magnitud')
         angular_plot.setLabel('bottom', 'Ángulo (grados)')
         angular_plot.showGrid(x=True, y=True, alpha=0.2)
@@ -635,15 +818,11 @@ class ResultsWindow(QMainWindow):
         fourier_grid.addWidget(self.create_chart_card("🔄 Perfil Angular de Frecuencias", angular_plot), 1, 1)
         
         # Barra de frecuencias dominantes
-        flat_mag = magnitude.flatten()
-        top_indices = np.argpartition(flat_mag, -10)[-10:]
-        top_freqs = sorted(flat_mag[top_indices], reverse=True)
-        
         freq_bar = PlotWidget()
         freq_bar.setBackground('#1A1A2A')
         freq_bar.setFixedHeight(200)
-        x_bar = np.arange(len(top_freqs))
-        bargraph = pg.BarGraphItem(x=x_bar, height=top_freqs, width=0.6, brush='#8296FF')
+        bargraph = pg.BarGraphItem(x=np.arange(10), height=np.zeros(10), width=0.6, brush='#8296FF')
+        self.items['top_freqs'] = bargraph
         freq_bar.addItem(bargraph)
         freq_bar.setLabel('left', 'Magnitud')
         freq_bar.setLabel('bottom', 'Top Frecuencias')
@@ -665,23 +844,9 @@ class ResultsWindow(QMainWindow):
         
         # Aproximación de Laplace usando decaimiento exponencial
         # L{f(t)} ≈ Σ f(n)e^(-sn) donde s = σ + jω
-        t = np.linspace(0, 10, gray.shape[1])
-        signal_1d = gray[h//2, :]
-        
-        # Respuesta en frecuencia para diferentes valores de sigma
-        sigmas = np.linspace(0.01, 2, 100)
-        omega = np.linspace(-np.pi, np.pi, 100)
-        
-        laplace_mag = np.zeros((len(sigmas), len(omega)))
-        for i, sigma in enumerate(sigmas):
-            for j, w in enumerate(omega):
-                s = sigma + 1j * w
-                dt = t[1] - t[0] if len(t) > 1 else 1
-                laplace_val = np.sum(signal_1d * np.exp(-s * t[:len(signal_1d)])) * dt
-                laplace_mag[i, j] = np.abs(laplace_val)
-        
-        laplace_img = pg.ImageItem(np.log10(laplace_mag + 1))
+        laplace_img = pg.ImageItem()
         laplace_img.setLookupTable(create_colormap('turbo'))
+        self.items['laplace_plane'] = laplace_img
         laplace_plot = PlotWidget()
         laplace_plot.setBackground('#1A1A2A')
         laplace_plot.setFixedHeight(200)
@@ -690,11 +855,10 @@ class ResultsWindow(QMainWindow):
         laplace_plot.setLabel('bottom', 'ω (parte imaginaria)')
         
         # Respuesta al impulso (inversa aproximada)
-        impulse_response = np.fft.ifft(magnitude[h//2, :]).real
         impulse_plot = PlotWidget()
         impulse_plot.setBackground('#1A1A2A')
         impulse_plot.setFixedHeight(200)
-        impulse_plot.plot(impulse_response[:200], pen=pg.mkPen(color='#FF69B4', width=2))
+        self.items['impulse_response'] = impulse_plot.plot(pen=pg.mkPen(color='#FF69B4', width=2))
         impulse_plot.setLabel('left', 'Amplitud')
         impulse_plot.setLabel('bottom', 'Tiempo')
         impulse_plot.showGrid(x=True, y=True, alpha=0.2)
@@ -704,10 +868,6 @@ class ResultsWindow(QMainWindow):
         zeros_poles_plot.setBackground('#1A1A2A')
         zeros_poles_plot.setFixedHeight(200)
         
-        # Encontrar máximos locales como "polos"
-        from scipy.signal import find_peaks
-        peaks, _ = find_peaks(np.abs(signal_1d), height=np.mean(signal_1d))
-        
         # Círculo unitario
         theta_circle = np.linspace(0, 2*np.pi, 100)
         x_circle = np.cos(theta_circle)
@@ -715,11 +875,7 @@ class ResultsWindow(QMainWindow):
         zeros_poles_plot.plot(x_circle, y_circle, pen=pg.mkPen(color='#FFFFFF', width=1, style=Qt.PenStyle.DashLine))
         
         # Polos (x) y ceros (o)
-        if len(peaks) > 0:
-            pole_angles = 2 * np.pi * peaks / len(signal_1d)
-            pole_x = 0.8 * np.cos(pole_angles)
-            pole_y = 0.8 * np.sin(pole_angles)
-            zeros_poles_plot.plot(pole_x, pole_y, pen=None, symbol='x', symbolSize=12, symbolBrush='#FF6B6B')
+        self.items['poles'] = zeros_poles_plot.plot(pen=None, symbol='x', symbolSize=12, symbolBrush='#FF6B6B')
         
         zeros_poles_plot.setLabel('left', 'Imaginario')
         zeros_poles_plot.setLabel('bottom', 'Real')
@@ -733,6 +889,585 @@ class ResultsWindow(QMainWindow):
         laplace_container = QWidget()
         laplace_container.setLayout(laplace_grid)
         self.main_layout.addWidget(laplace_container)
+        
+        # Laplace, impulso y polos de todas las filas o de una banda: se calculan
+        # por lotes en segundo plano y el deslizador "Fila" recorre la pila
+        self.rows_mode_combo = QComboBox()
+        self.rows_mode_combo.addItems(["Fila central", "Todas las filas", "Banda de filas"])
+        self.rows_mode_combo.setStyleSheet("""
+            QComboBox {
+                background: #2A2A3E;
+                color: #E0E0E0;
+                border: 2px solid #6478FF;
+                border-radius: 12px;
+                padding: 8px 12px;
+                font-size: 13px;
+            }
+            QComboBox QAbstractItemView {
+                background: #2A2A3E;
+                color: #E0E0E0;
+                selection-background-color: #6478FF;
+                border: 2px solid #6478FF;
+            }
+        """)
+        self.rows_mode_combo.currentIndexChanged.connect(self.change_rows_mode)
+        
+        self.rows_from_slider = ModernSlider("Desde fila", 0, 1, 0)
+        self.rows_to_slider = ModernSlider("Hasta fila", 0, 1, 0)
+        self.row_slider = ModernSlider("Fila", 0, 1, 0)
+        self.rows_timer = QTimer()
+        self.rows_timer.setSingleShot(True)
+        self.rows_timer.setInterval(200)
+        self.rows_timer.timeout.connect(self.compute_rows)
+        # Con resultados seguidos (secuencia, vídeo en vivo) las filas se
+        # calculan una vez, cuando dejan de llegar
+        self.rows_settle_timer = QTimer()
+        self.rows_settle_timer.setSingleShot(True)
+        self.rows_settle_timer.setInterval(500)
+        self.rows_settle_timer.timeout.connect(self.compute_rows)
+        for slider in (self.rows_from_slider, self.rows_to_slider):
+            slider.setEnabled(False)
+            slider.slider.valueChanged.connect(self.schedule_rows)
+            slider.slider.sliderReleased.connect(self.schedule_rows)
+        self.row_slider.setEnabled(False)
+        self.row_slider.slider.valueChanged.connect(self.show_row)
+        
+        self.rows_status = QLabel("")
+        self.rows_status.setStyleSheet(self.memory_status.styleSheet())
+        
+        rows_controls = QHBoxLayout()
+        rows_controls.setSpacing(15)
+        rows_controls.addWidget(self.rows_mode_combo)
+        rows_controls.addWidget(self.rows_from_slider, 1)
+        rows_controls.addWidget(self.rows_to_slider, 1)
+        rows_controls.addWidget(self.row_slider, 2)
+        rows_controls_widget = QWidget()
+        rows_controls_widget.setLayout(rows_controls)
+        
+        rows_panel = QWidget()
+        rows_panel_layout = QVBoxLayout()
+        rows_panel_layout.setContentsMargins(0, 0, 0, 0)
+        rows_panel_layout.addWidget(rows_controls_widget)
+        rows_panel_layout.addWidget(self.rows_status)
+        rows_panel.setLayout(rows_panel_layout)
+        self.main_layout.addWidget(self.create_chart_card("🧮 Análisis por filas", rows_panel))
+        
+        # Agregados entre filas; visibles cuando hay una pila calculada
+        rows_laplace_img = pg.ImageItem()
+        rows_laplace_img.setLookupTable(create_colormap('turbo'))
+        self.items['rows_laplace'] = rows_laplace_img
+        rows_laplace_plot = PlotWidget()
+        rows_laplace_plot.setBackground('#1A1A2A')
+        rows_laplace_plot.setFixedHeight(200)
+        rows_laplace_plot.addItem(rows_laplace_img)
+        rows_laplace_plot.setLabel('left', 'σ (parte real)')
+        rows_laplace_plot.setLabel('bottom', 'ω (parte imaginaria)')
+        self.rows_stat_combo = QComboBox()
+        self.rows_stat_combo.addItems(["Media", "Percentil 50", "Percentil 90"])
+        self.rows_stat_combo.setStyleSheet(self.rows_mode_combo.styleSheet())
+        self.rows_stat_combo.currentIndexChanged.connect(self.update_rows_statistic)
+        rows_laplace_widget = QWidget()
+        rows_laplace_layout = QVBoxLayout()
+        rows_laplace_layout.setContentsMargins(0, 0, 0, 0)
+        rows_laplace_layout.addWidget(self.rows_stat_combo)
+        rows_laplace_layout.addWidget(rows_laplace_plot)
+        rows_laplace_widget.setLayout(rows_laplace_layout)
+        
+        rows_impulse_plot = PlotWidget()
+        rows_impulse_plot.setBackground('#1A1A2A')
+        rows_impulse_plot.setFixedHeight(200)
+        self.items['rows_impulse_p10'] = rows_impulse_plot.plot(pen=pg.mkPen(color='#FF69B4', width=1, style=Qt.PenStyle.DashLine))
+        self.items['rows_impulse_p90'] = rows_impulse_plot.plot(pen=pg.mkPen(color='#FF69B4', width=1, style=Qt.PenStyle.DashLine))
+        rows_impulse_plot.addItem(pg.FillBetweenItem(self.items['rows_impulse_p10'], self.items['rows_impulse_p90'],
+                                                     brush=(255, 105, 180, 60)))
+        self.items['rows_impulse_mean'] = rows_impulse_plot.plot(pen=pg.mkPen(color='#FFFFFF', width=2))
+        rows_impulse_plot.setLabel('left', 'Amplitud')
+        rows_impulse_plot.setLabel('bottom', 'Tiempo')
+        rows_impulse_plot.showGrid(x=True, y=True, alpha=0.2)
+        
+        density_img = pg.ImageItem()
+        density_img.setLookupTable(create_colormap('hot'))
+        self.items['rows_peak_density'] = density_img
+        density_plot = PlotWidget()
+        density_plot.setBackground('#1A1A2A')
+        density_plot.setFixedHeight(200)
+        density_plot.addItem(density_img)
+        density_plot.setLabel('left', 'Columna (bin)')
+        density_plot.setLabel('bottom', 'Fila (bin)')
+        
+        rows_grid = QGridLayout()
+        rows_grid.setSpacing(10)
+        rows_grid.addWidget(self.create_chart_card("🌐 |L{f}(s)| sobre las filas", rows_laplace_widget), 0, 0)
+        rows_grid.addWidget(self.create_chart_card("⚡ h(t): media y banda p10–p90", rows_impulse_plot), 0, 1)
+        rows_grid.addWidget(self.create_chart_card("⭕ Densidad de picos (filas × columnas)", density_plot), 0, 2)
+        self.rows_aggregates = QWidget()
+        self.rows_aggregates.setLayout(rows_grid)
+        self.rows_aggregates.hide()
+        self.main_layout.addWidget(self.rows_aggregates)
+        
+        # Sección de filtrado en frecuencia; el panel se construye al abrirlo
+        filter_section = QLabel("🎛 FILTRADO EN FRECUENCIA")
+        filter_section.setStyleSheet(fft_section.styleSheet())
+        self.main_layout.addWidget(filter_section)
+        
+        self.filter_toggle = ToggleButton("Mostrar filtro", "Ocultar filtro", "🎛", "🎛")
+        self.filter_toggle.clicked.connect(self.toggle_filter_panel)
+        self.main_layout.addWidget(self.filter_toggle, 0, Qt.AlignmentFlag.AlignLeft)
+        
+        # Nombres de archivo para la exportación a PNG
+        self.charts = {
+            'magnitude_slice': mag_plot,
+            'phase_histogram': phase_plot,
+            'power_slice': power_plot,
+            'magnitude_heatmap': heat_plot,
+            'fft_xy': fft_xy_plot,
+            'fft_xz': fft_xz_plot,
+            'fft_yz': fft_yz_plot,
+            'real_part': real_plot,
+            'imag_part': imag_plot,
+            'psd_2d': psd_plot,
+            'radial_profile': radial_plot,
+            'angular_profile': angular_plot,
+            'top_freqs': freq_bar,
+            'laplace_plane': laplace_plot,
+            'impulse_response': impulse_plot,
+            'pole_zero': zeros_poles_plot,
+        }
+        
+    def update_dashboard(self, result):
+        metrics = result['metrics']
+        h, w = metrics['height'], metrics['width']
+        magnitude = result['magnitude']
+        phase = result['phase']
+        power_spectrum = result['power_spectrum']
+        items = self.items
+        
+        with span('tarjetas_metricas'):
+            self.metric_labels['dimensions'].setText(f"{h}×{w}")
+            self.metric_labels['mean_magnitude'].setText(f"{metrics['mean_magnitude']:.3e}")
+            self.metric_labels['max_magnitude'].setText(f"{metrics['max_magnitude']:.3e}")
+            self.metric_labels['std_magnitude'].setText(f"{metrics['std_magnitude']:.3e}")
+            self.metric_labels['total_energy'].setText(f"{metrics['total_energy']:.3e}")
+            self.metric_labels['spectral_entropy'].setText(f"{metrics['spectral_entropy']:.2f}")
+            self.metric_labels['snr_db'].setText(f"{metrics['snr_db']:.1f} dB")
+            self.metric_labels['phase_mean'].setText(f"{metrics['phase_mean']:.3f}")
+        
+        with span('grafico:magnitude_slice'):
+            items['magnitude_slice'].setData(magnitude[h//2, :])
+        with span('grafico:phase_histogram'):
+            phase_hist, phase_bins = np.histogram(phase.flatten(), bins=50)
+            items['phase_histogram'].setData(phase_bins[:-1], phase_hist)
+        with span('grafico:power_slice'):
+            items['power_slice'].setData(np.log10(power_spectrum[h//2, :] + 1))
+        
+        with span('grafico:magnitude_heatmap'):
+            magnitude_log = np.log(magnitude + 1)
+            items['magnitude_heatmap'].setImage(magnitude_log)
+        with span('grafico:fft_xy'):
+            items['fft_xy'].setImage(magnitude_log)
+        
+        with span('grafico:fft_xz'):
+            fft_xz = np.sum(magnitude_log, axis=0)
+            fft_xz_norm = (fft_xz - fft_xz.min()) / (fft_xz.max() - fft_xz.min() + 1e-10)
+            items['fft_xz'].setImage(np.tile(fft_xz_norm, (50, 1)))
+        
+        with span('grafico:fft_yz'):
+            fft_yz = np.sum(magnitude_log, axis=1)
+            fft_yz_norm = (fft_yz - fft_yz.min()) / (fft_yz.max() - fft_yz.min() + 1e-10)
+            items['fft_yz'].setImage(np.tile(fft_yz_norm.reshape(-1, 1), (1, 50)))
+        
+        fft_center_row = result['fft_center_row']
+        with span('grafico:real_part'):
+            items['real_part'].setData(np.real(fft_center_row))
+        with span('grafico:imag_part'):
+            items['imag_part'].setData(np.imag(fft_center_row))
+        
+        with span('grafico:psd_2d'):
+            psd_2d = power_spectrum / np.sum(power_spectrum)
+            items['psd_2d'].setImage(np.log10(psd_2d + 1e-12))
+        
+        with span('grafico:radial_profile'):
+            items['radial_profile'].setData(result['radial_profile'])
+        with span('grafico:angular_profile'):
+            angular_profile = result['angular_profile']
+            items['angular_profile'].setData(np.arange(len(angular_profile)), angular_profile)
+        
+        with span('grafico:top_freqs'):
+            top_freqs = result['top_freqs']
+            items['top_freqs'].setOpts(x=np.arange(len(top_freqs)), height=top_freqs)
+        
+        self.update_line_charts(result, w)
+        
+        # Los rangos se ajustan al nuevo contenido aunque el usuario haya hecho zoom
+        with span('autorango'):
+            for plot in self.charts.values():
+                plot.enableAutoRange()
+        
+    def update_line_charts(self, line, width):
+        # Laplace, impulso y polos de una fila: la central del resultado o
+        # una de la pila de row_analysis
+        items = self.items
+        with span('grafico:laplace_plane'):
+            items['laplace_plane'].setImage(np.log10(line['laplace_mag'] + 1))
+        with span('grafico:impulse_response'):
+            items['impulse_response'].setData(line['impulse_response'][:200])
+        
+        # Máximos locales como "polos"
+        with span('grafico:pole_zero'):
+            pole_angles = 2 * np.pi * line['peaks'] / width
+            items['poles'].setData(0.8 * np.cos(pole_angles), 0.8 * np.sin(pole_angles))
+        
+    def reset_rows(self):
+        # Resultado nuevo: la pila anterior ya no vale. La banda y la fila
+        # elegidas se conservan mientras la altura no cambie
+        self.rows_timer.stop()
+        self.rows_generation += 1
+        self.rows_result = None
+        h = self.result['metrics']['height']
+        for slider in (self.rows_from_slider, self.rows_to_slider, self.row_slider):
+            slider.slider.blockSignals(True)
+            slider.slider.setRange(0, h - 1)
+        if h != self.rows_height:
+            self.rows_height = h
+            self.rows_from_slider.slider.setValue(max(0, h // 2 - 32))
+            self.rows_to_slider.slider.setValue(min(h - 1, h // 2 + 32))
+            self.row_slider.slider.setValue(h // 2)
+        for slider in (self.rows_from_slider, self.rows_to_slider, self.row_slider):
+            slider.value_label.setText(str(slider.slider.value()))
+            slider.slider.blockSignals(False)
+        self.rows_aggregates.hide()
+        self.row_slider.setEnabled(False)
+        if self.rows_mode_combo.currentIndex() > 0:
+            self.rows_status.setText("⏸ Filas: se calculan al detenerse los resultados nuevos")
+            self.rows_settle_timer.start()
+        else:
+            self.rows_status.setText(f"Fila central ({h // 2})")
+        
+    def change_rows_mode(self, index):
+        self.rows_from_slider.setEnabled(index == 2)
+        self.rows_to_slider.setEnabled(index == 2)
+        if index == 0:
+            # Vuelta a la fila central del análisis
+            self.rows_timer.stop()
+            self.rows_settle_timer.stop()
+            self.rows_generation += 1
+            self.rows_result = None
+            self.rows_aggregates.hide()
+            self.row_slider.setEnabled(False)
+            h = self.result['metrics']['height']
+            self.rows_status.setText(f"Fila central ({h // 2})")
+            self.update_line_charts(self.result, self.result['metrics']['width'])
+        else:
+            self.compute_rows()
+        
+    def schedule_rows(self):
+        # La banda se recalcula al soltar el deslizador (o tras teclear)
+        if self.rows_mode_combo.currentIndex() != 2 or self.sender().isSliderDown():
+            return
+        self.rows_timer.start()
+        
+    def compute_rows(self):
+        # row_analysis en segundo plano; resultados obsoletos se descartan
+        self.rows_settle_timer.stop()
+        self.rows_generation += 1
+        generation = self.rows_generation
+        result = self.result
+        h, w = result['magnitude'].shape
+        rows = None
+        note = ""
+        if self.rows_mode_combo.currentIndex() == 2:
+            low = self.rows_from_slider.slider.value()
+            high = self.rows_to_slider.slider.value()
+            rows = (min(low, high), max(low, high) + 1)
+        elif h * w > self.ROWS_MAX_PIXELS:
+            count = max(1, self.ROWS_MAX_PIXELS // w)
+            start = max(0, h // 2 - count // 2)
+            rows = (start, min(h, start + count))
+            note = f" · banda central (imagen > {self.ROWS_MAX_PIXELS / 1e6:.0f} Mpx)"
+        gray = self.luminance
+        self.row_slider.setEnabled(False)
+        self.rows_status.setText("⏳ Calculando filas...")
+        
+        def compute():
+            try:
+                started = time.perf_counter()
+                source = gray if gray is not None and gray.shape == (h, w) else spectrum_image(result)
+                with span('analisis_filas'):
+                    rows_result = row_analysis(source, result['magnitude'], rows)
+            except Exception as e:
+                self.rows_failed.emit(generation, f"{type(e).__name__}: {e}")
+                return
+            self.rows_ready.emit(generation, (rows_result, time.perf_counter() - started, note))
+        
+        self.rows_executor.submit(compute)
+        
+    def on_rows_ready(self, generation, payload):
+        if generation != self.rows_generation:
+            return
+        rows_result, seconds, note = payload
+        self.rows_result = rows_result
+        start, stop = rows_result['rows']
+        w = self.result['metrics']['width']
+        self.rows_status.setText(f"Filas {start}–{stop - 1} ({stop - start}) · {seconds:.2f} s · "
+                                 f"{rows_result['peak_counts'].mean():.1f} picos/fila{note}")
+        
+        self.row_slider.slider.blockSignals(True)
+        self.row_slider.slider.setRange(start, stop - 1)
+        self.row_slider.slider.setValue(min(max(self.row_slider.slider.value(), start), stop - 1))
+        self.row_slider.value_label.setText(str(self.row_slider.slider.value()))
+        self.row_slider.slider.blockSignals(False)
+        self.row_slider.setEnabled(True)
+        
+        items = self.items
+        self.update_rows_statistic()
+        impulse_x = np.arange(min(200, w))
+        items['rows_impulse_mean'].setData(impulse_x, rows_result['impulse_mean'][:200])
+        items['rows_impulse_p10'].setData(impulse_x, rows_result['impulse_p10'][:200])
+        items['rows_impulse_p90'].setData(impulse_x, rows_result['impulse_p90'][:200])
+        items['rows_peak_density'].setImage(rows_result['peak_density'])
+        self.rows_aggregates.show()
+        self.show_row(self.row_slider.slider.value())
+        
+    def on_rows_failed(self, generation, message):
+        # Sin pila: vuelta a la fila central; el modo y la banda siguen
+        # disponibles para reintentar
+        if generation != self.rows_generation:
+            return
+        self.rows_result = None
+        self.rows_aggregates.hide()
+        self.row_slider.setEnabled(False)
+        self.rows_status.setText(f"✗ Error en el análisis por filas: {message}")
+        self.update_line_charts(self.result, self.result['metrics']['width'])
+        
+    def update_rows_statistic(self):
+        if self.rows_result is None:
+            return
+        key = ('laplace_mean', 'laplace_p50', 'laplace_p90')[self.rows_stat_combo.currentIndex()]
+        self.items['rows_laplace'].setImage(np.log10(self.rows_result[key] + 1))
+        
+    def show_row(self, row):
+        # Recorrer filas solo lee de la pila: sin recalcular
+        if self.rows_result is None:
+            return
+        self.update_line_charts(row_slice(self.rows_result, row), self.result['metrics']['width'])
+        
+    def closeEvent(self, event):
+        self.rows_timer.stop()
+        self.rows_settle_timer.stop()
+        self.rows_generation += 1
+        self.rows_executor.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
+        
+    def render_charts(self, output_dir, prefix=''):
+        # Guarda cada gráfico como PNG; el tamaño es el que tiene en el dashboard
+        os.makedirs(output_dir, exist_ok=True)
+        QApplication.processEvents()
+        paths = []
+        for name, plot in self.charts.items():
+            path = os.path.join(output_dir, f"{prefix}{name}.png")
+            with span(f'png:{name}'):
+                saved = plot.grab().save(path)
+            if not saved:
+                raise OSError(f"no se pudo escribir {path}")
+            paths.append(path)
+        return paths
+        
+    def toggle_filter_panel(self):
+        visible = self.filter_toggle.toggle()
+        if self.filter_panel is None:
+            self.build_filter_panel()
+        self.filter_panel.setVisible(visible)
+        if visible and self.spectrum_filter is None:
+            self.reset_filter()
+        
+    def build_filter_panel(self):
+        controls = QWidget()
+        controls_layout = QVBoxLayout()
+        controls_layout.setSpacing(10)
+        controls_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.filter_kind_combo = QComboBox()
+        self.filter_kind_combo.addItems(["Paso bajo", "Paso alto", "Paso banda", "Notch en picos"])
+        self.filter_kind_combo.setStyleSheet(self.rows_mode_combo.styleSheet())
+        self.filter_kind_combo.currentIndexChanged.connect(self.change_filter_kind)
+        
+        # Cortes en % de Nyquist; el notch en % de Nyquist alrededor de cada pico
+        self.filter_low_slider = ModernSlider("Corte inferior (% Nyquist)", 0, 100, 10)
+        self.filter_high_slider = ModernSlider("Corte superior (% Nyquist)", 1, 100, 30)
+        self.filter_order_slider = ModernSlider("Orden Butterworth", 1, 8, 2)
+        self.filter_notch_slider = ModernSlider("Radio notch (% Nyquist)", 1, 20, 2)
+        self.filter_sliders = [self.filter_low_slider, self.filter_high_slider,
+                               self.filter_order_slider, self.filter_notch_slider]
+        # Mientras se arrastra se filtra a resolución reducida; al soltar, completa
+        for slider in self.filter_sliders:
+            slider.slider.valueChanged.connect(self.on_filter_slider)
+            slider.slider.sliderReleased.connect(self.apply_filter)
+        
+        self.peak_list = QListWidget()
+        self.peak_list.setFixedHeight(110)
+        self.peak_list.setStyleSheet("""
+            QListWidget {
+                background: #2A2A3E;
+                color: #E0E0E0;
+                border: 1px solid #3A3A5A;
+                border-radius: 8px;
+                font-size: 11px;
+                font-family: 'Consolas', monospace;
+            }
+        """)
+        self.peak_list.itemChanged.connect(lambda item: self.apply_filter())
+        
+        self.filter_status = QLabel("")
+        self.filter_status.setStyleSheet("""
+            QLabel {
+                color: #8090B0;
+                font-size: 11px;
+                font-family: 'Consolas', monospace;
+            }
+        """)
+        
+        controls_layout.addWidget(self.filter_kind_combo)
+        for slider in self.filter_sliders:
+            controls_layout.addWidget(slider)
+        controls_layout.addWidget(self.peak_list)
+        controls_layout.addWidget(self.filter_status)
+        controls.setLayout(controls_layout)
+        
+        self.filter_items = {}
+        mask_img = pg.ImageItem()
+        mask_img.setLookupTable(pg.colormap.get('inferno').getLookupTable())
+        self.filter_items['mask'] = mask_img
+        mask_plot = PlotWidget()
+        mask_plot.setBackground('#1A1A2A')
+        mask_plot.setFixedHeight(260)
+        mask_plot.addItem(mask_img)
+        mask_plot.setAspectLocked(True)
+        mask_plot.setLabel('left', 'fy')
+        mask_plot.setLabel('bottom', 'fx')
+        
+        filtered_img = pg.ImageItem()
+        self.filter_items['image'] = filtered_img
+        filtered_plot = PlotWidget()
+        filtered_plot.setBackground('#1A1A2A')
+        filtered_plot.setFixedHeight(260)
+        filtered_plot.addItem(filtered_img)
+        filtered_plot.setAspectLocked(True)
+        filtered_plot.setLabel('left', 'Y')
+        filtered_plot.setLabel('bottom', 'X')
+        
+        # Superficie 3D de la imagen filtrada, con una malla de ≤96×96 vértices
+        surface_view = gl.GLViewWidget()
+        surface_view.setFixedHeight(260)
+        surface_view.setCameraPosition(distance=110, elevation=35, azimuth=45)
+        surface = gl.GLSurfacePlotItem(computeNormals=False, smooth=False)
+        surface_view.addItem(surface)
+        self.filter_items['surface'] = surface
+        
+        filter_grid = QGridLayout()
+        filter_grid.setSpacing(10)
+        filter_grid.addWidget(self.create_chart_card("🎛 Parámetros del filtro", controls), 0, 0, 2, 1)
+        filter_grid.addWidget(self.create_chart_card("🎭 Máscara (centrada)", mask_plot), 0, 1)
+        filter_grid.addWidget(self.create_chart_card("🖼 Imagen filtrada (FFT inversa)", filtered_plot), 0, 2)
+        filter_grid.addWidget(self.create_chart_card("🏔 Superficie 3D filtrada", surface_view), 1, 1, 1, 2)
+        
+        self.filter_panel = QWidget()
+        self.filter_panel.setLayout(filter_grid)
+        self.main_layout.addWidget(self.filter_panel)
+        self.change_filter_kind(self.filter_kind_combo.currentIndex())
+        
+    def reset_filter(self):
+        # Espectro centrado y picos del resultado actual; la primera
+        # aplicación prepara la media matriz de cada resolución
+        result = self.result
+        with span('filtro_preparar'):
+            self.spectrum_filter = SpectrumFilter(shifted_spectrum(result))
+            self.filter_peaks = spectral_peaks(result['magnitude'])
+        h, w = result['magnitude'].shape
+        self.peak_list.blockSignals(True)
+        self.peak_list.clear()
+        for y, x, value in self.filter_peaks:
+            item = QListWidgetItem(f"pico ({x - w // 2:+d}, {y - h // 2:+d})  |F| {value:.2e}")
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.peak_list.addItem(item)
+        self.peak_list.blockSignals(False)
+        self.apply_filter()
+        
+    def change_filter_kind(self, index):
+        kind = FILTER_KINDS[index]
+        self.filter_low_slider.setEnabled(kind in ('highpass', 'bandpass'))
+        self.filter_high_slider.setEnabled(kind in ('lowpass', 'bandpass'))
+        self.filter_order_slider.setEnabled(kind != 'notch')
+        self.filter_notch_slider.setEnabled(kind == 'notch')
+        self.peak_list.setEnabled(kind == 'notch')
+        self.apply_filter()
+        
+    def filter_options(self):
+        # Solo los parámetros que usa cada tipo: así la caché de máscaras
+        # acierta aunque se muevan los deslizadores de otro tipo
+        kind = FILTER_KINDS[self.filter_kind_combo.currentIndex()]
+        low = self.filter_low_slider.slider.value() / 100
+        high = self.filter_high_slider.slider.value() / 100
+        order = self.filter_order_slider.slider.value()
+        if kind == 'lowpass':
+            return kind, {'high': high, 'order': order}
+        if kind == 'highpass':
+            return kind, {'low': low, 'order': order}
+        if kind == 'bandpass':
+            return kind, {'low': low, 'high': max(high, low + 0.01), 'order': order}
+        shape = self.result['magnitude'].shape
+        notches = tuple(peak_frequency(shape, y, x)
+                        for i, (y, x, _) in enumerate(self.filter_peaks)
+                        if self.peak_list.item(i).checkState() == Qt.CheckState.Checked)
+        return kind, {'notches': notches, 'notch_radius': self.filter_notch_slider.slider.value() / 100}
+        
+    def on_filter_slider(self):
+        self.apply_filter(preview=any(s.slider.isSliderDown() for s in self.filter_sliders))
+        
+    def apply_filter(self, preview=False):
+        if self.spectrum_filter is None:
+            return
+        kind, options = self.filter_options()
+        started = time.perf_counter()
+        with span('filtro'):
+            image = self.spectrum_filter.apply(kind, preview=preview, **options)
+            self.filter_items['image'].setImage(image)
+            self.filter_items['mask'].setImage(self.spectrum_filter.mask_preview(kind, **options), levels=(0, 1))
+            self.update_filter_surface(image)
+        h, w = image.shape
+        mode = "vista previa" if preview else "completa"
+        self.filter_status.setText(f"{mode} {w}×{h} · {(time.perf_counter() - started) * 1000:.1f} ms")
+        
+    def update_filter_surface(self, image, size=96):
+        step_y = max(1, -(-image.shape[0] // size))
+        step_x = max(1, -(-image.shape[1] // size))
+        z = image[::step_y, ::step_x]
+        z = (z - z.min()) / (np.ptp(z) + 1e-10)
+        ny, nx = z.shape
+        scale = 80 / max(nx, ny)
+        colors = pg.colormap.get('viridis').map(z.T.ravel(), mode='float')
+        self.filter_items['surface'].setData(
+            x=(np.arange(nx) - nx / 2) * scale,
+            y=(np.arange(ny) - ny / 2) * scale,
+            z=z.T * 15,
+            colors=colors.reshape(nx, ny, 4),
+        )
+
+def render_dashboard_charts(results, output_dir):
+    # Renderiza los gráficos del dashboard para una serie de (nombre, resultado)
+    # sin mostrar ventana. Se reutiliza una sola ResultsWindow: por imagen solo
+    # se actualizan los datos, no se reconstruyen los widgets
+    window = None
+    for name, result in results:
+        if window is None:
+            window = ResultsWindow(None, result=result)
+            window.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen)
+            window.show()
+        else:
+            window.show_result(result)
+        yield name, window.render_charts(output_dir, prefix=f"{name}_")
+    if window is not None:
+        window.close()
 
 class TooltipLabel(QLabel):
     def __init__(self, parent=None):
@@ -751,13 +1486,516 @@ class TooltipLabel(QLabel):
         self.setWindowFlags(Qt.WindowType.ToolTip | Qt.WindowType.FramelessWindowHint)
         self.hide()
 
+class FrameScheduler:
+    # Reloj de animación: avanza por tiempo real transcurrido en lugar de por ticks
+    def __init__(self, interval_ms=50, max_step=0.25):
+        self.interval = interval_ms / 1000.0
+        self.max_step = max_step
+        self.last_tick = None
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self.skipped_updates = 0
+        self.update_cost = 0.0
+        self.last_update = None
+        self.last_rates = None
+        
+    def reset(self):
+        # Al reanudar no se acumula el tiempo en pausa
+        self.last_tick = None
+        self.last_update = None
+        
+    def tick(self):
+        now = time.perf_counter()
+        if self.last_tick is None:
+            dt = self.interval
+        else:
+            dt = now - self.last_tick
+            missed = int(dt / self.interval + 0.5) - 1
+            if missed > 0:
+                self.dropped_frames += missed
+        self.last_tick = now
+        self.frame_count += 1
+        return min(dt, self.max_step)
+    
+    def should_update(self):
+        # Si la reconstrucción anterior excedió el presupuesto del frame, se
+        # agrupan los ticks siguientes hasta que haya pasado ese mismo tiempo
+        if self.last_update is None or self.update_cost <= self.interval:
+            return True
+        if time.perf_counter() - self.last_update >= self.update_cost:
+            return True
+        self.skipped_updates += 1
+        return False
+    
+    def record_update(self, start):
+        end = time.perf_counter()
+        self.update_cost = end - start
+        self.last_update = end
+        
+    def rates(self):
+        # Ticks, ticks perdidos y actualizaciones agrupadas por segundo desde
+        # la consulta anterior (la primera solo toma la referencia)
+        now = time.perf_counter()
+        counts = (self.frame_count, self.dropped_frames, self.skipped_updates)
+        previous, self.last_rates = self.last_rates, (now, counts)
+        if previous is None or now <= previous[0]:
+            return 0.0, 0.0, 0.0
+        elapsed = now - previous[0]
+        return tuple((count - last) / elapsed for count, last in zip(counts, previous[1]))
+
+class RenderStats:
+    # Estadísticas del HUD en búferes circulares: intervalo entre frames,
+    # tiempo de actualización de geometría y de dibujo, y bytes subidos a la
+    # GPU. Lo acumulado entre dos paintGL se atribuye al frame que lo dibuja
+    def __init__(self, frames=240):
+        self.enabled = False
+        self.frame_times = deque(maxlen=frames)
+        self.draw_times = deque(maxlen=frames)
+        self.update_times = deque(maxlen=frames)
+        self.upload_bytes = deque(maxlen=frames)
+        self.last_paint = None
+        self.pending_update = 0.0
+        self.pending_uploads = {}
+        self.update_depth = 0
+        self.update_start = 0.0
+        
+    def reset(self):
+        for buffer in (self.frame_times, self.draw_times, self.update_times, self.upload_bytes):
+            buffer.clear()
+        self.last_paint = None
+        self.pending_update = 0.0
+        self.pending_uploads.clear()
+        
+    @contextmanager
+    def updating(self):
+        # Las llamadas anidadas (update_visualization -> apply_grid) cuentan una vez
+        if self.update_depth == 0:
+            self.update_start = time.perf_counter()
+        self.update_depth += 1
+        try:
+            yield
+        finally:
+            self.update_depth -= 1
+            if self.update_depth == 0 and self.enabled:
+                self.pending_update += time.perf_counter() - self.update_start
+            
+    def queue_upload(self, item, attribute, array):
+        # Un atributo cambiado dos veces antes del siguiente dibujo se sube una
+        # sola vez (los items GL suben sus VBO al pintar si están sucios)
+        if self.enabled and isinstance(array, np.ndarray):
+            self.pending_uploads[(id(item), attribute)] = array.size * 4
+            
+    def record_paint(self, start, end):
+        if self.last_paint is not None:
+            self.frame_times.append(start - self.last_paint)
+        self.last_paint = start
+        self.draw_times.append(end - start)
+        self.update_times.append(self.pending_update)
+        self.upload_bytes.append(sum(self.pending_uploads.values()))
+        self.pending_update = 0.0
+        self.pending_uploads.clear()
+        
+    def fps(self, window=1.0):
+        elapsed = count = 0
+        for dt in reversed(self.frame_times):
+            if elapsed + dt > window and count:
+                break
+            elapsed += dt
+            count += 1
+        return count / elapsed if elapsed > 0 else 0.0
+    
+    def summary(self):
+        frame_ms = np.array(self.frame_times) * 1000
+        percentiles = np.percentile(frame_ms, [50, 95, 99]) if len(frame_ms) else (0.0, 0.0, 0.0)
+        return {
+            'fps': self.fps(),
+            'p50': percentiles[0],
+            'p95': percentiles[1],
+            'p99': percentiles[2],
+            'update_ms': 1000 * float(np.mean(self.update_times)) if self.update_times else 0.0,
+            'draw_ms': 1000 * float(np.mean(self.draw_times)) if self.draw_times else 0.0,
+            'upload_mb': float(np.mean(self.upload_bytes)) / 1e6 if self.upload_bytes else 0.0,
+            'upload_peak_mb': max(self.upload_bytes, default=0) / 1e6,
+        }
+
+class StatsGLViewWidget(gl.GLViewWidget):
+    # GLViewWidget que cronometra cada paintGL para el HUD. Es tiempo de CPU
+    # de emisión de comandos: la GPU termina el trabajo de forma asíncrona
+    def __init__(self, stats, parent=None):
+        super().__init__(parent)
+        self.render_stats = stats
+        
+    def paintGL(self):
+        if not self.render_stats.enabled:
+            super().paintGL()
+            return
+        start = time.perf_counter()
+        super().paintGL()
+        self.render_stats.record_paint(start, time.perf_counter())
+
+class GridBuildCancelled(Exception):
+    pass
+
+def open_preview(img, size=(400, 400)):
+    # Decodificación reducida para mostrar algo de inmediato: JPEG permite
+    # escalar en el propio decodificador (1/2, 1/4, 1/8) mediante draft()
+    if img.format != 'JPEG' or (img.size[0] <= size[0] * 2 and img.size[1] <= size[1] * 2):
+        return None
+    full_size = img.size
+    img.draft(img.mode if img.mode in ('L', 'RGB') else None, size)
+    if img.size == full_size:
+        return None
+    return native_image_array(img)
+
+def white_level(image_data):
+    # Valor que corresponde a blanco en la vista 3D: fondo de escala para
+    # 8 bits y el pico real para 16 bits / float (p.ej. 12 bits en uint16)
+    if image_data.dtype == np.uint8:
+        return 255.0
+    peak = float(np.max(np.abs(image_data))) if image_data.size else 0.0
+    return peak if peak > 0 else 1.0
+
+def build_mean_pyramid(image_data, min_size=10):
+    # Pirámide de promedios 2x2; el nivel 0 es la propia imagen (sin copia) y
+    # los demás se guardan en float32
+    levels = [image_data]
+    current = image_data
+    while min(current.shape[:2]) >= 2 * min_size:
+        h2 = current.shape[0] // 2
+        w2 = current.shape[1] // 2
+        blocks = current[:h2 * 2, :w2 * 2].reshape(h2, 2, w2, 2, *current.shape[2:])
+        current = blocks.mean(axis=(1, 3), dtype=np.float32)
+        levels.append(current)
+    return levels
+
+_pyramid_lock = threading.Lock()
+
+def complete_pyramid(levels, min_size=10):
+    # Las pirámides empiezan solo con el nivel 0 y los niveles reducidos se
+    # calculan fuera de la GUI cuando hace falta el muestreo por bloques: al
+    # preparar la imagen en ese modo o en el hilo de malla al cambiar a él.
+    # La lista se completa en el sitio porque la GUI la comparte
+    with _pyramid_lock:
+        if len(levels) == 1:
+            levels.extend(build_mean_pyramid(levels[0], min_size)[1:])
+    return levels
+
+def luminance_planes(image_data, pyramid, formula):
+    luminance = compute_luminance(image_data, formula)
+    # En imágenes de un canal la luminancia es la propia imagen
+    if luminance is image_data:
+        return luminance, pyramid
+    return luminance, [luminance]
+
+def prepare_image(image_data, formula='mean', block=False):
+    # Todo lo que depende solo de la imagen: se calcula fuera del hilo de la
+    # GUI. La pirámide de promedios solo se construye para el muestreo por
+    # bloques
+    pyramid = [image_data]
+    luminance, luminance_pyramid = luminance_planes(image_data, pyramid, formula)
+    if block:
+        complete_pyramid(pyramid)
+        complete_pyramid(luminance_pyramid)
+    return {
+        'image_data': image_data,
+        'pyramid': pyramid,
+        'white': white_level(image_data),
+        'luminance': luminance,
+        'luminance_pyramid': luminance_pyramid,
+        'luminance_formula': formula,
+    }
+
+def sample_image_grid(pyramid, luminance_pyramid, resolution, mode='point',
+                      is_cancelled=None, block_rows=32, white=255.0, scale=1.0):
+    # Muestreo de la imagen en la malla 3D; independiente de la amplitud para
+    # poder reescalar z sin volver a muestrear
+    image_data = pyramid[0]
+    luminance = luminance_pyramid[0]
+    h, w = image_data.shape[:2]
+    step_x = max(1, w // resolution)
+    step_y = max(1, h // resolution)
+    
+    x_coords = np.arange(0, w, step_x)
+    y_coords = np.arange(0, h, step_y)
+    
+    if mode == 'block':
+        # Con la pirámide incompleta block_mean promedia sobre el nivel 0
+        colors = block_mean(pyramid, x_coords, y_coords, step_x, step_y, is_cancelled) / white
+        brightness = block_mean(luminance_pyramid, x_coords, y_coords, step_x, step_y) / white
+    else:
+        colors = np.empty((len(y_coords), len(x_coords)) + image_data.shape[2:], dtype=np.float32)
+        for start in range(0, len(y_coords), block_rows):
+            if is_cancelled is not None and is_cancelled():
+                raise GridBuildCancelled()
+            rows = y_coords[start:start + block_rows]
+            colors[start:start + len(rows)] = image_data[rows[:, None], x_coords[None, :]] / white
+        brightness = luminance[y_coords[:, None], x_coords[None, :]] / white
+    
+    # Las imágenes de un canal se replican a gris solo en la malla muestreada
+    if colors.ndim == 2:
+        colors = np.repeat(colors[:, :, None], 3, axis=2)
+    colors = np.clip(colors, 0.0, 1.0, out=colors.astype(np.float32, copy=False))
+    brightness = brightness.astype(np.float32, copy=False)
+    
+    # Desfase de la onda según el orden de brillo (de mayor a menor)
+    order = np.argsort(-brightness.ravel(), kind='stable')
+    wave_phase = np.empty(order.size, dtype=np.float32)
+    wave_phase[order] = np.arange(order.size) * 0.1
+    
+    rgba = np.empty((colors.shape[0] * colors.shape[1], 4), dtype=np.float32)
+    rgba[:, :3] = colors.reshape(-1, 3)
+    rgba[:, 3] = 0.9
+    
+    # Una previsualización reducida se expresa en coordenadas de la imagen
+    # completa para que la geometría no cambie de tamaño al llegar esta
+    if scale != 1.0:
+        x_coords = (x_coords * scale).astype(np.int64)
+        y_coords = (y_coords * scale).astype(np.int64)
+        w, h = w * scale, h * scale
+    
+    # Posiciones listas para subir; z se rellena según la amplitud
+    pos = np.zeros(colors.shape, dtype=np.float32)
+    pos[:, :, 0] = ((x_coords - w/2) * 0.2)[None, :]
+    pos[:, :, 1] = ((y_coords - h/2) * 0.2)[:, None]
+    
+    return {
+        'x_coords': x_coords,
+        'y_coords': y_coords,
+        'pos': pos,
+        'colors': colors,
+        'rgba': rgba,
+        'brightness': brightness,
+        'wave_phase': wave_phase.reshape(brightness.shape),
+    }
+
+def block_mean(pyramid, x_coords, y_coords, step_x, step_y, is_cancelled=None):
+    # Promedio por bloques (filtro de caja): cada celda de la malla promedia el
+    # área [x_k, x_k+1) x [y_k, y_k+1). Se usa el nivel más grueso de la
+    # pirámide cuyo píxel divide ambos pasos, así los bordes de celda caen en
+    # bordes de píxel y el coste baja con el tamaño del bloque
+    level = 0
+    while (level + 1 < len(pyramid)
+           and step_x % 2 ** (level + 1) == 0
+           and step_y % 2 ** (level + 1) == 0):
+        level += 1
+    source = pyramid[level]
+    factor = 2 ** level
+    
+    # Las últimas celdas pueden caer en el borde recortado del nivel; repiten
+    # la última celda válida
+    ys = y_coords[y_coords // factor < source.shape[0]] // factor
+    xs = x_coords[x_coords // factor < source.shape[1]] // factor
+    
+    if is_cancelled is not None and is_cancelled():
+        raise GridBuildCancelled()
+    sums = np.add.reduceat(source, ys, axis=0, dtype=np.float32)
+    if is_cancelled is not None and is_cancelled():
+        raise GridBuildCancelled()
+    sums = np.add.reduceat(sums, xs, axis=1)
+    
+    count_y = np.diff(np.append(ys, source.shape[0]))
+    count_x = np.diff(np.append(xs, source.shape[1]))
+    counts = np.outer(count_y, count_x).reshape(sums.shape[:2] + (1,) * (sums.ndim - 2))
+    means = sums / counts
+    
+    pad_y = len(y_coords) - len(ys)
+    pad_x = len(x_coords) - len(xs)
+    if pad_y or pad_x:
+        padding = ((0, pad_y), (0, pad_x)) + ((0, 0),) * (means.ndim - 2)
+        means = np.pad(means, padding, mode='edge')
+    return means
+
+def normalized_log_magnitude(gray):
+    # |F| centrado en escala log y normalizado a [0, 1], para la vista FFT 3D
+    magnitude = np.abs(np.fft.fftshift(np.fft.fft2(gray)))
+    magnitude_log = np.log(magnitude + 1).astype(np.float32)
+    value_range = magnitude_log.max() - magnitude_log.min()
+    return (magnitude_log - magnitude_log.min()) / (value_range if value_range > 0 else 1)
+
+class GridCache:
+    # Caché LRU de mallas muestreadas, limitada por memoria
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        
+    @staticmethod
+    def grid_nbytes(grid):
+        return sum(v.nbytes for v in grid.values() if isinstance(v, np.ndarray))
+    
+    def get(self, key):
+        grid = self.entries.get(key)
+        if grid is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return grid
+    
+    def put(self, key, grid):
+        size = self.grid_nbytes(grid)
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.total_bytes -= self.grid_nbytes(self.entries.pop(key))
+        self.entries[key] = grid
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.total_bytes -= self.grid_nbytes(old)
+            
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+class LoadCancelled(Exception):
+    pass
+
+class SequencePlayer:
+    # Decodifica por adelantado en una cola acotada: como mucho `prefetch`
+    # frames preparados (pirámide, luminancia, espectro y malla) en memoria
+    # Con una fuente en vivo el búfer es de un solo frame y un frame nuevo
+    # reemplaza al anterior si la GUI aún no lo tomó
+    def __init__(self, sequence, settings, prefetch=4, loop=True):
+        self.sequence = sequence
+        self.settings = settings
+        self.live = getattr(sequence, 'live', False)
+        self.loop = loop and not self.live
+        self.analyze = False
+        self.dropped = 0
+        self.frames = queue.Queue(maxsize=1 if self.live else prefetch)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.frames_decoded = 0
+        self.underruns = 0
+        self.error = None
+        self.finished = False
+        self.shown_times = deque(maxlen=30)
+        
+    def start(self):
+        self.thread.start()
+        
+    def stop(self):
+        self.stop_event.set()
+        if hasattr(self.sequence, 'close'):
+            self.sequence.close()
+        while True:
+            try:
+                self.frames.get_nowait()
+            except queue.Empty:
+                break
+                
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                count = 0
+                for index, image_data, channels in self.sequence.frames():
+                    if self.stop_event.is_set():
+                        return
+                    self.put(self.prepare_frame(index, image_data, channels))
+                    count += 1
+                if not self.loop or count == 0:
+                    break
+        except Exception as e:
+            self.error = str(e)
+        self.finished = True
+        
+    def prepare_frame(self, index, image_data, channels):
+        # Los ajustes se leen por frame; si cambian, la GUI remuestrea la malla
+        resolution, mode, formula = self.settings
+        prepared = prepare_image(image_data, formula, block=mode == 'block')
+        grid = sample_image_grid(prepared['pyramid'], prepared['luminance_pyramid'],
+                                 resolution, mode, white=prepared['white'])
+        self.frames_decoded += 1
+        frame = {
+            'index': index,
+            'channels': channels,
+            'prepared': prepared,
+            'spectrum': normalized_log_magnitude(prepared['luminance']),
+            'grid': grid,
+            'settings': (resolution, mode, formula),
+        }
+        # Análisis completo solo mientras el dashboard está abierto
+        if self.analyze:
+            frame['analysis'] = analyze_spectrum(prepared['luminance'])
+        return frame
+        
+    def put(self, frame):
+        if self.live:
+            try:
+                self.frames.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            self.frames.put_nowait(frame)
+            return
+        while not self.stop_event.is_set():
+            try:
+                self.frames.put(frame, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+                
+    def next_frame(self):
+        try:
+            frame = self.frames.get_nowait()
+            if self.live:
+                self.shown_times.append(time.perf_counter())
+            return frame
+        except queue.Empty:
+            if not self.finished and not self.live:
+                self.underruns += 1
+            return None
+            
+    def fps(self):
+        # Frames mostrados por segundo sobre los últimos 30
+        times = self.shown_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
 class WaveVisualizer(QMainWindow):
+    grid_ready = pyqtSignal(int, object)
+    image_loaded = pyqtSignal(int, object)
+    load_progress = pyqtSignal(int, str)
+    load_failed = pyqtSignal(int, str)
+    
     def __init__(self):
         super().__init__()
         self.image_data = None
         self.wave_mesh = None
-        self.wave_lines = []
-        self.point_data = []
+        self.wave_lines = {}
+        self.point_data = None
+        self.grid = None
+        self.mesh_grid = None
+        self.image_id = 0
+        self.sampling_mode = 'point'
+        self.image_pyramid = None
+        self.luminance = None
+        self.luminance_pyramid = None
+        self.luminance_formula = 'mean'
+        self.white_level = 255.0
+        self.grid_cache = GridCache(max_bytes=64 * 1024 * 1024)
+        self.view_mode = 'image'
+        self.fft_mesh = None
+        self.fft_spectrum = None
+        self.fft_spectrum_id = None
+        self.build_generation = 0
+        self.build_executor = ThreadPoolExecutor(max_workers=1)
+        self.grid_ready.connect(self.on_grid_ready)
+        self.image_scale = 1.0
+        self.load_generation = 0
+        self.load_executor = ThreadPoolExecutor(max_workers=1)
+        self.image_ready = False
+        self.sequence_player = None
+        self.sequence_playing = False
+        self.sequence_clock = 0.0
+        self.grid_item_size = None
+        self.image_loaded.connect(self.on_image_loaded)
+        self.load_progress.connect(self.on_load_progress)
+        self.load_failed.connect(self.on_load_failed)
         self.rotation_angle = 0
         self.wave_offset = 0
         self.panel_visible = True
@@ -767,6 +2005,7 @@ class WaveVisualizer(QMainWindow):
         self.tooltip_enabled = False
         self.results_window = None
         self.tooltip = TooltipLabel()
+        self.render_stats = RenderStats()
         self.init_ui()
         
     def init_ui(self):
@@ -835,6 +2074,16 @@ class WaveVisualizer(QMainWindow):
         self.load_btn = AnimatedButton("📁 Cargar Imagen")
         self.load_btn.clicked.connect(self.load_image)
         
+        self.load_sequence_btn = AnimatedButton("🎞 Cargar Carpeta")
+        self.load_sequence_btn.clicked.connect(self.load_sequence_folder)
+        
+        self.live_source_combo = QComboBox()
+        self.live_source_combo.addItems(["📡 Sin fuente en vivo", "📡 Rejillas", "📡 Ruido", "📡 Manchas"])
+        
+        self.cancel_load_btn = ToggleButton("Cancelar carga", "Cancelar carga", "✖", "✖")
+        self.cancel_load_btn.clicked.connect(self.cancel_load)
+        self.cancel_load_btn.hide()
+        
         self.info_label = QLabel("No hay imagen cargada")
         self.info_label.setStyleSheet("""
             QLabel {
@@ -862,13 +2111,22 @@ class WaveVisualizer(QMainWindow):
         self.amplitude_slider = ModernSlider("Amplitud", 1, 100, 20)
         self.resolution_slider = ModernSlider("Resolución", 10, 200, 50)
         
-        self.amplitude_slider.slider.valueChanged.connect(self.update_visualization)
-        self.resolution_slider.slider.valueChanged.connect(self.update_visualization)
+        # Amplitud reescala z en sitio; la resolución se reconstruye con retardo
+        self.amplitude_slider.slider.valueChanged.connect(self.apply_grid)
+        self.resolution_slider.slider.valueChanged.connect(self.schedule_rebuild)
+        
+        self.rebuild_timer = QTimer()
+        self.rebuild_timer.setSingleShot(True)
+        self.rebuild_timer.setInterval(60)
+        self.rebuild_timer.timeout.connect(self.request_rebuild)
         
         # Toggle tooltip
         self.tooltip_toggle = ToggleButton("Activar Info", "Desactivar Info", "🔍", "🔍")
         self.tooltip_toggle.clicked.connect(self.toggle_tooltip)
         
+        self.hud_toggle = ToggleButton("Mostrar HUD", "Ocultar HUD", "📈", "📈")
+        self.hud_toggle.clicked.connect(self.toggle_hud)
+        
         lines_container = QWidget()
         lines_layout = QVBoxLayout()
         lines_layout.setSpacing(8)
@@ -903,8 +2161,31 @@ class WaveVisualizer(QMainWindow):
         """)
         self.line_mode_combo.currentIndexChanged.connect(self.change_line_mode)
         
+        sampling_title = QLabel("Muestreo")
+        sampling_title.setStyleSheet(lines_title.styleSheet())
+        
+        self.sampling_combo = QComboBox()
+        self.sampling_combo.addItems(["Puntual", "Promedio por bloques"])
+        self.sampling_combo.setStyleSheet(self.line_mode_combo.styleSheet())
+        self.sampling_combo.currentIndexChanged.connect(self.change_sampling_mode)
+        
         lines_layout.addWidget(lines_title)
         lines_layout.addWidget(self.line_mode_combo)
+        luminance_title = QLabel("Luminancia")
+        luminance_title.setStyleSheet(lines_title.styleSheet())
+        
+        self.luminance_combo = QComboBox()
+        self.luminance_combo.addItems(["Media RGB", "Rec.709"])
+        self.luminance_combo.setStyleSheet(self.line_mode_combo.styleSheet())
+        self.luminance_combo.currentIndexChanged.connect(self.change_luminance_formula)
+        
+        self.live_source_combo.setStyleSheet(self.line_mode_combo.styleSheet())
+        self.live_source_combo.currentIndexChanged.connect(self.change_live_source)
+        
+        lines_layout.addWidget(sampling_title)
+        lines_layout.addWidget(self.sampling_combo)
+        lines_layout.addWidget(luminance_title)
+        lines_layout.addWidget(self.luminance_combo)
         lines_container.setLayout(lines_layout)
         
         rot_label = QLabel("🔄 ROTACIÓN")
@@ -926,21 +2207,36 @@ class WaveVisualizer(QMainWindow):
         self.wave_speed_slider = ModernSlider("Velocidad", 1, 20, 5)
         self.wave_direction_slider = ModernSlider("Dirección", 0, 1, 0)
         
+        self.sequence_label = QLabel("🎞 SECUENCIA")
+        self.sequence_label.setStyleSheet(viz_label.styleSheet())
+        
+        self.sequence_toggle = ToggleButton("Reproducir", "Pausar", "▶", "⏸")
+        self.sequence_toggle.clicked.connect(self.toggle_sequence_playback)
+        self.sequence_label.hide()
+        self.sequence_toggle.hide()
+        
         self.results_btn = AnimatedButton("🧮 Dashboard")
         self.results_btn.clicked.connect(self.show_results_window)
         self.results_btn.setEnabled(False)
         
         self.fft_btn = AnimatedButton("⚡ FFT View")
-        self.fft_btn.clicked.connect(self.show_fft_analysis)
+        self.fft_btn.clicked.connect(self.toggle_fft_view)
         self.fft_btn.setEnabled(False)
         
+        self.import_btn = AnimatedButton("📥 Abrir Espectro")
+        self.import_btn.clicked.connect(self.open_exported_spectrum)
+        
         control_layout.addWidget(title)
         control_layout.addWidget(self.load_btn)
+        control_layout.addWidget(self.load_sequence_btn)
+        control_layout.addWidget(self.live_source_combo)
+        control_layout.addWidget(self.cancel_load_btn)
         control_layout.addWidget(self.info_label)
         control_layout.addWidget(viz_label)
         control_layout.addWidget(self.amplitude_slider)
         control_layout.addWidget(self.resolution_slider)
         control_layout.addWidget(self.tooltip_toggle)
+        control_layout.addWidget(self.hud_toggle)
         control_layout.addWidget(lines_container)
         control_layout.addWidget(rot_label)
         control_layout.addWidget(self.rotation_toggle)
@@ -949,8 +2245,11 @@ class WaveVisualizer(QMainWindow):
         control_layout.addWidget(self.wave_toggle)
         control_layout.addWidget(self.wave_speed_slider)
         control_layout.addWidget(self.wave_direction_slider)
+        control_layout.addWidget(self.sequence_label)
+        control_layout.addWidget(self.sequence_toggle)
         control_layout.addWidget(self.results_btn)
         control_layout.addWidget(self.fft_btn)
+        control_layout.addWidget(self.import_btn)
         control_layout.addStretch()
         
         scroll_content.setLayout(control_layout)
@@ -981,7 +2280,7 @@ class WaveVisualizer(QMainWindow):
         """)
         self.toggle_panel_btn.clicked.connect(self.toggle_panel)
         
-        self.gl_widget = gl.GLViewWidget()
+        self.gl_widget = StatsGLViewWidget(self.render_stats)
         self.gl_widget.setStyleSheet("""
             background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
                 stop:0 #0F0F1E, stop:1 #1A1A2E);
@@ -992,14 +2291,36 @@ class WaveVisualizer(QMainWindow):
         self.grid_item = gl.GLGridItem()
         self.gl_widget.addItem(self.grid_item)
         
+        # HUD de rendimiento sobre la vista 3D; se refresca 4 veces por segundo
+        self.hud_label = QLabel(self.gl_widget)
+        self.hud_label.setStyleSheet("""
+            QLabel {
+                background: rgba(15, 15, 30, 200);
+                color: #C8FFC8;
+                border: 1px solid #3A3A5A;
+                border-radius: 8px;
+                padding: 6px 10px;
+                font-size: 11px;
+                font-family: 'Consolas', monospace;
+            }
+        """)
+        self.hud_label.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.hud_label.move(10, 10)
+        self.hud_label.hide()
+        self.hud_timer = QTimer()
+        self.hud_timer.setInterval(250)
+        self.hud_timer.timeout.connect(self.update_hud)
+        
         self.main_layout.addWidget(self.control_panel)
         self.main_layout.addWidget(self.toggle_panel_btn, alignment=Qt.AlignmentFlag.AlignLeft)
         self.main_layout.addWidget(self.gl_widget, stretch=1)
         central_widget.setLayout(self.main_layout)
         
+        self.frame_scheduler = FrameScheduler(interval_ms=50)
         self.animation_timer = QTimer()
+        self.animation_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.animation_timer.setInterval(50)
         self.animation_timer.timeout.connect(self.animate)
-        self.animation_timer.start(50)
         
         self.tooltip_timer = QTimer()
         self.tooltip_timer.timeout.connect(self.check_hover)
@@ -1016,33 +2337,130 @@ class WaveVisualizer(QMainWindow):
             
     def toggle_rotation(self):
         self.rotation_active = self.rotation_toggle.toggle()
+        self.update_animation_state()
         
     def toggle_wave_animation(self):
         self.wave_animation_active = self.wave_toggle.toggle()
+        self.update_animation_state()
+        
+    def update_animation_state(self):
+        # El timer solo corre si hay algo que animar y la ventana es visible
+        # (una secuencia lo necesita también mientras llega su primer frame)
+        animating = self.image_data is not None and (self.rotation_active or self.wave_animation_active)
+        running = ((animating or self.sequence_playing)
+                   and self.isVisible()
+                   and not self.isMinimized())
+        if running and not self.animation_timer.isActive():
+            self.frame_scheduler.reset()
+            self.animation_timer.start()
+        elif not running and self.animation_timer.isActive():
+            self.animation_timer.stop()
+            
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_animation_state()
+        
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_animation_state()
+        
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_animation_state()
+            
+    def closeEvent(self, event):
+        self.build_generation += 1
+        self.load_generation += 1
+        self.stop_sequence()
+        self.build_executor.shutdown(wait=False, cancel_futures=True)
+        self.load_executor.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
         
     def toggle_tooltip(self):
         self.tooltip_enabled = self.tooltip_toggle.toggle()
         if not self.tooltip_enabled:
             self.tooltip.hide()
         
+    def toggle_hud(self):
+        # Sin HUD no se registra nada: paintGL solo comprueba un booleano
+        visible = self.hud_toggle.toggle()
+        self.render_stats.reset()
+        self.render_stats.enabled = visible
+        self.frame_scheduler.last_rates = None
+        self.hud_label.setVisible(visible)
+        if visible:
+            self.update_hud()
+            self.hud_timer.start()
+        else:
+            self.hud_timer.stop()
+            
+    def update_hud(self):
+        stats = self.render_stats.summary()
+        ticks, dropped, skipped = self.frame_scheduler.rates()
+        if self.view_mode == 'fft':
+            meshes, lines = [self.fft_mesh], []
+        else:
+            meshes, lines = [self.wave_mesh], list(self.wave_lines.values())
+        points = sum(len(m.pos) for m in meshes if m is not None and m.pos is not None)
+        vertices = sum(len(line.pos) for line in lines if line.pos is not None)
+        self.hud_label.setText(
+            f"FPS {stats['fps']:5.1f}   frame p50 {stats['p50']:.1f} · p95 {stats['p95']:.1f} · "
+            f"p99 {stats['p99']:.1f} ms\n"
+            f"actualización {stats['update_ms']:.2f} ms · dibujo {stats['draw_ms']:.2f} ms por frame\n"
+            f"animación {ticks:.1f} ticks/s · perdidos {dropped:.1f}/s · agrupados {skipped:.1f}/s\n"
+            f"puntos {points:,} · líneas {len(lines)} items ({vertices:,} vértices)\n"
+            f"subida {stats['upload_mb']:.2f} MB/frame (máx. {stats['upload_peak_mb']:.2f} MB)"
+        )
+        self.hud_label.adjustSize()
+        
     def change_line_mode(self, index):
         self.line_mode = index
-        self.update_visualization()
+        self.apply_grid()
+        
+    def change_sampling_mode(self, index):
+        self.sampling_mode = 'block' if index == 1 else 'point'
+        self.request_rebuild()
+        
+    def change_luminance_formula(self, index):
+        self.luminance_formula = 'rec709' if index == 1 else 'mean'
+        if self.image_data is None:
+            return
+        self.update_luminance()
+        if self.view_mode == 'fft':
+            self.show_fft_analysis()
+        self.request_rebuild()
         
     def show_results_window(self):
         if self.image_data is None:
             return
         if self.results_window is None or not self.results_window.isVisible():
-            self.results_window = ResultsWindow(self.image_data, self)
+            self.results_window = ResultsWindow(self.image_data, self, luminance=self.luminance)
             self.results_window.show()
         else:
             self.results_window.activateWindow()
             self.results_window.raise_()
         
+    def open_exported_spectrum(self):
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "Abrir Espectro Exportado", "", "Espectro comprimido (*.npz)"
+        )
+        if not file_name:
+            return
+        try:
+            result = load_spectrum(file_name)
+        except (OSError, ValueError, KeyError) as e:
+            self.info_label.setText(f"✗ Error al abrir el espectro\n{e}")
+            return
+        # Dashboard independiente de la imagen cargada (si la hay)
+        self.results_window = ResultsWindow(None, self, result=result)
+        self.results_window.setWindowTitle(f"📊 Dashboard de Análisis — {os.path.basename(file_name)}")
+        self.results_window.show()
+        
     def load_image(self):
         file_name, _ = QFileDialog.getOpenFileName(
             self, "Seleccionar Imagen", "", 
-            "Imágenes (*.png *.jpg *.jpeg *.bmp *.gif)"
+            "Imágenes (*.png *.jpg *.jpeg *.bmp *.gif *.tif *.tiff)"
         )
         
         if file_name:
@@ -1053,157 +2471,470 @@ class WaveVisualizer(QMainWindow):
             anim.setEasingCurve(QEasingCurve.Type.OutCubic)
             anim.start()
             
-            img = Image.open(file_name)
-            self.image_data = np.array(img.convert('RGB'))
+            self.open_image_file(file_name)
+            
+    def open_image_file(self, file_name):
+        # Apertura, decodificación y preparación corren en un hilo aparte; una
+        # carga nueva invalida la anterior mediante el contador de generación
+        self.stop_sequence()
+        self.load_generation += 1
+        generation = self.load_generation
+        formula = self.luminance_formula
+        block = self.sampling_mode == 'block'
+        self.set_loading(True)
+        self.info_label.setText("⏳ Abriendo imagen...")
+        
+        def check():
+            if generation != self.load_generation:
+                raise LoadCancelled()
+        
+        def load():
+            img = None
+            try:
+                from PIL import Image
+                img = Image.open(file_name)
+                full_size = img.size
+                if getattr(img, 'is_animated', False):
+                    # GIF animado / TIFF multipágina: se reproduce como secuencia
+                    self.image_loaded.emit(generation, {'sequence': file_name})
+                    return
+                preview = open_preview(img)
+                check()
+                if preview is not None:
+                    # Fase 1: previsualización reducida para la vista 3D
+                    image_data, channels = preview
+                    prepared = prepare_image(image_data, formula, block)
+                    check()
+                    self.image_loaded.emit(generation, {
+                        'prepared': prepared,
+                        'channels': channels,
+                        'full_size': full_size,
+                        'preview': True,
+                    })
+                    # draft() deja el decodificador en la escala reducida
+                    img.close()
+                    img = Image.open(file_name)
+                
+                # Fase 2: decodificación completa (FFT/Dashboard)
+                self.load_progress.emit(generation, 
+                    f"⏳ Decodificando {full_size[0]}x{full_size[1]}px...")
+                image_data, channels = native_image_array(img)
+                img.close()
+                check()
+                self.load_progress.emit(generation, "⏳ Preparando datos...")
+                prepared = prepare_image(image_data, formula, block)
+                check()
+                self.image_loaded.emit(generation, {
+                    'prepared': prepared,
+                    'channels': channels,
+                    'full_size': full_size,
+                    'preview': False,
+                })
+            except LoadCancelled:
+                pass
+            except Exception as e:
+                self.load_failed.emit(generation, str(e))
+            finally:
+                # También al cancelar o fallar: el archivo no queda abierto
+                if img is not None:
+                    img.close()
+        
+        self.load_executor.submit(load)
+        
+    def cancel_load(self):
+        self.load_generation += 1
+        self.info_label.setText("✗ Carga cancelada" + self.keep_preview())
+        self.set_loading(False)
+        
+    def keep_preview(self):
+        # Carga interrumpida tras la previsualización: la imagen anterior ya
+        # no está, así que la vista previa pasa a ser la imagen cargada
+        if self.image_data is None or self.image_ready:
+            return ""
+        self.image_ready = True
+        h, w = self.image_data.shape[:2]
+        return f"\nSe conserva la vista previa ({w}x{h}px)"
+        
+    def set_loading(self, loading):
+        # FFT y Dashboard solo con datos listos: completos, o la vista previa
+        # que queda tras cancelar o fallar la carga completa
+        self.cancel_load_btn.setVisible(loading)
+        ready = self.image_ready and not loading
+        self.fft_btn.setEnabled(ready)
+        self.results_btn.setEnabled(ready)
+        
+    def on_load_progress(self, generation, message):
+        if generation == self.load_generation:
+            self.info_label.setText(message)
             
-            h, w = self.image_data.shape[:2]
+    def on_load_failed(self, generation, message):
+        if generation != self.load_generation:
+            return
+        self.info_label.setText(f"✗ Error al cargar la imagen\n{message}" + self.keep_preview())
+        self.set_loading(False)
+        
+    def on_image_loaded(self, generation, result):
+        if generation != self.load_generation:
+            return
+        if 'sequence' in result:
+            self.set_loading(False)
+            self.start_sequence(FileFrameSequence(result['sequence']))
+            return
+        prepared = result['prepared']
+        image_data = prepared['image_data']
+        full_w, full_h = result['full_size']
+        
+        if result['preview']:
+            self.image_ready = False
+            self.set_image_data(image_data, scale=full_w / image_data.shape[1], prepared=prepared)
+            self.reset_grid_item(full_w, full_h)
             self.info_label.setText(
-                f"✓ Imagen cargada\n"
-                f"Dimensiones: {w}x{h}px\n"
-                f"Canales: RGB\n"
-                f"Tamaño: {self.image_data.nbytes / 1024:.1f} KB"
+                f"⏳ Cargando resolución completa...\n"
+                f"Dimensiones: {full_w}x{full_h}px\n"
+                f"Vista previa: {image_data.shape[1]}x{image_data.shape[0]}px"
             )
-            
-            # Ajustar grid al tamaño de la imagen
-            self.gl_widget.removeItem(self.grid_item)
-            grid_size_x = max(50, w * 0.02)
-            grid_size_y = max(50, h * 0.02)
-            self.grid_item = gl.GLGridItem()
-            self.grid_item.setSize(x=grid_size_x, y=grid_size_y, z=50)
-            self.grid_item.setSpacing(x=grid_size_x/20, y=grid_size_y/20, z=5)
-            self.grid_item.setColor((100, 120, 255, 100))
-            self.gl_widget.addItem(self.grid_item)
-            
-            self.fft_btn.setEnabled(True)
-            self.results_btn.setEnabled(True)
             self.update_visualization()
-            
-    def update_visualization(self):
-        if self.image_data is None:
+            self.update_animation_state()
             return
         
-        if self.wave_mesh:
-            self.gl_widget.removeItem(self.wave_mesh)
-        for line in self.wave_lines:
-            self.gl_widget.removeItem(line)
-        self.wave_lines.clear()
-        self.point_data.clear()
-        
-        amplitude = self.amplitude_slider.slider.value()
-        resolution = self.resolution_slider.slider.value()
+        preview_shown = self.image_scale != 1.0 and not self.image_ready
+        self.set_image_data(image_data, prepared=prepared)
+        self.image_ready = True
+        self.set_loading(False)
         
         h, w = self.image_data.shape[:2]
-        step_x = max(1, w // resolution)
-        step_y = max(1, h // resolution)
-        
-        x_coords = np.arange(0, w, step_x)
-        y_coords = np.arange(0, h, step_y)
-        
-        points = []
-        colors = []
-        point_grid = {}
-        brightness_grid = {}
-        
-        for i, yi in enumerate(y_coords):
-            for j, xi in enumerate(x_coords):
-                if yi < h and xi < w:
-                    color = self.image_data[int(yi), int(xi)] / 255.0
-                    brightness = np.mean(color)
-                    brightness_grid[(i, j)] = brightness
-                    
-                    px = (xi - w/2) * 0.2
-                    py = (yi - h/2) * 0.2
-                    point_grid[(i, j)] = (px, py, brightness, color, int(xi), int(yi))
-        
-        if self.wave_animation_active:
-            direction = self.wave_direction_slider.slider.value()
-            sorted_points = sorted(brightness_grid.items(), key=lambda x: x[1], reverse=True)
+        self.info_label.setText(
+            f"✓ Imagen cargada\n"
+            f"Dimensiones: {w}x{h}px\n"
+            f"Canales: {result['channels']} ({self.image_data.dtype})\n"
+            f"Tamaño: {self.image_data.nbytes / 1024:.1f} KB"
+        )
+        
+        if preview_shown:
+            # La previsualización sigue en pantalla hasta tener la malla completa
+            self.request_rebuild()
+        else:
+            self.reset_grid_item(w, h)
+            self.update_visualization()
+        self.update_animation_state()
+        
+    def load_sequence_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar Carpeta de Imágenes")
+        if folder:
+            sequence = FolderFrameSequence(folder)
+            if not sequence.files:
+                self.info_label.setText("✗ La carpeta no contiene imágenes")
+                return
+            self.load_generation += 1
+            self.set_loading(False)
+            self.start_sequence(sequence)
             
-            for idx, ((i, j), brightness) in enumerate(sorted_points):
-                px, py, _, color, xi, yi = point_grid[(i, j)]
-                phase_offset = idx * 0.1
-                
-                if direction == 0:
-                    wave_effect = np.sin(self.wave_offset + phase_offset) * brightness * amplitude * 0.5
-                else:
-                    wave_effect = np.sin(self.wave_offset + phase_offset) * brightness * amplitude * 0.5
-                
-                z = brightness * amplitude + wave_effect
-                points.append([px, py, z])
-                colors.append((*color, 0.9))
-                point_grid[(i, j)] = (px, py, z, color, xi, yi)
-                self.point_data.append({
-                    'pos': [px, py, z],
-                    'color': color,
-                    'brightness': brightness,
-                    'coords': (xi, yi),
-                    'amplitude': z
-                })
+    def change_live_source(self, index):
+        patterns = [None, 'gratings', 'noise', 'blobs']
+        if patterns[index] is None:
+            if self.sequence_player is not None and self.sequence_player.live:
+                self.stop_sequence()
+            return
+        self.load_generation += 1
+        self.set_loading(False)
+        self.start_sequence(LiveFeed(SyntheticSource(patterns[index], 512, 512, fps=30)))
+        
+    def start_sequence(self, sequence):
+        self.stop_sequence()
+        self.sequence_player = SequencePlayer(sequence, self.sequence_settings())
+        self.sequence_player.start()
+        self.sequence_clock = 0.0
+        self.sequence_label.show()
+        self.sequence_toggle.show()
+        if not self.sequence_playing:
+            self.toggle_sequence_playback()
+        if not self.sequence_player.live and self.live_source_combo.currentIndex() != 0:
+            self.live_source_combo.blockSignals(True)
+            self.live_source_combo.setCurrentIndex(0)
+            self.live_source_combo.blockSignals(False)
+        self.info_label.setText(f"🎞 Secuencia: {sequence.name}\n⏳ Decodificando frames...")
+        
+    def stop_sequence(self):
+        if self.sequence_player is not None:
+            self.sequence_player.stop()
+            self.sequence_player = None
+        if self.sequence_playing:
+            self.sequence_playing = self.sequence_toggle.toggle()
+            self.update_animation_state()
+        self.sequence_label.hide()
+        self.sequence_toggle.hide()
+        
+    def toggle_sequence_playback(self):
+        self.sequence_playing = self.sequence_toggle.toggle()
+        self.update_animation_state()
+        
+    def sequence_settings(self):
+        return (self.resolution_slider.slider.value(), self.sampling_mode, self.luminance_formula)
+        
+    def advance_sequence(self, steps):
+        # Un frame por tick del timer; si el tick llega tarde se descartan los
+        # frames intermedios y se muestra solo el más reciente
+        player = self.sequence_player
+        player.settings = self.sequence_settings()
+        player.analyze = self.results_window is not None and self.results_window.isVisible()
+        if player.live:
+            # En vivo no hay reloj de secuencia: se muestra el último frame listo
+            frame = player.next_frame()
+            if frame is not None:
+                self.show_sequence_frame(frame)
+            elif player.error is not None:
+                self.info_label.setText(f"✗ Error en la fuente\n{player.error}")
+                self.stop_sequence()
+            return
+        self.sequence_clock += steps
+        frame = None
+        while self.sequence_clock >= 1.0:
+            self.sequence_clock -= 1.0
+            next_frame = player.next_frame()
+            if next_frame is None:
+                self.sequence_clock = 0.0
+                break
+            frame = next_frame
+        if frame is not None:
+            self.show_sequence_frame(frame)
+        elif player.error is not None:
+            self.info_label.setText(f"✗ Error en la secuencia\n{player.error}")
+            self.stop_sequence()
+            
+    def show_sequence_frame(self, frame):
+        prepared = frame['prepared']
+        self.set_image_data(prepared['image_data'], prepared=prepared)
+        self.image_ready = True
+        self.set_loading(False)
+        
+        resolution, mode, formula = frame['settings']
+        if formula == self.luminance_formula:
+            self.fft_spectrum = frame['spectrum']
+            self.fft_spectrum_id = (self.image_id, formula)
+        
+        # Las mallas de la secuencia no pasan por la caché LRU
+        self.build_generation += 1
+        if frame['settings'] == self.sequence_settings():
+            self.grid = frame['grid']
         else:
-            for (i, j), (px, py, brightness, color, xi, yi) in point_grid.items():
-                z = brightness * amplitude
-                points.append([px, py, z])
-                colors.append((*color, 0.9))
-                point_grid[(i, j)] = (px, py, z, color, xi, yi)
-                self.point_data.append({
-                    'pos': [px, py, z],
-                    'color': color,
-                    'brightness': brightness,
-                    'coords': (xi, yi),
-                    'amplitude': z
-                })
+            self.grid = sample_image_grid(self.image_pyramid, self.luminance_pyramid,
+                                          *self.grid_key()[1:3], white=self.white_level)
         
-        points = np.array(points)
-        colors = np.array(colors)
+        h, w = self.image_data.shape[:2]
+        if self.grid_item_size != (w, h):
+            self.reset_grid_item(w, h)
+        if self.view_mode == 'fft':
+            self.show_fft_analysis()
+        else:
+            self.apply_grid()
         
-        self.wave_mesh = gl.GLScatterPlotItem(
-            pos=points,
-            color=colors,
-            size=4,
-            pxMode=True
+        if 'analysis' in frame and self.results_window is not None and self.results_window.isVisible():
+            self.results_window.show_result(frame['analysis'], prepared['luminance'])
+        
+        player = self.sequence_player
+        if player.live:
+            dropped = player.dropped + getattr(player.sequence, 'dropped', 0)
+            self.info_label.setText(
+                f"📡 En vivo: {player.sequence.name}\n"
+                f"Frame: {frame['index'] + 1}\n"
+                f"Dimensiones: {w}x{h}px · {frame['channels']}\n"
+                f"FPS: {player.fps():.1f} · Descartados: {dropped}"
+            )
+            return
+        self.info_label.setText(
+            f"🎞 Secuencia: {player.sequence.name}\n"
+            f"Frame: {frame['index'] + 1}\n"
+            f"Dimensiones: {w}x{h}px · {frame['channels']}\n"
+            f"Búfer: {player.frames.qsize()} · Sin frame: {player.underruns}"
         )
-        self.gl_widget.addItem(self.wave_mesh)
-        
-        if self.line_mode == 1 or self.line_mode == 3:
-            for i in range(len(y_coords)):
-                line_points = []
-                for j in range(len(x_coords)):
-                    if (i, j) in point_grid:
-                        px, py, z, _, _, _ = point_grid[(i, j)]
-                        line_points.append([px, py, z])
-                
-                if len(line_points) > 1:
-                    line_points = np.array(line_points)
-                    line = gl.GLLinePlotItem(
-                        pos=line_points,
-                        color=(0.4, 0.6, 1.0, 0.7),
-                        width=2,
-                        antialias=True
-                    )
-                    self.gl_widget.addItem(line)
-                    self.wave_lines.append(line)
-        
-        if self.line_mode == 2 or self.line_mode == 3:
-            for j in range(len(x_coords)):
-                line_points = []
-                for i in range(len(y_coords)):
-                    if (i, j) in point_grid:
-                        px, py, z, _, _, _ = point_grid[(i, j)]
-                        line_points.append([px, py, z])
-                
-                if len(line_points) > 1:
-                    line_points = np.array(line_points)
-                    line = gl.GLLinePlotItem(
-                        pos=line_points,
-                        color=(1.0, 0.5, 0.3, 0.7),
-                        width=2,
-                        antialias=True
-                    )
-                    self.gl_widget.addItem(line)
-                    self.wave_lines.append(line)
+        
+    def reset_grid_item(self, w, h):
+        # Ajustar grid al tamaño de la imagen
+        self.grid_item_size = (w, h)
+        self.gl_widget.removeItem(self.grid_item)
+        grid_size_x = max(50, w * 0.02)
+        grid_size_y = max(50, h * 0.02)
+        self.grid_item = gl.GLGridItem()
+        self.grid_item.setSize(x=grid_size_x, y=grid_size_y, z=50)
+        self.grid_item.setSpacing(x=grid_size_x/20, y=grid_size_y/20, z=5)
+        self.grid_item.setColor((100, 120, 255, 100))
+        self.gl_widget.addItem(self.grid_item)
+            
+    def set_image_data(self, image_data, scale=1.0, prepared=None):
+        if prepared is None:
+            prepared = prepare_image(image_data, self.luminance_formula, self.sampling_mode == 'block')
+        self.image_data = image_data
+        self.image_scale = scale
+        self.image_id += 1
+        self.image_pyramid = prepared['pyramid']
+        self.white_level = prepared['white']
+        if prepared['luminance_formula'] == self.luminance_formula:
+            self.luminance = prepared['luminance']
+            self.luminance_pyramid = prepared['luminance_pyramid']
+        else:
+            self.update_luminance()
+        
+    def update_luminance(self):
+        # Único plano de gris para la malla 3D, la vista FFT y el dashboard
+        self.luminance, self.luminance_pyramid = luminance_planes(
+            self.image_data, self.image_pyramid, self.luminance_formula)
+        
+    def update_visualization(self):
+        if self.image_data is None:
+            return
+        
+        with self.render_stats.updating():
+            # Reconstrucción síncrona: invalida cualquier construcción pendiente
+            self.rebuild_timer.stop()
+            self.build_generation += 1
+            key = self.grid_key()
+            grid = self.grid_cache.get(key)
+            if grid is None:
+                grid = sample_image_grid(self.image_pyramid, self.luminance_pyramid, key[1], key[2],
+                                         white=self.white_level, scale=self.image_scale)
+                self.grid_cache.put(key, grid)
+            self.grid = grid
+            self.set_view_mode('image')
+            self.apply_grid()
+            
+    def grid_key(self):
+        return (self.image_id, self.resolution_slider.slider.value(), self.sampling_mode,
+                self.luminance_formula)
+        
+    def schedule_rebuild(self):
+        # Durante el arrastre del slider solo se construye el último valor
+        if self.image_data is not None:
+            if self.view_mode == 'fft':
+                self.show_fft_analysis()
+            self.rebuild_timer.start()
+            
+    def request_rebuild(self):
+        if self.image_data is None:
+            return
+        self.build_generation += 1
+        generation = self.build_generation
+        key = self.grid_key()
+        
+        # Resoluciones usadas recientemente se muestran sin reconstruir
+        cached = self.grid_cache.get(key)
+        if cached is not None:
+            self.grid = cached
+            self.apply_grid()
+            return
+        
+        pyramid = self.image_pyramid
+        luminance_pyramid = self.luminance_pyramid
+        white = self.white_level
+        scale = self.image_scale
+        resolution = key[1]
+        mode = key[2]
+        
+        def is_cancelled():
+            return generation != self.build_generation
+        
+        def build():
+            try:
+                if mode == 'block':
+                    # Primer uso del modo por bloques: la pirámide se completa aquí
+                    complete_pyramid(pyramid)
+                    complete_pyramid(luminance_pyramid)
+                grid = sample_image_grid(pyramid, luminance_pyramid, resolution, mode,
+                                         is_cancelled, white=white, scale=scale)
+            except GridBuildCancelled:
+                return
+            self.grid_ready.emit(generation, (key, grid))
+        
+        self.build_executor.submit(build)
+        
+    def on_grid_ready(self, generation, result):
+        key, grid = result
+        self.grid_cache.put(key, grid)
+        # Resultados obsoletos se descartan; la geometría anterior sigue en pantalla
+        if generation != self.build_generation:
+            return
+        self.grid = grid
+        self.apply_grid()
+        
+    def apply_grid(self):
+        # En la vista FFT la malla se actualiza al volver a la vista de imagen
+        if self.grid is None or self.view_mode != 'image':
+            return
+        with self.render_stats.updating():
+            grid = self.grid
+            
+            amplitude = self.amplitude_slider.slider.value()
+            brightness = grid['brightness']
+            z = brightness * amplitude
+            if self.wave_animation_active:
+                wave_effect = np.sin(self.wave_offset + grid['wave_phase']) * brightness * amplitude * 0.5
+                z = z + wave_effect
+            
+            pos = grid['pos'].copy()
+            pos[:, :, 2] = z
+            points = pos.reshape(-1, 3)
+            
+            if self.wave_mesh is None:
+                self.wave_mesh = gl.GLScatterPlotItem(
+                    pos=points,
+                    color=grid['rgba'],
+                    size=4,
+                    pxMode=True
+                )
+                self.gl_widget.addItem(self.wave_mesh)
+            elif self.mesh_grid is grid:
+                self.wave_mesh.setData(pos=points)
+            else:
+                self.wave_mesh.setData(pos=points, color=grid['rgba'])
+            self.render_stats.queue_upload(self.wave_mesh, 'pos', points)
+            if self.mesh_grid is not grid:
+                self.render_stats.queue_upload(self.wave_mesh, 'color', grid['rgba'])
+            self.mesh_grid = grid
+            
+            self.update_lines(pos)
+            
+            self.point_data = {
+                'pos': points,
+                'colors': grid['colors'],
+                'brightness': brightness,
+                'amplitude': z,
+                'x_coords': grid['x_coords'],
+                'y_coords': grid['y_coords'],
+            }
+            
+    def update_lines(self, pos):
+        # Un único GLLinePlotItem por dirección, con segmentos entre vecinos
+        wanted = {}
+        if self.line_mode in (1, 3) and pos.shape[1] > 1:
+            segments = np.stack([pos[:, :-1], pos[:, 1:]], axis=2).reshape(-1, 3)
+            wanted['x'] = (segments, (0.4, 0.6, 1.0, 0.7))
+        if self.line_mode in (2, 3) and pos.shape[0] > 1:
+            segments = np.stack([pos[:-1, :], pos[1:, :]], axis=2).reshape(-1, 3)
+            wanted['y'] = (segments, (1.0, 0.5, 0.3, 0.7))
+        
+        for key in list(self.wave_lines):
+            if key not in wanted:
+                self.gl_widget.removeItem(self.wave_lines.pop(key))
+        
+        for key, (segments, color) in wanted.items():
+            if key in self.wave_lines:
+                self.wave_lines[key].setData(pos=segments)
+            else:
+                line = gl.GLLinePlotItem(
+                    pos=segments,
+                    color=color,
+                    width=2,
+                    antialias=True,
+                    mode='lines'
+                )
+                self.gl_widget.addItem(line)
+                self.wave_lines[key] = line
+            self.render_stats.queue_upload(self.wave_lines[key], 'pos', segments)
     
     def check_hover(self):
-        if not self.tooltip_enabled or not self.point_data:
+        if not self.tooltip_enabled or self.point_data is None:
+            return
+        if self.view_mode != 'image':
+            self.tooltip.hide()
             return
         
         cursor_pos = self.gl_widget.mapFromGlobal(QCursor.pos())
@@ -1212,25 +2943,17 @@ class WaveVisualizer(QMainWindow):
             return
         
         # Buscar punto más cercano al cursor (simplificado)
-        closest_point = None
-        min_dist = float('inf')
-        
-        for point in self.point_data:
-            px, py, pz = point['pos']
-            # Proyección simple 2D
-            screen_dist = ((cursor_pos.x() - self.gl_widget.width()/2) ** 2 + 
-                          (cursor_pos.y() - self.gl_widget.height()/2) ** 2) ** 0.5
-            
-            if screen_dist < min_dist and screen_dist < 100:
-                min_dist = screen_dist
-                closest_point = point
-        
-        if closest_point:
-            r, g, b = closest_point['color']
-            text = (f"📍 Pos: ({closest_point['coords'][0]}, {closest_point['coords'][1]})\n"
+        # Proyección simple 2D
+        screen_dist = ((cursor_pos.x() - self.gl_widget.width()/2) ** 2 + 
+                      (cursor_pos.y() - self.gl_widget.height()/2) ** 2) ** 0.5
+        
+        if screen_dist < 100:
+            data = self.point_data
+            r, g, b = data['colors'][0, 0]
+            text = (f"📍 Pos: ({data['x_coords'][0]}, {data['y_coords'][0]})\n"
                    f"🎨 RGB: ({int(r*255)}, {int(g*255)}, {int(b*255)})\n"
-                   f"📊 Brillo: {closest_point['brightness']:.3f}\n"
-                   f"⚡ Amplitud: {closest_point['amplitude']:.2f}")
+                   f"📊 Brillo: {data['brightness'][0, 0]:.3f}\n"
+                   f"⚡ Amplitud: {data['amplitude'][0, 0]:.2f}")
             
             self.tooltip.setText(text)
             self.tooltip.adjustSize()
@@ -1241,80 +2964,148 @@ class WaveVisualizer(QMainWindow):
         else:
             self.tooltip.hide()
         
+    def set_view_mode(self, mode):
+        # Ambas vistas conservan sus items GL; alternar solo cambia visibilidad
+        self.view_mode = mode
+        if self.wave_mesh is not None:
+            self.wave_mesh.setVisible(mode == 'image')
+        for line in self.wave_lines.values():
+            line.setVisible(mode == 'image')
+        if self.fft_mesh is not None:
+            self.fft_mesh.setVisible(mode == 'fft')
+        self.fft_btn.setText("🖼 Vista Imagen" if mode == 'fft' else "⚡ FFT View")
+        
+    def toggle_fft_view(self):
+        if self.view_mode == 'fft':
+            self.set_view_mode('image')
+            self.apply_grid()
+        else:
+            self.show_fft_analysis()
+        
     def show_fft_analysis(self):
         if self.image_data is None:
             return
         
-        gray = np.mean(self.image_data, axis=2)
-        fft = np.fft.fft2(gray)
-        fft_shift = np.fft.fftshift(fft)
-        magnitude = np.abs(fft_shift)
-        
-        magnitude_log = np.log(magnitude + 1)
-        magnitude_norm = (magnitude_log - magnitude_log.min()) / (magnitude_log.max() - magnitude_log.min())
-        
-        h, w = magnitude.shape
-        resolution = self.resolution_slider.slider.value()
-        step_x = max(1, w // resolution)
-        step_y = max(1, h // resolution)
-        
-        x = np.arange(0, w, step_x)
-        y = np.arange(0, h, step_y)
-        
-        points = []
-        colors = []
-        
-        for yi in y:
-            for xi in x:
-                if yi < h and xi < w:
-                    mag_value = magnitude_norm[int(yi), int(xi)]
-                    
-                    px = (xi - w/2) * 0.2
-                    py = (yi - h/2) * 0.2
-                    pz = mag_value * 50
-                    
-                    points.append([px, py, pz])
-                    
-                    color_r = mag_value
-                    color_g = 0.3
-                    color_b = 1.0 - mag_value
-                    colors.append((color_r, color_g, color_b, 0.9))
-        
-        if self.wave_mesh:
-            self.gl_widget.removeItem(self.wave_mesh)
-        for line in self.wave_lines:
-            self.gl_widget.removeItem(line)
-        self.wave_lines.clear()
-        
-        points = np.array(points)
-        colors = np.array(colors)
-        
-        self.wave_mesh = gl.GLScatterPlotItem(
-            pos=points,
-            color=colors,
-            size=4,
-            pxMode=True
-        )
-        
-        self.gl_widget.addItem(self.wave_mesh)
-        
+        with self.render_stats.updating():
+            # El espectro normalizado se calcula una sola vez por imagen
+            spectrum_id = (self.image_id, self.luminance_formula)
+            if self.fft_spectrum_id != spectrum_id:
+                self.fft_spectrum = normalized_log_magnitude(self.luminance)
+                self.fft_spectrum_id = spectrum_id
+            magnitude_norm = self.fft_spectrum
+            
+            h, w = magnitude_norm.shape
+            resolution = self.resolution_slider.slider.value()
+            step_x = max(1, w // resolution)
+            step_y = max(1, h // resolution)
+            
+            x = np.arange(0, w, step_x)
+            y = np.arange(0, h, step_y)
+            mag_values = magnitude_norm[::step_y, ::step_x]
+            
+            pos = np.empty((len(y), len(x), 3), dtype=np.float32)
+            pos[:, :, 0] = ((x - w/2) * 0.2)[None, :]
+            pos[:, :, 1] = ((y - h/2) * 0.2)[:, None]
+            pos[:, :, 2] = mag_values * 50
+            
+            colors = np.empty((mag_values.size, 4), dtype=np.float32)
+            colors[:, 0] = mag_values.ravel()
+            colors[:, 1] = 0.3
+            colors[:, 2] = 1.0 - colors[:, 0]
+            colors[:, 3] = 0.9
+            
+            points = pos.reshape(-1, 3)
+            if self.fft_mesh is None:
+                self.fft_mesh = gl.GLScatterPlotItem(
+                    pos=points,
+                    color=colors,
+                    size=4,
+                    pxMode=True
+                )
+                self.gl_widget.addItem(self.fft_mesh)
+            else:
+                self.fft_mesh.setData(pos=points, color=colors)
+            self.render_stats.queue_upload(self.fft_mesh, 'pos', points)
+            self.render_stats.queue_upload(self.fft_mesh, 'color', colors)
+            
+            self.set_view_mode('fft')
+            
     def animate(self):
+        # Los incrementos originales (por tick de 50ms) se escalan por el tiempo real
+        dt = self.frame_scheduler.tick()
+        steps = dt / self.frame_scheduler.interval
+        
         if self.rotation_active and self.image_data is not None:
             speed = self.rotation_speed_slider.slider.value()
-            self.rotation_angle += speed * 0.5
+            self.rotation_angle += speed * 0.5 * steps
             self.gl_widget.setCameraPosition(
                 distance=100, 
                 elevation=30, 
                 azimuth=self.rotation_angle
             )
         
+        if self.sequence_playing and self.sequence_player is not None:
+            self.advance_sequence(steps)
+        
         if self.wave_animation_active and self.image_data is not None:
             wave_speed = self.wave_speed_slider.slider.value()
-            self.wave_offset += wave_speed * 0.05
-            self.update_visualization()
+            self.wave_offset += wave_speed * 0.05 * steps
+            if self.view_mode == 'image' and self.frame_scheduler.should_update():
+                start = time.perf_counter()
+                self.apply_grid()
+                self.frame_scheduler.record_update(start)
+
+# Se importan al usarlos (dashboard, carga de imágenes) y, tras mostrar la
+# ventana, se precargan en segundo plano para que el primer uso no espere
+DEFERRED_MODULES = ('PIL.Image', 'scipy.signal', 'scipy.interpolate')
+
+def preload_modules():
+    import importlib
+    for name in DEFERRED_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+def write_import_report(window_shown):
+    timer = IMPORT_TIMER
+    startup = timer.report(f"Ventana visible a los {(window_shown - timer.start) * 1000:.0f} ms "
+                           f"desde el inicio de app.py")
+    # Lo diferido se mide aparte, en el orden en que se precargaría
+    timer.records = []
+    preload_modules()
+    deferred = timer.report("Módulos diferidos (cargados tras mostrar la ventana)", limit=10)
+    text = f"{startup}\n\n{deferred}\n"
+    if sys.stdout is not None:
+        sys.stdout.write(text)
+    else:
+        # Ejecutable sin consola
+        with open('import_report.txt', 'w', encoding='utf-8') as f:
+            f.write(text)
+
+def parse_live_args(argv):
+    # Fuente en vivo desde la línea de comandos, p. ej.
+    #   cámara | python app.py --source - --size 640x480 --raw-format RGB
+    import argparse
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--source')
+    parser.add_argument('--size', default='512x512')
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--raw-format', default='L')
+    parser.add_argument('--import-report', action='store_true')
+    parser.add_argument('--profile', action='store_true')
+    parser.add_argument('--hud', action='store_true')
+    parser.add_argument('--memory-budget')
+    return parser.parse_known_args(argv)
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    live_args, qt_args = parse_live_args(sys.argv[1:])
+    if live_args.profile:
+        enable_profiling()
+    if live_args.memory_budget:
+        parse_bytes(live_args.memory_budget)
+        os.environ['WAVE_VISUALIZER_MEMORY_BUDGET'] = live_args.memory_budget
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle('Fusion')
     
     font = QFont("Segoe UI", 10)
@@ -1322,4 +3113,14 @@ if __name__ == '__main__':
     
     window = WaveVisualizer()
     window.show()
+    if live_args.hud:
+        window.toggle_hud()
+    if live_args.import_report:
+        app.processEvents()
+        write_import_report(time.perf_counter())
+        sys.exit(0)
+    QTimer.singleShot(0, lambda: threading.Thread(target=preload_modules, daemon=True).start())
+    if live_args.source:
+        window.start_sequence(make_frame_source(live_args.source, live_args.size,
+                                                live_args.fps, live_args.raw_format, live=True))
     sys.exit(app.exec())
\ No newline at end of file
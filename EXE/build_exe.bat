@@ -23,6 +23,9 @@ pyinstaller --version || (
 
 echo.
 
+REM Perfil ligero: build_exe.bat slim (usa WaveVisualizer3D_slim.spec, sin regenerarlo)
+if /I "%~1"=="slim" goto slim
+
 REM 2. Limpiar compilaciones previas
 echo 🧹 Eliminando carpetas previas build/ y dist/ ...
 if exist build rmdir /s /q build
@@ -85,3 +88,31 @@ echo.
 
 explorer dist
 pause
+exit /b
+
+:slim
+echo 🧹 Eliminando carpetas previas build/ y dist/ ...
+if exist build rmdir /s /q build
+if exist dist rmdir /s /q dist
+
+echo 🔨 Compilando perfil ligero (carpeta)...
+pyinstaller WaveVisualizer3D_slim.spec
+
+IF %ERRORLEVEL% NEQ 0 (
+    echo ❌ ERROR: La compilación falló.
+    echo Revisa el log arriba.
+    pause
+    exit /b
+)
+
+echo.
+echo ==================================================
+echo   ✔ COMPILACIÓN COMPLETA (perfil ligero)
+echo   El ejecutable está en:
+echo   dist\WaveVisualizer3D\WaveVisualizer3D.exe
+echo   Distribuir la carpeta dist\WaveVisualizer3D completa
+echo ==================================================
+echo.
+
+explorer dist
+pause
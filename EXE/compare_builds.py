@@ -0,0 +1,95 @@
+import os
+import re
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+# Compara el perfil completo (WaveVisualizer3D.spec, un solo archivo) con el
+# ligero (WaveVisualizer3D_slim.spec, carpeta): tamaño en disco y tiempo hasta
+# que la ventana es visible. El ejecutable se lanza con --import-report, que
+# muestra la ventana, escribe el informe y termina.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXE_NAME = 'WaveVisualizer3D.exe' if os.name == 'nt' else 'WaveVisualizer3D'
+
+PROFILES = {
+    'completo': ('WaveVisualizer3D.spec', os.path.join('dist', 'completo', EXE_NAME)),
+    'ligero': ('WaveVisualizer3D_slim.spec', os.path.join('dist', 'ligero', 'WaveVisualizer3D', EXE_NAME)),
+}
+
+def build(profile):
+    spec, _ = PROFILES[profile]
+    subprocess.run([sys.executable, '-m', 'PyInstaller', spec, '--noconfirm',
+                    '--distpath', os.path.join('dist', profile),
+                    '--workpath', os.path.join('build', profile)],
+                   cwd=HERE, check=True)
+
+def bundle_size(executable):
+    # (tamaño distribuido, contenido sin comprimir, archivos). Un solo archivo
+    # se descomprime entero en una carpeta temporal en cada arranque
+    if os.path.basename(os.path.dirname(executable)) != 'WaveVisualizer3D':
+        from PyInstaller.archive.readers import CArchiveReader
+        toc = CArchiveReader(executable).toc
+        content = sum(entry[2] for entry in toc.values())
+        return os.path.getsize(executable), content, len(toc)
+    total = files = 0
+    for root, _, names in os.walk(os.path.dirname(executable)):
+        for name in names:
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                continue
+            total += os.path.getsize(path)
+            files += 1
+    return total, total, files
+
+def startup(executable, runs):
+    times, windows = [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cwd:
+            start = time.perf_counter()
+            proc = subprocess.run([executable, '--import-report'], cwd=cwd,
+                                  capture_output=True, text=True, errors='replace')
+            times.append(time.perf_counter() - start)
+            # Sin consola el informe va a import_report.txt
+            text = proc.stdout
+            report = os.path.join(cwd, 'import_report.txt')
+            if os.path.exists(report):
+                with open(report, encoding='utf-8') as f:
+                    text = f.read()
+            match = re.search(r'Ventana visible a los (\d+) ms', text)
+            if match:
+                windows.append(int(match.group(1)) / 1000)
+    return times, windows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tamaño y arranque de los perfiles de compilación")
+    parser.add_argument('--build', action='store_true', help="compilar ambos perfiles antes de medir")
+    parser.add_argument('--runs', type=int, default=5, help="arranques por perfil")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for profile, (spec, executable) in PROFILES.items():
+        if args.build:
+            build(profile)
+        executable = os.path.join(HERE, executable)
+        if not os.path.exists(executable):
+            print(f"{profile}: no existe {executable} (usar --build)")
+            continue
+        size, content, files = bundle_size(executable)
+        # Un arranque previo para no medir la caché de disco fría
+        startup(executable, 1)
+        times, windows = startup(executable, args.runs)
+        rows.append((profile, size, content, files, times, windows))
+
+    print("| Perfil | Tamaño | Contenido | Archivos | Arranque (mediana) | Arranque (mín.) | Ventana visible desde app.py |")
+    print("|---|---|---|---|---|---|---|")
+    for profile, size, content, files, times, windows in rows:
+        window = f"{statistics.median(windows):.2f} s" if windows else "-"
+        print(f"| {profile} | {size / 1e6:.0f} MB | {content / 1e6:.0f} MB | {files} | {statistics.median(times):.2f} s | "
+              f"{min(times):.2f} s | {window} |")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import platform
+import statistics
+import tracemalloc
+import numpy as np
+
+import analysis
+
+# Benchmarks reproducibles de los caminos críticos: etapas del análisis del
+# dashboard (calculate_all), construcción de la malla 3D, vista FFT y hover.
+# Imágenes sintéticas deterministas; resultados en JSON para comparar versiones:
+#   python benchmark.py -o base.json
+#   python benchmark.py -o nuevo.json --compare base.json
+
+SIZES = ['256x256', '257x255', '512x512', '1000x750', '1024x1024', '2047x1531',
+         '2048x2048', '4096x4096', '8192x8192']
+RESOLUTIONS = [10, 50, 100, 200]
+LINE_MODES = {0: 'sin_lineas', 1: 'lineas_x', 2: 'lineas_y', 3: 'lineas_xy'}
+
+def synthetic_image(width, height, seed=0, block_rows=512):
+    # RGB uint8 con rejillas, manchas y ruido: espectro con picos y fondo,
+    # parecido a una foto. Se genera por bloques de filas para no crear
+    # planos float64 completos en los tamaños grandes
+    rng = np.random.default_rng(seed)
+    x = np.linspace(-1, 1, width, dtype=np.float32)
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    for start in range(0, height, block_rows):
+        y = np.linspace(-1, 1, height, dtype=np.float32)[start:start + block_rows, None]
+        base = (0.5 + 0.2 * np.sin(40 * x[None, :] + 25 * y)
+                + 0.15 * np.cos(90 * (x[None, :] * 0.6 - y * 0.8))
+                + 0.3 * np.exp(-((x[None, :] - 0.3) ** 2 + (y + 0.2) ** 2) * 12))
+        for channel, gain in enumerate((1.0, 0.8, 0.6)):
+            noise = rng.normal(0, 0.05, base.shape).astype(np.float32)
+            image[start:start + block_rows, :, channel] = np.clip((base * gain + noise) * 255, 0, 255)
+    return image
+
+def measure(fn, repeat):
+    # Tiempo: mediana y mínimo de `repeat` ejecuciones sin tracemalloc.
+    # Memoria: pico de una ejecución aparte con tracemalloc (numpy registra
+    # sus buffers), relativo a lo ya asignado al empezar
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return {
+        'median_s': statistics.median(times),
+        'min_s': min(times),
+        'repeat': repeat,
+        'peak_mb': round(peak / 1e6, 2),
+    }
+
+def repeats_for(width, height, quick):
+    pixels = width * height
+    if quick or pixels > 2048 * 2048:
+        return 1
+    return 5 if pixels <= 1024 * 1024 else 3
+
+def bench_analysis(size, image, repeat, log):
+    # Etapas de calculate_all en el orden de analyze_spectrum
+    results = []
+    gray = np.asarray(analysis.compute_luminance(image), dtype=np.float64)
+    state = {}
+
+    def fft():
+        state['fft'] = analysis.fft_products(gray)
+
+    def metrics():
+        _, magnitude, phase, power = state['fft']
+        analysis.spectral_metrics(magnitude, phase, power)
+
+    def radial():
+        analysis.radial_profile(state['fft'][1])
+
+    def angular():
+        analysis.angular_profile(state['fft'][1])
+
+    def laplace():
+        analysis.line_analysis(gray, state['fft'][1])
+
+    def rows_band():
+        # Banda de 256 filas centrada: Laplace, impulso y picos por lotes
+        h = gray.shape[0]
+        analysis.row_analysis(gray, state['fft'][1], rows=(h // 2 - 128, h // 2 + 128))
+
+    def full():
+        # Con la medida de memoria, como el modo por lotes
+        analysis.analyze_spectrum(gray, measure_memory=True)
+
+    fft()
+    for stage, fn in (('fft', fft), ('metricas', metrics), ('perfil_radial', radial),
+                      ('perfil_angular', angular), ('laplace', laplace), ('filas_banda256', rows_band),
+                      ('analisis_completo', full)):
+        row = {'group': 'calculate_all', 'stage': stage, 'size': size, 'params': {}}
+        row.update(measure(fn, repeat))
+        results.append(row)
+        log(row)
+    state.clear()
+    return results
+
+def bench_charts(size, image, repeat, log):
+    from app import ResultsWindow
+    from PyQt6.QtWidgets import QApplication
+
+    result = analysis.analyze_spectrum(analysis.compute_luminance(image), measure_memory=True)
+    windows = []
+
+    def build():
+        # Lo que paga calculate_all al abrir el dashboard
+        window = ResultsWindow(None, result=result)
+        QApplication.processEvents()
+        windows.append(window)
+
+    def update():
+        windows[0].show_result(result)
+        QApplication.processEvents()
+
+    results = []
+    for stage, fn in (('graficos_construir', build), ('graficos_actualizar', update)):
+        row = {'group': 'calculate_all', 'stage': stage, 'size': size, 'params': {}}
+        row.update(measure(fn, repeat))
+        results.append(row)
+        log(row)
+    for window in windows:
+        window.close()
+        window.deleteLater()
+    QApplication.processEvents()
+    return results
+
+def bench_view(window, size, image, repeat, log):
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QCursor
+
+    results = []
+    window.set_image_data(image)
+    slider = window.resolution_slider.slider
+
+    for resolution in RESOLUTIONS:
+        slider.blockSignals(True)
+        slider.setValue(resolution)
+        slider.blockSignals(False)
+        for mode, name in LINE_MODES.items():
+            window.line_mode = mode
+
+            def cold():
+                # Sin caché de mallas: muestreo de la pirámide + subida de geometría
+                window.grid_cache.clear()
+                window.update_visualization()
+
+            row = {'group': 'update_visualization', 'stage': name, 'size': size,
+                   'params': {'resolution': resolution}}
+            row.update(measure(cold, repeat))
+            points = window.point_data['pos'].shape[0]
+            row['params']['points'] = points
+            row['params']['line_vertices'] = sum(len(line.pos) for line in window.wave_lines.values())
+            results.append(row)
+            log(row)
+
+        def fft_cold():
+            window.fft_spectrum_id = None
+            window.show_fft_analysis()
+
+        def fft_warm():
+            window.show_fft_analysis()
+
+        for stage, fn in (('frio', fft_cold), ('caliente', fft_warm)):
+            row = {'group': 'show_fft_analysis', 'stage': stage, 'size': size,
+                   'params': {'resolution': resolution}}
+            row.update(measure(fn, repeat))
+            results.append(row)
+            log(row)
+
+    # Hover con el cursor en el centro de la vista (el caso que muestra el tooltip)
+    window.line_mode = 0
+    window.update_visualization()
+    window.tooltip_enabled = True
+    gl = window.gl_widget
+    QCursor.setPos(gl.mapToGlobal(gl.rect().center()))
+    QApplication.processEvents()
+
+    def hover():
+        for _ in range(100):
+            window.check_hover()
+
+    row = {'group': 'check_hover', 'stage': 'x100', 'size': size,
+           'params': {'tooltip_visible': None}}
+    row.update(measure(hover, repeat))
+    row['params']['tooltip_visible'] = window.tooltip.isVisible()
+    window.tooltip.hide()
+    results.append(row)
+    log(row)
+    return results
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+def result_key(row):
+    params = {k: v for k, v in row['params'].items() if k in ('resolution',)}
+    return (row['group'], row['stage'], row['size'], json.dumps(params, sort_keys=True))
+
+def compare(results, baseline_path, threshold, log=print):
+    # Regresión: más lento que la base por encima del umbral (y de 1 ms,
+    # para no marcar ruido en etapas minúsculas)
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {result_key(row): row for row in json.load(f)['results']}
+    regressions = 0
+    log(f"\n{'grupo':<22} {'etapa':<20} {'tamaño':<11} {'base ms':>9} {'ahora ms':>9} {'ratio':>6}")
+    for row in results:
+        old = baseline.get(result_key(row))
+        if old is None:
+            continue
+        ratio = row['median_s'] / old['median_s'] if old['median_s'] > 0 else float('inf')
+        slower = ratio > threshold and row['median_s'] - old['median_s'] > 0.001
+        regressions += slower
+        res = row['params'].get('resolution')
+        stage = row['stage'] + (f" r{res}" if res else '')
+        log(f"{row['group']:<22} {stage:<20} {row['size']:<11} {old['median_s'] * 1000:9.2f} "
+            f"{row['median_s'] * 1000:9.2f} {ratio:6.2f}{'  ← regresión' if slower else ''}")
+    log(f"\n{regressions} regresiones (umbral ×{threshold})")
+    return regressions
+
+def print_row(row):
+    params = ' '.join(f"{k}={v}" for k, v in row['params'].items())
+    print(f"{row['group']:<22} {row['stage']:<20} {row['size']:<11} "
+          f"{row['median_s'] * 1000:10.2f} ms  pico {row['peak_mb']:9.1f} MB  {params}", flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de Wave Visualizer 3D")
+    parser.add_argument('--sizes', default=','.join(SIZES),
+                        help="lista ANCHOxALTO separada por comas (por defecto 256² a 8192², con impares)")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="resultados en JSON")
+    parser.add_argument('--compare', metavar='BASE.json', help="comparar con resultados anteriores")
+    parser.add_argument('--threshold', type=float, default=1.25, help="ratio a partir del cual hay regresión")
+    parser.add_argument('--skip-gui', action='store_true', help="solo etapas sin Qt")
+    parser.add_argument('--quick', action='store_true', help="una repetición por medida")
+    args = parser.parse_args(argv)
+
+    window = None
+    if not args.skip_gui:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt6.QtWidgets import QApplication
+        from app import WaveVisualizer
+        qt_app = QApplication.instance() or QApplication([])
+        window = WaveVisualizer()
+        window.animation_timer.stop()
+        window.rotation_active = False
+        window.show()
+        qt_app.processEvents()
+
+    # La primera importación de scipy no debe contar en la primera medida
+    importlib.import_module('scipy.signal')
+
+    results = []
+    for size in args.sizes.split(','):
+        width, height = analysis.parse_size(size)
+        image = synthetic_image(width, height)
+        repeat = repeats_for(width, height, args.quick)
+        results += bench_analysis(size, image, repeat, print_row)
+        if window is not None:
+            results += bench_charts(size, image, repeat, print_row)
+            results += bench_view(window, size, image, repeat, print_row)
+        del image
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=1)
+    print(f"\nResultados en {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
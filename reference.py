@@ -0,0 +1,297 @@
+import os
+import sys
+import json
+import argparse
+import numpy as np
+
+import analysis
+
+# Implementaciones de referencia: el cálculo directo (bucles y máscaras) del
+# dashboard original, sin optimizar. Sirven para validar que las versiones
+# rápidas de analysis.py dan los mismos resultados:
+#   python reference.py                      # corpus sintético
+#   python reference.py fotos/ -o informe.json
+# Los bucles son lentos a propósito; las imágenes reales se recortan al
+# centro (--max-size) para que la referencia termine en segundos.
+# Sale con código 1 si alguna salida supera la tolerancia de su estrategia
+
+def reference_luminance(image_data, formula='mean'):
+    if image_data.ndim == 2:
+        return image_data.astype(np.float64)
+    weights = np.asarray(analysis.LUMINANCE_WEIGHTS[formula], dtype=np.float64)
+    return np.tensordot(image_data.astype(np.float64), weights, axes=([2], [0]))
+
+def reference_fft(gray):
+    fft = np.fft.fft2(gray)
+    fft_shift = np.fft.fftshift(fft)
+    magnitude = np.abs(fft_shift)
+    phase = np.angle(fft_shift)
+    power_spectrum = magnitude ** 2
+    return fft_shift, magnitude, phase, power_spectrum
+
+def reference_metrics(magnitude, phase, power_spectrum):
+    total_energy = np.sum(power_spectrum)
+    normalized_power = power_spectrum / np.sum(power_spectrum)
+    spectral_entropy = -np.sum(normalized_power * np.log2(normalized_power + 1e-12))
+    signal_power = np.max(power_spectrum)
+    noise_power = np.median(power_spectrum)
+    snr = 10 * np.log10(signal_power / noise_power) if noise_power > 0 else 0
+    return {
+        'mean_magnitude': float(np.mean(magnitude)),
+        'max_magnitude': float(np.max(magnitude)),
+        'std_magnitude': float(np.std(magnitude)),
+        'total_energy': float(total_energy),
+        'spectral_entropy': float(spectral_entropy),
+        'snr_db': float(snr),
+        'phase_mean': float(np.mean(phase)),
+    }
+
+def reference_top_freqs(magnitude):
+    flat_mag = magnitude.flatten()
+    top_indices = np.argpartition(flat_mag, -10)[-10:]
+    return np.array(sorted(flat_mag[top_indices], reverse=True))
+
+def reference_radial_profile(magnitude):
+    h, w = magnitude.shape
+    center_y, center_x = h // 2, w // 2
+    y_coords, x_coords = np.ogrid[:h, :w]
+    r = np.sqrt((x_coords - center_x)**2 + (y_coords - center_y)**2)
+    max_r = int(min(center_x, center_y))
+    radial_profile = np.zeros(max_r)
+    for i in range(max_r):
+        mask = (r >= i) & (r < i + 1)
+        if np.sum(mask) > 0:
+            radial_profile[i] = np.mean(magnitude[mask])
+    return radial_profile
+
+def reference_angular_profile(magnitude, n_angles=360):
+    h, w = magnitude.shape
+    center_y, center_x = h // 2, w // 2
+    y_coords, x_coords = np.ogrid[:h, :w]
+    theta = np.arctan2(y_coords - center_y, x_coords - center_x)
+    angular_profile = np.zeros(n_angles)
+    for i in range(n_angles):
+        angle_min = np.deg2rad(i - 1)
+        angle_max = np.deg2rad(i + 1)
+        mask = (theta >= angle_min) & (theta < angle_max)
+        if np.sum(mask) > 0:
+            angular_profile[i] = np.mean(magnitude[mask])
+    return angular_profile
+
+def reference_laplace_plane(signal_1d):
+    t = np.linspace(0, 10, len(signal_1d))
+    sigmas = np.linspace(0.01, 2, 100)
+    omega = np.linspace(-np.pi, np.pi, 100)
+    laplace_mag = np.zeros((len(sigmas), len(omega)))
+    for i, sigma in enumerate(sigmas):
+        for j, w in enumerate(omega):
+            s = sigma + 1j * w
+            dt = t[1] - t[0] if len(t) > 1 else 1
+            laplace_val = np.sum(signal_1d * np.exp(-s * t[:len(signal_1d)])) * dt
+            laplace_mag[i, j] = np.abs(laplace_val)
+    return laplace_mag
+
+def reference_analysis(gray):
+    from scipy.signal import find_peaks
+
+    gray = np.asarray(gray, dtype=np.float64)
+    h, w = gray.shape
+    fft_shift, magnitude, phase, power_spectrum = reference_fft(gray)
+    signal_1d = gray[h//2, :]
+    peaks, _ = find_peaks(np.abs(signal_1d), height=np.mean(signal_1d))
+    return {
+        'metrics': {'height': h, 'width': w, **reference_metrics(magnitude, phase, power_spectrum)},
+        'fft_center_row': fft_shift[h//2, :],
+        'magnitude': magnitude,
+        'phase': phase,
+        'power_spectrum': power_spectrum,
+        'top_freqs': reference_top_freqs(magnitude),
+        'radial_profile': reference_radial_profile(magnitude),
+        'angular_profile': reference_angular_profile(magnitude),
+        'signal_1d': signal_1d,
+        'laplace_mag': reference_laplace_plane(signal_1d),
+        'impulse_response': np.fft.ifft(magnitude[h//2, :]).real,
+        'peaks': peaks,
+    }
+
+ARRAY_OUTPUTS = ('magnitude', 'phase', 'power_spectrum', 'fft_center_row', 'top_freqs',
+                 'radial_profile', 'angular_profile', 'signal_1d', 'laplace_mag', 'impulse_response')
+
+def array_error(name, value, expected, magnitude=None):
+    # Error absoluto máximo y relativo a la escala de la salida (max |ref|):
+    # el relativo punto a punto no tiene sentido cerca de cero
+    value = np.asarray(value, dtype=np.complex128 if np.iscomplexobj(expected) else np.float64)
+    if value.shape != expected.shape:
+        return {'abs': float('inf'), 'rel': float('inf'), 'note': f"forma {value.shape} != {expected.shape}"}
+    diff = value - expected
+    if name == 'phase':
+        # Diferencia angular, y solo donde la fase está bien definida
+        # (|F| no despreciable frente al máximo)
+        diff = np.angle(np.exp(1j * diff))
+        diff = diff[magnitude > 1e-6 * magnitude.max()] if magnitude.size else diff
+        scale = np.pi
+    else:
+        scale = float(np.max(np.abs(expected))) if expected.size else 0.0
+    error = float(np.max(np.abs(diff))) if diff.size else 0.0
+    return {'abs': error, 'rel': error / scale if scale > 0 else error}
+
+# Por estrategia, salidas que se informan pero no cuentan para el veredicto:
+# la fase media depende de si los bins con fase ≈ ±π caen a un lado u otro
+# del corte, y un redondeo en float32 basta para cambiarlo (la matriz de fase
+# sí se compara, módulo 2π). Los caminos float64 la siguen comprobando
+INFORMATIVE = {
+    'float32': {'metrics.phase_mean'},
+    'tiled': {'metrics.phase_mean'},
+}
+
+def compare_results(result, expected):
+    errors = {}
+    for name in analysis.METRIC_FIELDS if 'metrics' in result else ():
+        value, ref = result['metrics'][name], expected['metrics'][name]
+        error = abs(value - ref)
+        # La fase media es ~0 por simetría: su escala es π
+        scale = np.pi if name == 'phase_mean' else abs(ref)
+        errors[f"metrics.{name}"] = {'abs': error, 'rel': error / scale if scale > 0 else error}
+    for name in ARRAY_OUTPUTS:
+        if name in result:
+            errors[name] = array_error(name, result[name], expected[name], expected['magnitude'])
+    if 'peaks' in result:
+        missing = len(np.setxor1d(result['peaks'], expected['peaks']))
+        errors['peaks'] = {'abs': float(missing), 'rel': missing / max(len(expected['peaks']), 1)}
+    return errors
+
+def blocked_float64(gray):
+    # Acumulación por bloques sin pérdida de precisión: aísla el error del
+    # troceado del de float32 en la estrategia 'tiled'
+    gray = np.asarray(gray, dtype=np.float64)
+    h, w = gray.shape
+    block_rows = max(1, analysis.TILE_PIXELS // w)
+    _, magnitude, phase, power_spectrum = analysis.fft_products(gray)
+    metrics, top_freqs = analysis.spectral_metrics(magnitude, phase, power_spectrum, block_rows)
+    return {
+        'metrics': {'height': h, 'width': w, **metrics},
+        'top_freqs': top_freqs,
+        'radial_profile': analysis.radial_profile(magnitude, block_rows),
+        'angular_profile': analysis.angular_profile(magnitude, block_rows=block_rows),
+    }
+
+def batched_center_row(gray):
+    # Fila central de row_analysis (todas las filas por lotes, en float32)
+    gray = np.asarray(gray, dtype=np.float64)
+    _, magnitude, _, _ = analysis.fft_products(gray)
+    rows = analysis.row_analysis(gray, magnitude)
+    return analysis.row_slice(rows, gray.shape[0] // 2)
+
+def engines(strategies):
+    # Implementaciones optimizadas a validar, por nombre
+    found = {s: (lambda gray, s=s: analysis.analyze_spectrum(gray, strategy=s, measure_memory=True)) for s in strategies}
+    found['bloques64'] = blocked_float64
+    found['filas'] = batched_center_row
+    return found
+
+def synthetic_corpus():
+    # Casos con estructura conocida (rejillas, ruido, impulsos, constantes) y
+    # tamaños pares, impares, primos y degenerados
+    rng = np.random.default_rng(0)
+    yield 'ruido_256', rng.random((256, 256)) * 255
+    yield 'ruido_impar_257x255', rng.random((257, 255)) * 255
+    yield 'primos_127x131', rng.random((127, 131)) * 255
+    y, x = np.mgrid[:300, :400]
+    yield 'rejillas_300x400', 128 + 60 * np.sin(x * 0.3) + 40 * np.cos(y * 0.11 + x * 0.05)
+    impulse = np.zeros((200, 200))
+    impulse[100, 100] = 255
+    yield 'impulso_200', impulse
+    yield 'constante_64', np.full((64, 64), 100.0)
+    yield 'fila_3x500', rng.random((3, 500)) * 255
+    image = np.zeros((240, 320, 3), dtype=np.uint8)
+    image[60:180, 80:240] = (250, 120, 30)
+    image += (rng.random(image.shape) * 40).astype(np.uint8)
+    yield 'rgb_uint8_240x320', image
+
+def image_corpus(paths, max_size):
+    for path in analysis.collect_images(paths, recursive=True):
+        from PIL import Image
+        with Image.open(path) as img:
+            image_data, _ = analysis.native_image_array(img)
+        h, w = image_data.shape[:2]
+        top, left = max(0, (h - max_size) // 2), max(0, (w - max_size) // 2)
+        yield os.path.basename(path), image_data[top:top + max_size, left:left + max_size]
+
+# Error relativo máximo aceptado por implementación: las de float64 deben
+# coincidir salvo redondeo; float32 tiene ~7 cifras y la FFT pierde algo más.
+# 'filas' es la fila central de row_analysis (Laplace por lotes en float32)
+TOLERANCES = {'float64': 1e-9, 'float32': 1e-3, 'tiled': 1e-3, 'bloques64': 1e-9,
+              'filas': 1e-5, 'luminancia': 1e-6}
+
+def validate(images, strategies, formula='mean', log=print):
+    report = []
+    failures = 0
+    for name, image_data in images:
+        gray = np.asarray(image_data, dtype=np.float64)
+        runs = []
+        if image_data.ndim == 3:
+            # La luminancia (float32, por bloques) se valida aparte; el espectro
+            # de referencia parte de la misma imagen gris que el optimizado
+            gray = analysis.compute_luminance(image_data, formula)
+            luminance_error = array_error('luminance', gray, reference_luminance(image_data, formula))
+            runs.append(('luminancia', {'luminance': luminance_error}))
+        expected = reference_analysis(gray)
+        for strategy, engine in engines(strategies).items():
+            runs.append((strategy, compare_results(engine(gray), expected)))
+        for strategy, errors in runs:
+            gated = [k for k in errors if k not in INFORMATIVE.get(strategy, ())]
+            worst = max(gated, key=lambda k: errors[k]['rel'])
+            passed = errors[worst]['rel'] <= TOLERANCES[strategy]
+            failures += not passed
+            log(f"{'OK ' if passed else 'ERR'} {name:<24} {strategy:<10} peor: {worst} "
+                f"(abs {errors[worst]['abs']:.2e}, rel {errors[worst]['rel']:.2e})")
+            report.append({'image': name, 'shape': list(gray.shape), 'strategy': strategy,
+                           'passed': passed, 'errors': errors})
+    return report, failures
+
+def print_summary(report, log=print):
+    # Máximo por salida y estrategia sobre todo el corpus
+    strategies = list(dict.fromkeys(entry['strategy'] for entry in report))
+    log(f"\n{'salida':<26} " + " ".join(f"{s + ' abs':>14} {s + ' rel':>14}" for s in strategies))
+    outputs = list(dict.fromkeys(k for entry in report for k in entry['errors']))
+    for output in outputs:
+        cells = []
+        for strategy in strategies:
+            values = [e['errors'][output] for e in report if e['strategy'] == strategy and output in e['errors']]
+            if values:
+                cells.append(f"{max(v['abs'] for v in values):14.2e} {max(v['rel'] for v in values):14.2e}")
+            else:
+                cells.append(f"{'-':>14} {'-':>14}")
+        log(f"{output:<26} " + " ".join(cells))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validación numérica frente a las implementaciones de referencia")
+    parser.add_argument('inputs', nargs='*', help="imágenes o carpetas reales (además del corpus sintético)")
+    parser.add_argument('--strategies', default=','.join(analysis.MEMORY_STRATEGIES),
+                        help="estrategias de memoria a validar")
+    parser.add_argument('--max-size', type=int, default=512, help="recorte central de las imágenes reales")
+    parser.add_argument('--luminance', choices=sorted(analysis.LUMINANCE_WEIGHTS), default='mean')
+    parser.add_argument('--no-synthetic', action='store_true', help="solo las imágenes indicadas")
+    parser.add_argument('--tile-pixels', type=int, default=4096,
+                        help="píxeles por bloque en 'tiled' (pequeño para que el corpus cruce varios bloques)")
+    parser.add_argument('-o', '--output', help="informe completo en JSON")
+    args = parser.parse_args(argv)
+
+    strategies = args.strategies.split(',')
+    analysis.TILE_PIXELS = args.tile_pixels
+    images = []
+    if not args.no_synthetic:
+        images += list(synthetic_corpus())
+    images += list(image_corpus(args.inputs, args.max_size))
+    report, failures = validate(images, strategies, args.luminance)
+    print_summary(report)
+    print(f"\n{failures} casos fuera de tolerancia "
+          f"({', '.join(f'{s} ≤ {t:g}' for s, t in TOLERANCES.items())}; "
+          f"no cuentan: {', '.join(f'{k} en {s}' for s, keys in INFORMATIVE.items() for k in sorted(keys))})")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())